@@ -0,0 +1,70 @@
+"""
+Files/sec for build_file_index on a synthetic tree, versus the old rglob walk.
+
+    python benchmarks/bench_index.py --files 500000 --root /tmp/dda-bench-tree
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pathspec import PathSpec
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synth import make_synthetic_tree  # noqa: E402
+
+from dda.ingest.index import build_file_index  # noqa: E402
+from dda.utils.config import load_config  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _rglob_index(repo_dir: Path, include_globs, exclude_globs, max_bytes) -> int:
+    include = PathSpec.from_lines("gitwildmatch", include_globs)
+    exclude = PathSpec.from_lines("gitwildmatch", exclude_globs)
+    n = 0
+    for fp in repo_dir.rglob("*"):
+        if not fp.is_file():
+            continue
+        rel = fp.relative_to(repo_dir).as_posix()
+        if exclude.match_file(rel) or not include.match_file(rel):
+            continue
+        if fp.stat().st_size <= max_bytes:
+            n += 1
+    return n
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=500_000)
+    ap.add_argument("--root", type=Path, default=None, help="Reuse/create the tree here (default: temp dir)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--skip-rglob", action="store_true")
+    args = ap.parse_args()
+
+    cfg = load_config(REPO_ROOT / "templates" / "config.yaml").analysis
+    root = args.root or Path(tempfile.mkdtemp(prefix="dda-bench-"))
+    if not (root / "comp0").exists():
+        t0 = time.perf_counter()
+        make_synthetic_tree(root, args.files)
+        print(f"generated {args.files} files in {time.perf_counter() - t0:.1f}s at {root}")
+
+    t0 = time.perf_counter()
+    index = build_file_index(root, cfg.include_globs, cfg.exclude_globs, max_files=10**9,
+                             max_bytes=cfg.max_file_bytes, workers=args.workers)
+    dt = time.perf_counter() - t0
+    print(f"walker: {len(index.files)} indexed in {dt:.2f}s  ({len(index.files) / dt:,.0f} files/sec)")
+
+    if not args.skip_rglob:
+        t0 = time.perf_counter()
+        n = _rglob_index(root, cfg.include_globs, cfg.exclude_globs, cfg.max_file_bytes)
+        dt = time.perf_counter() - t0
+        print(f"rglob:  {n} indexed in {dt:.2f}s  ({n / dt:,.0f} files/sec)")
+
+
+if __name__ == "__main__":
+    main()
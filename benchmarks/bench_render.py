@@ -0,0 +1,77 @@
+"""
+Per-report render time for N reports with the real template: a fresh Jinja
+Environment + render-to-string per report (the old path) versus the cached
+environment streaming into the file.
+
+    python benchmarks/bench_render.py --reports 1000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from dda.report.render import render_report
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TEMPLATE = REPO_ROOT / "templates" / "report.md.tmpl"
+
+
+def _context(i: int) -> dict:
+    cats = [
+        {"id": f"c{k}", "name": f"Category {k}", "score": (i + k) % 5, "confidence": 0.5, "notes": "n" * 80,
+         "evidence": [{"type": "evidence_id", "ref": f"EVID-{k}"}]}
+        for k in range(10)
+    ]
+    return {
+        "repo": {"name": f"repo{i}", "url": f"https://example.com/repo{i}", "commit": "0" * 40, "languages": "Go, Python",
+                 "ci_summary": "GitHub Actions", "deploy_summary": "Helm", "observability_summary": "Prometheus"},
+        "run": {"id": str(i), "timestamp": "2026-01-01T00:00:00Z"},
+        "summary": {"executive": "x" * 400},
+        "scorecard": {"overall": {"score": 3.1, "confidence": 0.6}, "categories": cats},
+        "architecture": {
+            "components": [{"name": f"comp{k}", "purpose": "p", "evidence_ref": "EVID-STRUCT-TOPLEVEL"} for k in range(12)],
+            "flows": [{"from": f"comp{k}", "to": f"comp{k + 1}", "why": "3 import(s)", "evidence_ref": "EVID-STRUCT-IMPORTS"} for k in range(11)],
+        },
+        "findings": {"top": []},
+        "risks": [{"title": f"risk {k}", "severity": "medium", "confidence": "low", "detail": "d" * 120,
+                   "evidence_list": f"EVID-PERF-{k}"} for k in range(7)],
+        "quick_wins": [],
+        "roadmap": [],
+    }
+
+
+def _old_render(template_path: Path, out_path: Path, context: dict) -> None:
+    env = Environment(
+        loader=FileSystemLoader(str(template_path.parent)),
+        autoescape=select_autoescape(enabled_extensions=()),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    out_path.write_text(env.get_template(template_path.name).render(**context), encoding="utf-8")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--reports", type=int, default=1000)
+    args = ap.parse_args()
+
+    out = Path(tempfile.mkdtemp(prefix="dda-bench-render-"))
+    contexts = [_context(i) for i in range(args.reports)]
+
+    for label, fn in (
+        ("fresh env + render()", lambda p, c: _old_render(TEMPLATE, p, c)),
+        ("cached env + generate()", lambda p, c: render_report(TEMPLATE, p, c, bytecode_cache_dir=out / "jinja")),
+    ):
+        t0 = time.perf_counter()
+        for i, ctx in enumerate(contexts):
+            fn(out / f"report{i}.md", ctx)
+        dt = time.perf_counter() - t0
+        print(f"{label:26s} {args.reports} reports in {dt:.2f}s  ({dt / args.reports * 1000:.2f} ms/report)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Per-stage timings of one analysis over synthetic repos, as JSON, with an
+optional baseline comparison for CI.
+
+Stages are run serially, in pipeline order, so each number is that stage
+alone: build_file_index, content_scan (the shared pattern scan), every
+extract_* in registry order, snippets, score_repo, evidence_gate and
+render_report. Caches are off, so every run is cold.
+
+    python benchmarks/bench_stages.py --files 1000 10000 --out stages.json
+    python benchmarks/bench_stages.py --files 1000 10000 --baseline stages.json --threshold 0.25
+
+With --baseline, a stage regresses when it is more than `threshold` slower
+(relative) *and* more than --min-delta seconds slower (absolute, so
+millisecond stages don't flap). Per-stage thresholds can be given as
+`--threshold render_report=0.5`. Exits 1 if anything regressed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synth import SIZE_DISTS, make_synthetic_repo  # noqa: E402
+
+from dda.evidence.snippets import SnippetService  # noqa: E402
+from dda.evidence.store import EvidenceStore  # noqa: E402
+from dda.extractors.content_scan import scan_contents  # noqa: E402
+from dda.extractors.registry import default_extractors  # noqa: E402
+from dda.extractors.scheduler import _invoke  # noqa: E402
+from dda.ingest.clone import RepoMeta  # noqa: E402
+from dda.ingest.index import build_file_index  # noqa: E402
+from dda.report.render import render_report  # noqa: E402
+from dda.scoring.score import score_repo  # noqa: E402
+from dda.utils.config import load_config  # noqa: E402
+from dda.verifier.evidence_gate import evidence_gate  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_VERSION = 1
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    """Best wall time of `repeat` calls, and the last call's result."""
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def run_stages(repo_dir: Path, work_dir: Path, cfg, workers: int, repeat: int = 1) -> dict[str, Any]:
+    """Times each stage once (best of `repeat`) against `repo_dir`; returns {"stages": {...}, "counts": {...}}."""
+    stages: dict[str, float] = {}
+    a = cfg.analysis
+
+    stages["build_file_index"], index = _best(
+        lambda: build_file_index(repo_dir, a.include_globs, a.exclude_globs, a.max_files_scanned, a.max_file_bytes),
+        repeat,
+    )
+
+    specs = default_extractors()
+    stages["content_scan"], hits = _best(
+        lambda: scan_contents(index, [p for s in specs for p in s.patterns], workers=workers), repeat
+    )
+
+    snippets_dir = work_dir / "evidence" / "snippets"
+    snippets_dir.mkdir(parents=True, exist_ok=True)
+    signals: dict[str, Any] = {}
+    evidence = EvidenceStore()
+    for spec in specs:  # registry order already respects depends_on
+        deps = {d: signals.get(d, {}) for d in spec.depends_on}
+        scan = {p.id: hits.get(p.id, []) for p in spec.patterns}
+        dt, (sig, records, _, _) = _best(
+            lambda: _invoke(spec, repo_dir, index, snippets_dir, deps, scan, None), repeat
+        )
+        stages[f"extract_{spec.name}"] = dt
+        signals[spec.name] = sig
+        evidence.extend(records)
+
+    service = SnippetService(repo_dir, snippets_dir, cfg.evidence.snippet_max_chars)
+    stages["snippets"], _ = _best(lambda: service.attach(evidence), 1)  # attach mutates the store
+    evidence_path = work_dir / "evidence" / "evidence.jsonl"
+    evidence.flush(evidence_path)
+
+    meta = RepoMeta(name="synthetic", url=str(repo_dir), commit="0" * 40)
+    stages["score_repo"], scorecard = _best(
+        lambda: score_repo(meta, "bench", None, cfg, index, signals, evidence_path, evidence.ids()), repeat
+    )
+    stages["evidence_gate"], scorecard = _best(
+        lambda: evidence_gate(
+            scorecard, evidence_path, cfg.evidence.require_for_claims, cfg.evidence.min_confidence_if_no_evidence,
+            evidence=evidence, index=index,
+        ),
+        repeat,
+    )
+    context = {
+        "repo": {"name": meta.name, "url": meta.url, "commit": meta.commit,
+                 "languages": ", ".join(index.languages) or "unknown"},
+        "run": {"id": "bench", "timestamp": "1970-01-01T00:00:00Z"},
+        "summary": {"executive": scorecard.get("overall", {}).get("rationale", "")},
+        "scorecard": scorecard,
+        "architecture": signals.get("structure", {}).get("architecture", {"components": [], "flows": []}),
+        "findings": signals.get("docs", {}).get("findings", {"top": []}),
+        "risks": signals.get("performance_smells", {}).get("risks", []),
+        "quick_wins": signals.get("docs", {}).get("quick_wins", []),
+        "roadmap": signals.get("docs", {}).get("roadmap", []),
+    }
+    stages["render_report"], _ = _best(
+        lambda: render_report(REPO_ROOT / cfg.report.template, work_dir / "report.md", context), repeat
+    )
+
+    return {
+        "stages": {k: round(v, 6) for k, v in stages.items()},
+        "counts": {
+            "indexed_files": len(index.files),
+            "indexed_bytes": sum(index.files.sizes),
+            "evidence_records": len(evidence.ids()),
+        },
+    }
+
+
+def _parse_thresholds(values: list[str]) -> tuple[float, dict[str, float]]:
+    default, per_stage = 0.25, {}
+    for v in values:
+        if "=" in v:
+            stage, _, x = v.partition("=")
+            per_stage[stage] = float(x)
+        else:
+            default = float(v)
+    return default, per_stage
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+    per_stage: dict[str, float] | None = None,
+    min_delta: float = 0.01,
+) -> list[dict[str, Any]]:
+    """One row per (size, stage) present in both results; `regressed` marks those over threshold."""
+    rows = []
+    for size, cur in current["results"].items():
+        base = baseline.get("results", {}).get(size)
+        if base is None:
+            continue
+        for stage, t in cur["stages"].items():
+            b = base["stages"].get(stage)
+            if b is None:
+                continue
+            limit = (per_stage or {}).get(stage, threshold)
+            ratio = t / b if b > 0 else float("inf") if t > 0 else 1.0
+            rows.append({
+                "files": size, "stage": stage, "baseline_s": b, "current_s": t, "ratio": round(ratio, 3),
+                "regressed": ratio > 1 + limit and t - b > min_delta,
+            })
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, nargs="+", default=[1000, 10_000], help="Repo sizes (1k .. 1M)")
+    ap.add_argument("--size-dist", choices=SIZE_DISTS, default="lognormal")
+    ap.add_argument("--mean-size", type=int, default=2048, help="Mean file size in bytes")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--root", type=Path, default=None, help="Reuse/create synthetic repos here (default: temp dir)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--repeat", type=int, default=1, help="Best of N per stage")
+    ap.add_argument("--out", type=Path, default=None, help="Write results JSON here (default: stdout)")
+    ap.add_argument("--baseline", type=Path, default=None, help="Earlier results JSON to compare against")
+    ap.add_argument("--threshold", action="append", default=[],
+                    help="Allowed relative slowdown, e.g. 0.25, or per stage: render_report=0.5 (repeatable)")
+    ap.add_argument("--min-delta", type=float, default=0.01, help="Ignore slowdowns smaller than this many seconds")
+    args = ap.parse_args()
+
+    cfg = load_config(REPO_ROOT / "templates" / "config.yaml")
+    cfg.analysis.max_files_scanned = max(cfg.analysis.max_files_scanned, max(args.files))
+    root = args.root or Path(tempfile.mkdtemp(prefix="dda-bench-stages-"))
+
+    results: dict[str, Any] = {}
+    for n in args.files:
+        repo_dir = root / f"repo-{n}-{args.size_dist}-{args.mean_size}-s{args.seed}"
+        if not (repo_dir / "go.mod").exists():
+            t0 = time.perf_counter()
+            make_synthetic_repo(repo_dir, n, seed=args.seed, size_dist=args.size_dist, mean_size=args.mean_size)
+            print(f"generated {n} files in {time.perf_counter() - t0:.1f}s at {repo_dir}", file=sys.stderr)
+        work_dir = Path(tempfile.mkdtemp(prefix="dda-bench-run-", dir=root))
+        results[str(n)] = run_stages(repo_dir, work_dir, cfg, args.workers, args.repeat)
+        for stage, t in results[str(n)]["stages"].items():
+            print(f"{n:>9} {stage:32s} {t * 1000:10.1f} ms", file=sys.stderr)
+
+    doc = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "workers": args.workers,
+            "size_dist": args.size_dist,
+            "mean_size": args.mean_size,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+    failed = False
+    if args.baseline is not None:
+        threshold, per_stage = _parse_thresholds(args.threshold)
+        rows = compare(doc, json.loads(args.baseline.read_text()), threshold, per_stage, args.min_delta)
+        doc["comparison"] = {"baseline": str(args.baseline), "threshold": threshold,
+                             "per_stage": per_stage, "rows": rows}
+        for r in rows:
+            if r["regressed"]:
+                failed = True
+                print(f"REGRESSION {r['files']:>9} {r['stage']:32s} {r['baseline_s'] * 1000:.1f} -> "
+                      f"{r['current_s'] * 1000:.1f} ms (x{r['ratio']})", file=sys.stderr)
+
+    text = json.dumps(doc, indent=2)
+    if args.out:
+        args.out.write_text(text)
+    else:
+        print(text)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
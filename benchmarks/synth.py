@@ -0,0 +1,212 @@
+"""
+Synthetic repository trees for benchmarks.
+
+- make_synthetic_tree: many tiny files, for walker/index throughput. Layout
+  is deterministic for a given (n_files, seed): a handful of top-level
+  components with nested packages, plus vendor/node_modules/.git noise that
+  the default config excludes.
+- make_synthetic_repo: repo-shaped content (sources with imports, docs,
+  workflows, charts, Terraform) with a configurable size distribution and
+  kind mix, for per-stage benchmarks that exercise the extractors.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import random
+from pathlib import Path
+
+SOURCE_EXTS = ["go", "py", "ts", "md", "yaml", "json", "png"]
+NOISE_DIRS = ["vendor", "node_modules", ".git"]
+
+
+def make_synthetic_tree(root: Path, n_files: int, seed: int = 0, noise_ratio: float = 0.4) -> Path:
+    """Writes `n_files` small files under `root` and returns `root`."""
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    n_noise = int(n_files * noise_ratio)
+    written = 0
+    made_dirs: set[Path] = set()
+
+    def _write(rel: str) -> None:
+        p = root / rel
+        if p.parent not in made_dirs:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            made_dirs.add(p.parent)
+        p.write_bytes(b"x" * rng.randint(0, 256))
+
+    while written < n_files:
+        i = written
+        if i < n_noise:
+            top = NOISE_DIRS[i % len(NOISE_DIRS)]
+            rel = f"{top}/pkg{i // 500}/sub{i // 50 % 10}/f{i}.{SOURCE_EXTS[i % 3]}"
+        else:
+            comp = f"comp{i % 16}"
+            rel = f"{comp}/mod{i // 400 % 64}/pkg{i // 40 % 10}/f{i}.{rng.choice(SOURCE_EXTS)}"
+        _write(rel)
+        written += 1
+    return root
+
+
+# Relative weights of file kinds in make_synthetic_repo; override per call.
+DEFAULT_MIX = {
+    "source": 70,
+    "docs": 8,
+    "workflow": 1,
+    "chart": 4,
+    "tf": 4,
+    "config": 5,
+    "noise": 8,
+}
+SIZE_DISTS = ("lognormal", "uniform", "fixed")
+
+_GO = """package {pkg}
+
+import (
+\t"fmt"
+\t"net/http"
+\t"example.com/synth/{dep}"
+)
+
+func Handle{i}(w http.ResponseWriter, r *http.Request) {{
+\tresp, _ := http.Get("http://upstream/{i}")
+\tfmt.Fprintln(w, resp.Status, {dep_pkg}.Value)
+}}
+"""
+_PY = """import time
+import requests
+from {dep} import helper
+
+
+def fetch_{i}(urls):
+    out = ""
+    for u in urls:
+        out += requests.get(u).text
+    return helper(out)
+"""
+_TS = """import {{ helper }} from "{dep}";
+
+export async function load{i}(url: string) {{
+  const res = await fetch(url);
+  return helper(await res.text());
+}}
+"""
+_WORKFLOW = """name: ci-{i}
+on: [push, pull_request]
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - run: make test
+"""
+_CHART = """apiVersion: v2
+name: svc{i}
+version: 0.1.{i}
+"""
+_TF = """resource "aws_s3_bucket" "b{i}" {{
+  bucket = "synth-{i}"
+}}
+"""
+
+
+def _size(rng: random.Random, dist: str, mean: int) -> int:
+    if dist == "fixed":
+        return mean
+    if dist == "uniform":
+        return rng.randint(0, 2 * mean)
+    # long tail: most files small, a few large (like real repos)
+    return min(int(rng.lognormvariate(0, 1.2) * mean / 2.05), 200 * mean)
+
+
+def _pad(body: str, size: int, comment: str) -> bytes:
+    data = body.encode()
+    if len(data) < size:
+        line = f"{comment} padding line for synthetic size distribution\n".encode()
+        data += line * ((size - len(data)) // len(line) + 1)
+    return data
+
+
+def _pad_json(size: int) -> bytes:
+    # padding goes inside a string value so the file stays valid JSON
+    base = len(json.dumps({"k": 1, "pad": ""})) + 1
+    return (json.dumps({"k": 1, "pad": "x" * max(0, size - base)}) + "\n").encode()
+
+
+def make_synthetic_repo(
+    root: Path,
+    n_files: int,
+    seed: int = 0,
+    size_dist: str = "lognormal",
+    mean_size: int = 2048,
+    mix: dict[str, int] | None = None,
+) -> Path:
+    """
+    Writes a repo-shaped tree of `n_files` files under `root`: Go/Python/TS
+    sources with intra-repo imports and a few perf smells, docs, GitHub
+    workflows, Helm charts, Terraform, dependency manifests, and excluded
+    vendor/node_modules noise. Exactly `n_files` distinct files are
+    written. Deterministic for given arguments.
+    """
+    if size_dist not in SIZE_DISTS:
+        raise ValueError(f"size_dist must be one of {SIZE_DISTS}")
+    rng = random.Random(seed)
+    weights = {**DEFAULT_MIX, **(mix or {})}
+    kinds = list(weights)
+    cum = [weights[k] for k in kinds]
+    root.mkdir(parents=True, exist_ok=True)
+    made_dirs: set[Path] = set()
+    written: set[str] = set()
+
+    def _write(rel: str, data: bytes) -> None:
+        # rewriting a path (index.ts, Chart.yaml, __init__.py) doesn't count; past n_files nothing new is added
+        if rel not in written and len(written) >= n_files:
+            return
+        p = root / rel
+        if p.parent not in made_dirs:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            made_dirs.add(p.parent)
+        p.write_bytes(data)
+        written.add(rel)
+
+    _write("README.md", b"# synthetic repo\n\nGenerated for benchmarks.\n")
+    _write("go.mod", b"module example.com/synth\n\ngo 1.22\n")
+    _write("requirements.txt", b"requests==2.32.0\n")
+    n_comp = max(2, min(16, n_files // 500))
+
+    for i in itertools.count():
+        if len(written) >= n_files:
+            break
+        kind = rng.choices(kinds, cum)[0]
+        comp = f"comp{i % n_comp}"
+        pkg = f"pkg{i // 40 % 25}"
+        size = _size(rng, size_dist, mean_size)
+        if kind == "source":
+            dep_comp, dep_pkg = f"comp{rng.randrange(n_comp)}", f"pkg{rng.randrange(25)}"
+            lang = ("go", "py", "ts")[i % 3]
+            if lang == "go":
+                body = _GO.format(pkg=pkg, dep=f"{dep_comp}/{dep_pkg}", dep_pkg=dep_pkg, i=i)
+                _write(f"{comp}/{pkg}/f{i}.go", _pad(body, size, "//"))
+            elif lang == "py":
+                _write(f"{comp}/__init__.py", b"")
+                _write(f"{comp}/{pkg}/__init__.py", b"")
+                body = _PY.format(dep=f"{dep_comp}.{dep_pkg}", i=i)
+                _write(f"{comp}/{pkg}/m{i}.py", _pad(body, size, "#"))
+            else:
+                body = _TS.format(dep=f"../../{dep_comp}/{dep_pkg}/index", i=i)
+                _write(f"{comp}/{pkg}/index.ts" if i % 7 == 0 else f"{comp}/{pkg}/m{i}.ts", _pad(body, size, "//"))
+        elif kind == "docs":
+            _write(f"docs/{comp}/page{i}.md", _pad(f"# Page {i}\n", size, "<!-- -->"))
+        elif kind == "workflow":
+            _write(f".github/workflows/ci{i}.yml", _WORKFLOW.format(i=i).encode())
+        elif kind == "chart":
+            _write(f"charts/svc{i % 50}/Chart.yaml", _CHART.format(i=i % 50).encode())
+            _write(f"charts/svc{i % 50}/templates/t{i}.yaml", _pad("kind: Deployment\n", size, "#"))
+        elif kind == "tf":
+            _write(f"infra/{comp}/main{i}.tf", _pad(_TF.format(i=i), size, "#"))
+        elif kind == "config":
+            _write(f"{comp}/config/c{i}.json", _pad_json(min(size, 4096)))
+        else:
+            top = NOISE_DIRS[i % 2]  # vendor / node_modules
+            _write(f"{top}/lib{i % 100}/f{i}.js", _pad("module.exports = {};\n", size, "//"))
+    return root
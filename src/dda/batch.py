@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import os
+import shutil
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from dda.utils.text import repo_slug
+
+MANIFEST_NAME = "manifest.json"
+
+
+def read_repo_list(path: Path) -> List[str]:
+    """One repo URL or local path per line; blank lines and `#` comments are skipped."""
+    repos = []
+    for line in path.read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            repos.append(line)
+    return repos
+
+
+class _TimedSlot:
+    """Wraps a (cross-process) semaphore and records wait/hold seconds under `name`."""
+
+    def __init__(self, sem: Any, name: str, timings: dict[str, float]):
+        self.sem = sem
+        self.name = name
+        self.timings = timings
+
+    def __enter__(self) -> "_TimedSlot":
+        t0 = time.perf_counter()
+        self.sem.acquire()
+        self._held_at = time.perf_counter()
+        self.timings[f"{self.name}_wait_s"] = round(self._held_at - t0, 3)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.timings[f"{self.name}_s"] = round(time.perf_counter() - self._held_at, 3)
+        self.sem.release()
+
+
+def _analyze_one(
+    repo: str,
+    run_dir: Path,
+    focus: Optional[str],
+    config_path: Path,
+    keep_repo: bool,
+    clone_sem: Any,
+    analysis_sem: Any,
+) -> dict[str, Any]:
+    # imported here so the parent process does not pay for the pipeline import
+    from dda.pipeline import run_analysis
+
+    timings: dict[str, float] = {}
+    t0 = time.perf_counter()
+    entry: dict[str, Any] = {"repo": repo, "run_dir": run_dir.as_posix(), "pid": os.getpid()}
+    try:
+        result = run_analysis(
+            repo_url=repo,
+            run_dir=run_dir,
+            focus=focus,
+            config_path=config_path,
+            keep_repo=keep_repo,
+            clone_slot=_TimedSlot(clone_sem, "clone", timings),
+            analysis_slot=_TimedSlot(analysis_sem, "analysis", timings),
+        )
+        entry["status"] = "ok"
+        entry["commit"] = result["summary"]["repo"]["commit"]
+        entry["overall"] = result["scorecard"]["overall"]
+    except Exception as exc:
+        entry["status"] = "failed"
+        entry["error"] = f"{type(exc).__name__}: {exc}"
+        entry["traceback"] = traceback.format_exc(limit=5)
+    timings["total_s"] = round(time.perf_counter() - t0, 3)
+    entry["timings"] = timings
+    return entry
+
+
+def run_batch(
+    repos: List[str],
+    out_root: Path,
+    config_path: Path,
+    batch_id: str,
+    focus: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_clones: int = 4,
+    max_analyses: Optional[int] = None,
+    keep_repo: bool = False,
+    on_result: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> dict[str, Any]:
+    """
+    Analyzes `repos` on a process pool of `workers`. At most `max_clones` clones
+    (network bound) and `max_analyses` analyses (CPU bound) are in flight at once.
+    A failing repo is recorded in the manifest and does not stop the others.
+    The manifest is written to `<out_root>/batch-<batch_id>/manifest.json`.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_analyses = max_analyses or workers
+    config_path = config_path.resolve()
+
+    started = time.time()
+    t0 = time.perf_counter()
+    results: List[Optional[dict[str, Any]]] = [None] * len(repos)
+    run_dirs = _run_dirs(repos, out_root, batch_id)
+    with multiprocessing.Manager() as manager:
+        clone_sem = manager.BoundedSemaphore(max(1, max_clones))
+        analysis_sem = manager.BoundedSemaphore(max(1, max_analyses))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_analyze_one, repo, run_dir, focus, config_path, keep_repo, clone_sem, analysis_sem): i
+                for i, (repo, run_dir) in enumerate(zip(repos, run_dirs))
+            }
+            for fut in as_completed(futures):
+                i = futures[fut]
+                try:
+                    entry = fut.result()
+                except Exception as exc:  # worker process died
+                    entry = {
+                        "repo": repos[i],
+                        "run_dir": run_dirs[i].as_posix(),
+                        "status": "failed",
+                        "error": f"{type(exc).__name__}: {exc}",
+                        "timings": {},
+                    }
+                results[i] = entry
+                if on_result:
+                    on_result(entry)
+
+    limits = {"workers": workers, "max_clones": max_clones, "max_analyses": max_analyses}
+    return _write_manifest(out_root, batch_id, started, time.perf_counter() - t0, limits, results)
+
+
+def _run_dirs(repos: List[str], out_root: Path, batch_id: str) -> List[Path]:
+    """One run dir per repo; distinct even when two repos share a basename."""
+    run_dirs: List[Path] = []
+    seen: dict[str, int] = {}
+    for repo in repos:
+        slug = repo_slug(repo)
+        seen[slug] = seen.get(slug, 0) + 1
+        if seen[slug] > 1:
+            slug = f"{slug}-{seen[slug]}"
+        run_dir = out_root / slug / batch_id
+        run_dir.mkdir(parents=True, exist_ok=True)
+        run_dirs.append(run_dir)
+    return run_dirs
+
+
+def _write_manifest(
+    out_root: Path,
+    batch_id: str,
+    started: float,
+    wall_s: float,
+    limits: dict[str, Any],
+    results: List[Optional[dict[str, Any]]],
+) -> dict[str, Any]:
+    manifest = {
+        "batch_id": batch_id,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(started)),
+        "wall_s": round(wall_s, 3),
+        "limits": limits,
+        "counts": {
+            "total": len(results),
+            "ok": sum(1 for r in results if r and r["status"] == "ok"),
+            "failed": sum(1 for r in results if r and r["status"] != "ok"),
+        },
+        "repos": results,
+    }
+    manifest_dir = out_root / f"batch-{batch_id}"
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    (manifest_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _analyze_cloned(
+    repo: str, repo_dir: Path, repo_meta: Any, run_dir: Path, focus: Optional[str], config_path: Path
+) -> dict[str, Any]:
+    # imported here so the parent process does not pay for the pipeline import
+    from dda.ingest.reader import GitReader
+    from dda.pipeline import analyze_checkout
+    from dda.utils.config import load_config
+
+    cfg = load_config(config_path)
+    reader = GitReader(repo_dir, repo_meta.commit) if cfg.ingest.backend == "git" else None
+    try:
+        result = analyze_checkout(cfg, repo, repo_dir, repo_meta, run_dir, focus, reader=reader)
+    finally:
+        if reader is not None:
+            reader.close()
+    return {"commit": result["summary"]["repo"]["commit"], "overall": result["scorecard"]["overall"]}
+
+
+async def _pipeline(
+    repos: List[str],
+    run_dirs: List[Path],
+    config_path: Path,
+    focus: Optional[str],
+    prefetch: int,
+    max_analyses: int,
+    disk_budget_bytes: Optional[int],
+    keep_repo: bool,
+    on_result: Optional[Callable[[dict[str, Any]], None]],
+) -> List[Optional[dict[str, Any]]]:
+    from dda.ingest.clone import fetch_objects, sparse_patterns
+    from dda.ingest.prefetch import DiskBudget, clone_repo_async, disk_usage
+    from dda.utils.config import load_config
+
+    cfg = load_config(config_path)
+    mirror_root = cfg.cache.mirrors if cfg.ingest.mirror else None
+    sparse = sparse_patterns(cfg.analysis.include_globs, cfg.analysis.exclude_globs) if cfg.ingest.sparse else None
+
+    loop = asyncio.get_running_loop()
+    ahead = asyncio.Semaphore(max(1, prefetch))  # clones started but not yet handed to an analysis worker
+    analyses = asyncio.Semaphore(max_analyses)
+    budget = DiskBudget(disk_budget_bytes)
+    results: List[Optional[dict[str, Any]]] = [None] * len(repos)
+
+    async def _one(i: int, pool: ProcessPoolExecutor) -> None:
+        repo, run_dir = repos[i], run_dirs[i]
+        work_dir = run_dir / "_work"
+        timings: dict[str, float] = {}
+        entry: dict[str, Any] = {"repo": repo, "run_dir": run_dir.as_posix()}
+        t0 = time.perf_counter()
+        size = 0
+        await ahead.acquire()
+        handed_off = False
+        try:
+            reserved = await budget.acquire()
+            t_clone = time.perf_counter()
+            timings["clone_wait_s"] = round(t_clone - t0, 3)
+            repo_dir = work_dir / "repo"
+            try:
+                if cfg.ingest.backend == "git":
+                    meta, repo_dir = await asyncio.to_thread(fetch_objects, repo, work_dir / "repo.git", mirror_root)
+                else:
+                    meta = await clone_repo_async(repo, repo_dir, mirror_root=mirror_root, sparse=sparse)
+            finally:
+                size = await asyncio.to_thread(disk_usage, work_dir)
+                await budget.settle(reserved, size)
+            timings["clone_s"] = round(time.perf_counter() - t_clone, 3)
+            entry["disk_bytes"] = size
+
+            t_wait = time.perf_counter()
+            async with analyses:
+                ahead.release()
+                handed_off = True
+                t_analysis = time.perf_counter()
+                timings["analysis_wait_s"] = round(t_analysis - t_wait, 3)
+                out = await loop.run_in_executor(
+                    pool, _analyze_cloned, repo, repo_dir, meta, run_dir, focus, config_path
+                )
+                timings["analysis_s"] = round(time.perf_counter() - t_analysis, 3)
+            entry.update(status="ok", **out)
+        except Exception as exc:
+            entry["status"] = "failed"
+            entry["error"] = f"{type(exc).__name__}: {exc}"
+            entry["traceback"] = traceback.format_exc(limit=5)
+        finally:
+            if not handed_off:
+                ahead.release()
+            if not keep_repo:
+                await asyncio.to_thread(shutil.rmtree, work_dir, True)
+            await budget.release(size)
+        timings["total_s"] = round(time.perf_counter() - t0, 3)
+        entry["timings"] = timings
+        results[i] = entry
+        if on_result:
+            on_result(entry)
+
+    with ProcessPoolExecutor(max_workers=max_analyses) as pool:
+        await asyncio.gather(*(_one(i, pool) for i in range(len(repos))))
+    return results
+
+
+def run_batch_pipelined(
+    repos: List[str],
+    out_root: Path,
+    config_path: Path,
+    batch_id: str,
+    focus: Optional[str] = None,
+    prefetch: int = 2,
+    max_analyses: Optional[int] = None,
+    disk_budget_bytes: Optional[int] = None,
+    keep_repo: bool = False,
+    on_result: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> dict[str, Any]:
+    """
+    Like run_batch, but clones on an asyncio event loop (git as async
+    subprocesses) while analyses run on a process pool, so the network and the
+    CPUs stay busy at the same time.
+
+    - Up to `prefetch` repos are cloned ahead of the analyses (in flight or
+      cloned and waiting for a free analysis worker).
+    - Checkouts on disk are capped at about `disk_budget_bytes` (see
+      prefetch.DiskBudget); a checkout is deleted as soon as its analysis ends.
+      With `keep_repo`, checkouts stay and the budget only paces cloning.
+    """
+    max_analyses = max_analyses or os.cpu_count() or 1
+    config_path = config_path.resolve()
+    started = time.time()
+    t0 = time.perf_counter()
+    run_dirs = _run_dirs(repos, out_root, batch_id)
+    results = asyncio.run(
+        _pipeline(
+            repos, run_dirs, config_path, focus, prefetch, max_analyses, disk_budget_bytes, keep_repo, on_result
+        )
+    )
+    limits = {
+        "mode": "pipelined",
+        "prefetch": prefetch,
+        "max_analyses": max_analyses,
+        "disk_budget_bytes": disk_budget_bytes,
+    }
+    return _write_manifest(out_root, batch_id, started, time.perf_counter() - t0, limits, results)
@@ -9,8 +9,7 @@ import typer
 from rich.console import Console
 from rich.panel import Panel
 
-from dda.pipeline import run_analysis
-from dda.utils.text import slugify
+from dda.utils.text import repo_slug
 
 app = typer.Typer(add_completion=False)
 console = Console()
@@ -24,14 +23,28 @@ def analyze(
     config: Path = typer.Option(Path("templates/config.yaml"), "--config", help="Path to config.yaml"),
     run_id: Optional[str] = typer.Option(None, "--run-id", help="Optional run id override"),
     keep_repo: bool = typer.Option(False, "--keep-repo", help="Do not delete cloned repo after run"),
+    since_run: Optional[Path] = typer.Option(
+        None, "--since-run", help="Previous run dir of the same repo; re-analyze only what changed since its commit"
+    ),
+    profile: Optional[str] = typer.Option(
+        None, "--profile", help="Dump a per-stage profile under <run>/profile: cpu (cProfile) | mem (tracemalloc)"
+    ),
+    fresh: bool = typer.Option(
+        False, "--fresh", help="Re-analyze even if an identical earlier run (same commit, config, code) is cached (cache.enabled)"
+    ),
 ):
     """
     Evidence-first due diligence analysis.
-    Produces report.md + scorecard.json + evidence JSONL + graph.json.
+    Produces report.md + scorecard.json + evidence JSONL + graph.json + metrics.json.
     """
-    repo_slug = slugify(repo_url.split("/")[-1])
+    from dda.metrics import PROFILE_MODES
+    from dda.pipeline import run_analysis
+
+    if profile is not None and profile not in PROFILE_MODES:
+        raise typer.BadParameter(f"--profile must be one of {list(PROFILE_MODES)}")
+
     rid = run_id or f"{int(time.time())}"
-    run_dir = out / repo_slug / rid
+    run_dir = out / repo_slug(repo_url) / rid
     run_dir.mkdir(parents=True, exist_ok=True)
 
     console.print(Panel.fit(f"[bold]DDA Analyze[/bold]\nRepo: {repo_url}\nRun: {rid}\nOut: {run_dir}"))
@@ -42,6 +55,9 @@ def analyze(
         focus=focus,
         config_path=config,
         keep_repo=keep_repo,
+        previous_run=since_run,
+        profile=profile,
+        reuse_results=not fresh,
     )
 
     # brief summary to terminal
@@ -49,12 +65,179 @@ def analyze(
     console.print(f"Report: {run_dir / 'report.md'}")
     console.print(f"Scorecard: {run_dir / 'scorecard.json'}")
     console.print(f"Evidence: {run_dir / 'evidence' / 'evidence.jsonl'}")
+    console.print(f"Metrics: {run_dir / 'metrics.json'}")
 
     # optional pretty summary
     console.print("\n[bold]Overall[/bold]")
     console.print(json.dumps(result["scorecard"]["overall"], indent=2))
 
 
+@app.command("analyze-batch")
+def analyze_batch(
+    repos_file: Path = typer.Argument(..., help="File with one repo URL or local path per line (# comments allowed)"),
+    out: Path = typer.Option(Path("./out"), "--out", "-o", help="Output root directory"),
+    focus: Optional[str] = typer.Option(None, "--focus", help="Optional focus area (infra|security|perf|obs|testing)"),
+    config: Path = typer.Option(Path("templates/config.yaml"), "--config", help="Path to config.yaml"),
+    batch_id: Optional[str] = typer.Option(None, "--batch-id", help="Run id used for every repo in the batch"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-j", help="Process pool size (default: CPU count)"),
+    max_clones: int = typer.Option(4, "--max-clones", help="Max concurrent clones"),
+    max_analyses: Optional[int] = typer.Option(None, "--max-analyses", help="Max concurrent analyses (default: workers)"),
+    keep_repo: bool = typer.Option(False, "--keep-repo", help="Do not delete cloned repos after each run"),
+    prefetch: int = typer.Option(
+        0, "--prefetch", help="Pipelined mode: clone this many repos ahead (async git) while others are analyzed"
+    ),
+    disk_budget_mb: Optional[int] = typer.Option(
+        None, "--disk-budget-mb", help="Pipelined mode: cap on checkouts held on disk at once"
+    ),
+):
+    """
+    Analyze many repos on a bounded process pool.
+    Writes one run dir per repo plus batch-<id>/manifest.json with per-repo status and timings.
+    With --prefetch, cloning overlaps analysis; --max-analyses (default: workers) sizes the analysis pool.
+    """
+    from dda.batch import read_repo_list, run_batch, run_batch_pipelined
+
+    repos = read_repo_list(repos_file)
+    bid = batch_id or f"{int(time.time())}"
+    console.print(Panel.fit(f"[bold]DDA Batch[/bold]\nRepos: {len(repos)}\nBatch: {bid}\nOut: {out}"))
+
+    def _progress(entry: dict) -> None:
+        mark = "[green]ok[/green]" if entry["status"] == "ok" else f"[red]failed[/red] {entry.get('error', '')}"
+        console.print(f"{entry['repo']}: {mark} ({entry['timings'].get('total_s', '?')}s)")
+
+    if prefetch > 0:
+        manifest = run_batch_pipelined(
+            repos=repos,
+            out_root=out,
+            config_path=config,
+            batch_id=bid,
+            focus=focus,
+            prefetch=prefetch,
+            max_analyses=max_analyses or workers,
+            disk_budget_bytes=disk_budget_mb * 1024 * 1024 if disk_budget_mb else None,
+            keep_repo=keep_repo,
+            on_result=_progress,
+        )
+    else:
+        manifest = run_batch(
+            repos=repos,
+            out_root=out,
+            config_path=config,
+            batch_id=bid,
+            focus=focus,
+            workers=workers,
+            max_clones=max_clones,
+            max_analyses=max_analyses,
+            keep_repo=keep_repo,
+            on_result=_progress,
+        )
+
+    counts = manifest["counts"]
+    console.print(f"\n[bold]Done.[/bold] {counts['ok']}/{counts['total']} ok, {counts['failed']} failed")
+    console.print(f"Manifest: {out / f'batch-{bid}' / 'manifest.json'}")
+    if counts["failed"]:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def serve(
+    out: Path = typer.Option(Path("./out"), "--out", "-o", help="Output root directory for job run dirs"),
+    config: Path = typer.Option(Path("templates/config.yaml"), "--config", help="Path to config.yaml"),
+    host: str = typer.Option("127.0.0.1", "--host", help="Address to listen on"),
+    port: int = typer.Option(8765, "--port", help="Port to listen on"),
+    socket_path: Optional[Path] = typer.Option(None, "--socket", help="Listen on this Unix socket instead of host:port"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-j", help="Concurrent analyses (default: CPU count)"),
+    max_queue: int = typer.Option(64, "--max-queue", help="Jobs allowed to wait; more are rejected with 429"),
+    keep_repo: bool = typer.Option(False, "--keep-repo", help="Do not delete cloned repos after each job"),
+):
+    """
+    Long-running analysis daemon: POST /jobs {"repo": ...}, then GET /jobs/<id>.
+    Worker processes stay warm (imports, config, globs, templates, caches) across jobs.
+    """
+    from dda.serve import JobQueue, make_server
+    from dda.utils.config import load_config
+
+    load_config(config)  # fail fast on a bad config
+    jobs = JobQueue(out_root=out, config_path=config, workers=workers, max_queue=max_queue, keep_repo=keep_repo)
+    server = make_server(jobs, host=host, port=port, socket_path=socket_path)
+    where = socket_path or f"http://{host}:{port}"
+    console.print(Panel.fit(f"[bold]DDA Serve[/bold]\nListening: {where}\nWorkers: {jobs.workers}\nOut: {out}"))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        jobs.close()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+
+
+@app.command("import-runs")
+def import_runs(
+    root: Path = typer.Argument(Path("./out"), help="Directory to search for run dirs (those with a scorecard.json)"),
+    db: Path = typer.Option(Path("./out/dda.sqlite"), "--db", help="SQLite run store to write"),
+):
+    """
+    Bulk-imports existing run dirs into the SQLite run store.
+    Re-importing a run dir replaces its rows.
+    """
+    from dda.rundb import RunDB, find_run_dirs
+
+    t0 = time.perf_counter()
+    with RunDB(db) as store:
+        n = store.import_runs(find_run_dirs(root))
+    console.print(f"Imported {n} run(s) into {db} in {time.perf_counter() - t0:.2f}s")
+
+
+@app.command()
+def query(
+    sql: Optional[str] = typer.Argument(None, help="SQL over runs / evidence / refs / category_scores / latest_runs"),
+    db: Path = typer.Option(Path("./out/dda.sqlite"), "--db", help="SQLite run store to read"),
+    preset: Optional[str] = typer.Option(
+        None, "--preset", help="missing-evidence | has-evidence (arg: evidence id) | category (arg: category id)"
+    ),
+    arg: Optional[str] = typer.Option(None, "--arg", help="Argument for --preset"),
+    as_json: bool = typer.Option(False, "--json", help="Print rows as JSON objects"),
+):
+    """
+    Queries the SQLite run store, e.g. which repos lack an evidence id as of their latest run:
+    dda query --preset missing-evidence --arg EVID-SEC-SCANNERS
+    """
+    import sqlite3
+
+    from rich.table import Table
+
+    from dda.rundb import PRESETS, RunDB
+
+    if preset is not None:
+        if preset not in PRESETS or arg is None:
+            raise typer.BadParameter(f"--preset must be one of {sorted(PRESETS)} and needs --arg")
+        sql, params = PRESETS[preset], (arg,)
+    elif sql is None:
+        raise typer.BadParameter("Give a SQL query or --preset")
+    else:
+        params = ()
+    if not db.exists():
+        raise typer.BadParameter(f"Run store not found: {db} (see `dda import-runs`)")
+
+    with RunDB(db) as store:
+        try:
+            cols, rows = store.query(sql, params)
+        except sqlite3.Error as exc:
+            raise typer.BadParameter(f"Query failed: {exc}")
+
+    if as_json:
+        for row in rows:
+            console.print_json(json.dumps(dict(zip(cols, row))))
+        return
+    table = Table(*cols)
+    for row in rows:
+        table.add_row(*("" if v is None else str(v) for v in row))
+    console.print(table)
+    console.print(f"{len(rows)} row(s)")
+
+
 @app.command()
 def validate(
     scorecard_path: Path = typer.Argument(..., help="Path to scorecard.json"),
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+from array import array
+from collections import OrderedDict
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from dda.evidence.store import EvidenceStore
+from dda.ingest.index import FileIndex
+from dda.ingest.reader import Buffer, FsReader, RepoReader
+from dda.utils.cache import atomic_write_bytes, evict_to_size, touch
+
+FILE_LINES_RE = re.compile(r"^(?P<path>.+):L(?P<start>\d+)-L(?P<end>\d+)$")
+TRUNCATED_MARK = "\n…[truncated]"
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Files kept mapped at once; older ones are closed (their line offsets stay cached).
+MAX_OPEN_FILES = 64
+
+
+def parse_file_lines_ref(ref: str) -> Optional[Tuple[str, int, int]]:
+    m = FILE_LINES_RE.match(ref)
+    if not m:
+        return None
+    return m.group("path"), int(m.group("start")), int(m.group("end"))
+
+
+class LineIndex:
+    """
+    Byte offset of every line start of one file, built once over its buffer.
+    `starts[i]` is where line i+1 begins; the file's size closes the last line.
+    """
+
+    __slots__ = ("starts", "size")
+
+    def __init__(self, buf, size: int):
+        self.starts = array("Q", [0])
+        self.starts.extend(m.end() for m in re.finditer(b"\n", buf))
+        if size and self.starts[-1] == size:
+            self.starts.pop()  # trailing newline doesn't open another line
+        self.size = size
+
+    @property
+    def line_count(self) -> int:
+        return len(self.starts) if self.size else 0
+
+    def span(self, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Byte range of lines start..end (1-based, inclusive), clamped; None if start is past EOF."""
+        n = self.line_count
+        if start < 1 or start > n or end < start:
+            return None
+        end = min(end, n)
+        stop = self.starts[end] if end < n else self.size
+        return self.starts[start - 1], stop
+
+
+class SnippetService:
+    """
+    Turns `file_lines` refs into quoted snippets.
+
+    - Each file is viewed (mapped, for a checkout) and indexed once; any Lx-Ly
+      range is then sliced in O(1). Contents come from `reader`, by default the
+      checkout at `repo_dir`.
+    - Text is truncated to `max_chars`.
+    - Snippets are content-addressed (`<sha256[:16]>.txt`), so identical text
+      cited by several records is written once per run; with `cache_dir` they
+      are also kept under `<cache_dir>/snippets/` and hardlinked into later runs.
+    - With `index`, each file's line count is handed to index.line_count, so
+      the evidence gate doesn't read and scan cited files a second time.
+    """
+
+    def __init__(
+        self,
+        repo_dir: Path,
+        snippets_dir: Path,
+        max_chars: int,
+        cache_dir: Optional[Path] = None,
+        reader: Optional[RepoReader] = None,
+        index: Optional[FileIndex] = None,
+    ):
+        self.repo_dir = repo_dir
+        self.reader = reader or (index.reader if index is not None else None) or FsReader(repo_dir)
+        self.index = index
+        self.snippets_dir = snippets_dir
+        self.max_chars = max_chars
+        self.store_dir = cache_dir / "snippets" if cache_dir else None
+        self._lines: Dict[str, Optional[LineIndex]] = {}
+        self._open: "OrderedDict[str, Tuple[ExitStack, Buffer]]" = OrderedDict()
+        self._written: Dict[str, str] = {}  # digest -> file name
+
+    def _map(self, path: str) -> Optional[Buffer]:
+        hit = self._open.get(path)
+        if hit is not None:
+            self._open.move_to_end(path)
+            return hit[1]
+        stack = ExitStack()
+        try:
+            buf = stack.enter_context(self.reader.view(path))
+        except OSError:
+            stack.close()
+            return None
+        self._open[path] = (stack, buf)
+        if len(self._open) > MAX_OPEN_FILES:
+            _, (old, _) = self._open.popitem(last=False)
+            old.close()
+        return buf
+
+    def line_index(self, path: str) -> Optional[LineIndex]:
+        if path not in self._lines:
+            buf = self._map(path)
+            idx = self._lines[path] = LineIndex(buf, len(buf)) if buf is not None else None
+            if idx is not None and self.index is not None:
+                self.index.record_line_count(path, idx.line_count)
+        return self._lines[path]
+
+    def text(self, path: str, start: int, end: int) -> Optional[str]:
+        """Lines start..end of `path`, clamped to the file and truncated to max_chars."""
+        idx = self.line_index(path)
+        span = idx.span(start, end) if idx else None
+        if span is None:
+            return None
+        buf = self._map(path)
+        if buf is None:
+            return None
+        lo, hi = span
+        # a UTF-8 char is at most 4 bytes, so this many bytes always covers max_chars
+        cap = 4 * (self.max_chars + 1)
+        text = buf[lo:min(hi, lo + cap)].decode("utf-8", "replace")
+        if len(text) > self.max_chars or hi - lo > cap:
+            text = text[: self.max_chars] + TRUNCATED_MARK
+        return text
+
+    def _write(self, text: str) -> str:
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        name = self._written.get(digest)
+        if name is not None:
+            return name
+        name = f"{digest[:16]}.txt"
+        out = self.snippets_dir / name
+        if not out.exists():
+            if self.store_dir is not None:
+                shared = self.store_dir / digest[:2] / f"{digest}.txt"
+                if not shared.exists():
+                    atomic_write_bytes(shared, data)
+                touch(shared)
+                try:
+                    out.parent.mkdir(parents=True, exist_ok=True)
+                    os.link(shared, out)
+                except OSError:
+                    shutil.copyfile(shared, out)
+            else:
+                atomic_write_bytes(out, data)
+        self._written[digest] = name
+        return name
+
+    def snippet_ref(self, file_lines_ref: str) -> Optional[dict]:
+        parsed = parse_file_lines_ref(file_lines_ref)
+        if parsed is None:
+            return None
+        text = self.text(*parsed)
+        if not text:
+            return None
+        return {"type": "snippet", "ref": f"snippets/{self._write(text)}", "note": file_lines_ref}
+
+    def attach(self, store: EvidenceStore) -> int:
+        """
+        Adds a `snippet` ref (path relative to the evidence dir) for every
+        `file_lines` ref in `store`, reading files in path order so each one is
+        read once. Returns the number of snippet refs added.
+        """
+        pending = []
+        for rec in store:
+            for r in rec.get("refs", []):
+                if r.get("type") == "file_lines":
+                    parsed = parse_file_lines_ref(r.get("ref", ""))
+                    if parsed:
+                        pending.append((parsed, rec["id"], r["ref"]))
+        added = 0
+        for _, eid, ref in sorted(pending):
+            sref = self.snippet_ref(ref)
+            if sref is not None:
+                store.add({"id": eid, "refs": [sref]})
+                added += 1
+        self.close()
+        if self.store_dir is not None and added:
+            evict_to_size(self.store_dir, CACHE_MAX_BYTES, "*.txt")
+        return added
+
+    def close(self) -> None:
+        for stack, _ in self._open.values():
+            stack.close()
+        self._open.clear()
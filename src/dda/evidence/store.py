@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Set
+
+
+class EvidenceStore:
+    """
+    In-memory evidence records keyed by id, flushed to JSONL in one write.
+
+    Adding an id that is already present merges its refs into the existing
+    record (first summary/kind win), so an extractor can cite one id from
+    several places without producing duplicate records.
+    """
+
+    def __init__(self, records: Iterable[dict[str, Any]] = ()):
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._ref_keys: dict[str, Set[tuple]] = {}
+        self.extend(records)
+
+    def add(self, record: dict[str, Any]) -> None:
+        eid = record.get("id")
+        if eid is None:
+            return
+        refs = record.get("refs", [])
+        existing = self._by_id.get(eid)
+        if existing is None:
+            self._by_id[eid] = {**record, "refs": list(refs)}
+            self._ref_keys[eid] = {(r.get("type"), r.get("ref")) for r in refs}
+            return
+        seen = self._ref_keys[eid]
+        for r in refs:
+            key = (r.get("type"), r.get("ref"))
+            if key not in seen:
+                seen.add(key)
+                existing["refs"].append(r)
+
+    def extend(self, records: Iterable[dict[str, Any]]) -> None:
+        for r in records:
+            self.add(r)
+
+    def get(self, eid: str) -> Optional[dict[str, Any]]:
+        return self._by_id.get(eid)
+
+    def ids(self) -> Set[str]:
+        return set(self._by_id)
+
+    def records(self) -> List[dict[str, Any]]:
+        return list(self._by_id.values())
+
+    def __contains__(self, eid: object) -> bool:
+        return eid in self._by_id
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def flush(self, path: Path) -> None:
+        """Writes every record to `path` (replacing it) with a single buffered write."""
+        buf = io.StringIO()
+        for rec in self._by_id.values():
+            buf.write(json.dumps(rec, ensure_ascii=False))
+            buf.write("\n")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(buf.getvalue(), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "EvidenceStore":
+        store = cls()
+        if not path.exists():
+            return store
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                store.add(json.loads(line))
+            except ValueError:
+                continue
+        return store
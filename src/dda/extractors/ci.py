@@ -3,27 +3,26 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
+from dda.evidence.store import EvidenceStore
 from dda.ingest.index import FileIndex
-from dda.extractors._common import write_evidence_jsonl, make_file_lines_ref
+from dda.extractors.registry import register
+from dda.extractors._common import make_file_lines_ref
 
 
-def extract_ci(repo_dir: Path, index: FileIndex, evidence_dir: Path, snippets_dir: Path) -> dict[str, Any]:
-    evidence_path = evidence_dir / "evidence.jsonl"
-    files = {e.path for e in index.files}
-
-    candidates = [p for p in files if p.startswith(".github/workflows/")]
+@register("ci", version="2", inputs=["/.github/workflows/**"])
+def extract_ci(repo_dir: Path, index: FileIndex, evidence: EvidenceStore, snippets_dir: Path) -> dict[str, Any]:
+    candidates = index.under(".github/workflows")
     if not candidates:
         return {"summary": "No GitHub Actions workflows detected (in scanned set)", "workflows": []}
 
     # evidence for first workflow
     wf = sorted(candidates)[0]
-    write_evidence_jsonl(
-        evidence_path,
+    evidence.add(
         {
             "id": "EVID-CI-GHA-001",
             "kind": "ci",
             "summary": f"GitHub Actions workflow present: {wf}",
-            "refs": [{"type": "file_lines", "ref": make_file_lines_ref(wf, 1, 200)}],
-        },
+            "refs": [{"type": "file_lines", "ref": make_file_lines_ref(wf, 1, 200, index)}],
+        }
     )
     return {"summary": "GitHub Actions workflows detected", "workflows": sorted(candidates)}
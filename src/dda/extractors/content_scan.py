@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pathspec import PathSpec
+
+from dda.extractors._common import make_file_lines_ref
+from dda.ingest.index import FileIndex
+from dda.ingest.reader import RepoReader
+from dda.ingest.walk import compile_matcher
+
+# Files at least this large are viewed (mapped, for a checkout) rather than read into memory.
+MMAP_THRESHOLD = 1 << 20
+# Below this many files a process pool costs more than it saves.
+MIN_FILES_PER_WORKER = 64
+
+
+@dataclass(frozen=True)
+class ScanPattern:
+    """
+    id:       stable identifier, also the key hits are returned under
+    regex:    Python regex over the raw bytes (MULTILINE); must not define named groups
+    literals: the file must contain at least one of these for the regex to be tried
+              (cheap prefilter); empty means always try
+    globs:    gitwildmatch globs restricting which indexed files are scanned; empty means all
+    """
+
+    id: str
+    regex: str
+    literals: Tuple[str, ...] = ()
+    globs: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ScanHit:
+    pattern_id: str
+    path: str
+    start_line: int
+    end_line: int
+
+    @property
+    def ref(self) -> str:
+        return make_file_lines_ref(self.path, self.start_line, self.end_line)
+
+
+class _Compiled:
+    """Per-process compiled form of a pattern set; combined regexes are cached per candidate subset."""
+
+    def __init__(self, patterns: Sequence[ScanPattern]):
+        self.patterns = list(patterns)
+        self.single = [re.compile(p.regex.encode("utf-8"), re.MULTILINE) for p in self.patterns]
+        self.literals = [tuple(lit.encode("utf-8") for lit in p.literals) for p in self.patterns]
+        self.globs = [
+            compile_matcher(PathSpec.from_lines("gitwildmatch", p.globs)) if p.globs else None for p in self.patterns
+        ]
+        self._combined: Dict[Tuple[int, ...], "re.Pattern[bytes]"] = {}
+
+    def combined(self, idx: Tuple[int, ...]) -> "re.Pattern[bytes]":
+        rx = self._combined.get(idx)
+        if rx is None:
+            alts = b"|".join(b"(?P<p%d>%s)" % (i, self.patterns[i].regex.encode("utf-8")) for i in idx)
+            rx = self._combined[idx] = re.compile(alts, re.MULTILINE)
+        return rx
+
+    def applicable(self, path: str) -> List[int]:
+        return [i for i, g in enumerate(self.globs) if g is None or g(path)]
+
+
+_COMPILED: Dict[Tuple[ScanPattern, ...], _Compiled] = {}
+
+
+def _compiled(patterns: Tuple[ScanPattern, ...]) -> _Compiled:
+    c = _COMPILED.get(patterns)
+    if c is None:
+        c = _COMPILED[patterns] = _Compiled(patterns)
+    return c
+
+
+def _scan_buffer(c: _Compiled, path: str, buf, candidates: List[int]) -> List[ScanHit]:
+    # literal prefilter: only patterns whose literal occurs anywhere in the file stay in the pass
+    live = tuple(i for i in candidates if not c.literals[i] or any(buf.find(lit) != -1 for lit in c.literals[i]))
+    if not live:
+        return []
+
+    hits: List[ScanHit] = []
+    seen: set = set()
+    line, line_pos = 1, 0  # line number at byte offset line_pos; advanced incrementally
+
+    def _line_at(pos: int) -> int:
+        nonlocal line, line_pos
+        if pos > line_pos:
+            line += buf[line_pos:pos].count(b"\n")
+            line_pos = pos
+        return line
+
+    # next match of pattern i at or after the last position it was searched from; spans only move
+    # forward, so a match past the current span (or none at all) stays valid for the next one
+    ahead: Dict[int, Optional["re.Match[bytes]"]] = {}
+
+    def _next_match(i: int, pos: int) -> Optional["re.Match[bytes]"]:
+        if i in ahead and (ahead[i] is None or ahead[i].start() >= pos):
+            return ahead[i]
+        mm = ahead[i] = c.single[i].search(buf, pos)
+        return mm
+
+    for m in c.combined(live).finditer(buf):
+        start = _line_at(m.start())
+        end = start + buf[m.start():max(m.start(), m.end() - 1)].count(b"\n")
+        first = int(m.lastgroup[1:])
+        key = (first, start)
+        if key not in seen:
+            seen.add(key)
+            hits.append(ScanHit(c.patterns[first].id, path, start, end))
+        # the alternation reports one pattern per match and resumes after it; re-scan every
+        # line the match spans for the others, so their hits on its later lines aren't lost
+        if len(live) > 1:
+            bol = buf.rfind(b"\n", 0, m.start()) + 1
+            eol = buf.find(b"\n", max(m.start(), m.end() - 1))
+            span_end = eol if eol != -1 else len(buf)
+            for i in live:
+                if i == first:
+                    continue
+                pos = bol
+                while True:
+                    mm = _next_match(i, pos)
+                    if mm is None or mm.start() > span_end:
+                        break
+                    s = start + buf[bol:mm.start()].count(b"\n")
+                    if (i, s) not in seen:
+                        seen.add((i, s))
+                        e = s + buf[mm.start():max(mm.start(), mm.end() - 1)].count(b"\n")
+                        hits.append(ScanHit(c.patterns[i].id, path, s, e))
+                    pos = max(mm.end(), mm.start() + 1)
+    return hits
+
+
+def _scan_file(c: _Compiled, reader: RepoReader, path: str, size: int) -> List[ScanHit]:
+    candidates = c.applicable(path)
+    if not candidates or size == 0:
+        return []
+    try:
+        if size >= MMAP_THRESHOLD:
+            with reader.view(path) as buf:
+                return _scan_buffer(c, path, buf, candidates)
+        return _scan_buffer(c, path, reader.read_bytes(path), candidates)
+    except (OSError, ValueError):
+        return []
+
+
+def _scan_chunk(patterns: Tuple[ScanPattern, ...], reader: RepoReader, files: List[Tuple[str, int]]) -> List[ScanHit]:
+    c = _compiled(patterns)
+    out: List[ScanHit] = []
+    for path, size in files:
+        out.extend(_scan_file(c, reader, path, size))
+    return out
+
+
+def _chunks(files: List[Tuple[str, int]], n: int) -> List[List[Tuple[str, int]]]:
+    # greedy by size so one chunk doesn't end up with all the big files
+    buckets: List[List[Tuple[str, int]]] = [[] for _ in range(n)]
+    loads = [0] * n
+    for f in sorted(files, key=lambda f: -f[1]):
+        i = loads.index(min(loads))
+        buckets[i].append(f)
+        loads[i] += f[1] + 4096  # per-file overhead, so many tiny files still spread out
+    return [b for b in buckets if b]
+
+
+def in_scope(index: FileIndex, patterns: Iterable[ScanPattern]) -> List[str]:
+    """Indexed paths that at least one of `patterns` applies to (by its globs)."""
+    pats = tuple(dict.fromkeys(patterns))
+    if not pats:
+        return []
+    c = _compiled(pats)
+    return [p for p in index.files.paths() if c.applicable(p)]
+
+
+def scan_contents(
+    index: FileIndex,
+    patterns: Iterable[ScanPattern],
+    workers: Optional[int] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Dict[str, List[ScanHit]]:
+    """
+    Reads each indexed file at most once and runs every pattern over it in a
+    single combined-regex pass. Returns pattern id -> hits ordered by (path, line).
+
+    Overlapping matches of different patterns are all reported, including
+    hits on the later lines of another pattern's multi-line match; a pattern
+    is reported at most once per starting line.
+
+    `stats`, if given, gets the `files` and `bytes` the scan reads.
+    """
+    pats = tuple(dict.fromkeys(patterns))  # de-dup, keep order
+    out: Dict[str, List[ScanHit]] = {p.id: [] for p in pats}
+    c = _compiled(pats) if pats else None
+    files = [(p, s) for p, s in zip(index.files.paths(), index.files.sizes) if s and c.applicable(p)] if c else []
+    if stats is not None:
+        stats["files"] = len(files)
+        stats["bytes"] = sum(s for _, s in files)
+    if not files:
+        return out
+
+    n = min(workers or 1, max(1, len(files) // MIN_FILES_PER_WORKER))
+    if n <= 1:
+        hits = _scan_chunk(pats, index.reader, files)
+    else:
+        hits = []
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            for part in pool.map(_scan_chunk, [pats] * n, [index.reader] * n, _chunks(files, n)):
+                hits.extend(part)
+
+    for h in sorted(hits, key=lambda h: (h.path, h.start_line, h.pattern_id)):
+        out[h.pattern_id].append(h)
+    return out
@@ -3,32 +3,33 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
+from dda.evidence.store import EvidenceStore
 from dda.ingest.index import FileIndex
-from dda.extractors._common import write_evidence_jsonl, make_file_lines_ref
+from dda.extractors.registry import register
+from dda.extractors._common import make_file_lines_ref
 
 
-def extract_docs(repo_dir: Path, index: FileIndex, evidence_dir: Path, snippets_dir: Path) -> dict[str, Any]:
+@register("docs", version="2", inputs=["/README.md", "/SECURITY.md"])
+def extract_docs(repo_dir: Path, index: FileIndex, evidence: EvidenceStore, snippets_dir: Path) -> dict[str, Any]:
     """
     Minimal doc extraction:
     - Find README + SECURITY + CONTRIBUTING
     - Emit a couple of placeholder findings/quick wins/roadmap entries
     """
-    evidence_path = evidence_dir / "evidence.jsonl"
-    files = {e.path for e in index.files}
+    files = index.paths
 
     findings_top = []
     quick_wins = []
     roadmap = []
 
     def add_doc_evidence(eid: str, rel: str, summary: str):
-        write_evidence_jsonl(
-            evidence_path,
+        evidence.add(
             {
                 "id": eid,
                 "kind": "doc",
                 "summary": summary,
-                "refs": [{"type": "file_lines", "ref": make_file_lines_ref(rel, 1, 120)}],
-            },
+                "refs": [{"type": "file_lines", "ref": make_file_lines_ref(rel, 1, 120, index)}],
+            }
         )
 
     if "README.md" in files:
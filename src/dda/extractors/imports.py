@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import bisect
+import multiprocessing
+import os
+import posixpath
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dda.ingest.diff import git_blob_shas
+from dda.ingest.reader import FsReader, RepoReader
+from dda.ingest.index import FileIndex
+from dda.utils.cache import ShardedJsonCache
+from dda.utils.hashing import blob_sha
+
+# Bump whenever extraction changes so cached import lists from older rules are ignored.
+RULES_VERSION = "1"
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+MIN_FILES_PER_WORKER = 64
+
+PY_EXTS = ("py",)
+GO_EXTS = ("go",)
+JS_EXTS = ("js", "jsx", "mjs", "cjs", "ts", "tsx")
+_JS_RESOLVE = ("", ".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs", "/index.ts", "/index.tsx", "/index.js", "/index.jsx")
+
+_PY_IMPORT = re.compile(r"^[ \t]*import[ \t]+([\w.]+(?:[ \t]+as[ \t]+\w+)?(?:[ \t]*,[ \t]*[\w.]+(?:[ \t]+as[ \t]+\w+)?)*)", re.M)
+_PY_FROM = re.compile(r"^[ \t]*from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+(\([^)]*\)|[^\n#;]+)", re.M)
+_GO_SINGLE = re.compile(r'^import[ \t]+(?:[\w.]+[ \t]+)?"([^"]+)"', re.M)
+_GO_BLOCK = re.compile(r"^import[ \t]*\(([^)]*)\)", re.M)
+_GO_SPEC = re.compile(r'"([^"]+)"')
+_JS = re.compile(
+    r"""(?:\bimport|\bexport)[^'";]*?\bfrom[ \t]*['"]([^'"\n]+)['"]"""
+    r"""|\bimport[ \t]*['"]([^'"\n]+)['"]"""
+    r"""|\b(?:require|import)[ \t]*\([ \t]*['"]([^'"\n]+)['"][ \t]*\)"""
+)
+
+# (specifier, line). Python from-imports are encoded as "<module>:<name>,<name>".
+RawImport = Tuple[str, int]
+
+
+def _line_of(text: str):
+    starts = [0] + [m.end() for m in re.finditer("\n", text)]
+    return lambda pos: bisect.bisect_right(starts, pos)
+
+
+def _lang(path: str) -> str:
+    """Which rules parse_imports applies to `path`: "py", "go", "js" or "" (none)."""
+    ext = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    return "py" if ext in PY_EXTS else "go" if ext in GO_EXTS else "js" if ext in JS_EXTS else ""
+
+
+def _cache_key(path: str, sha: str) -> str:
+    # the same bytes parse differently per language; the sha stays first so entries shard by it
+    return f"{sha}:{_lang(path)}"
+
+
+def parse_imports(path: str, data: bytes) -> List[RawImport]:
+    """Raw import specifiers of one source file, in source order; unresolved."""
+    text = data.decode("utf-8", "replace")
+    lang = _lang(path)
+    out: List[Tuple[int, str]] = []
+    if lang == "py":
+        for m in _PY_IMPORT.finditer(text):
+            for part in m.group(1).split(","):
+                out.append((m.start(), part.split()[0]))
+        for m in _PY_FROM.finditer(text):
+            names = [n.split()[0] for n in m.group(2).strip("()").replace("\n", " ").split(",") if n.strip()]
+            out.append((m.start(), f"{m.group(1)}:{','.join(n for n in names if n != '*')}"))
+    elif lang == "go":
+        for m in _GO_SINGLE.finditer(text):
+            out.append((m.start(), m.group(1)))
+        for m in _GO_BLOCK.finditer(text):
+            for s in _GO_SPEC.finditer(m.group(1)):
+                out.append((m.start(1) + s.start(), s.group(1)))
+    elif lang == "js":
+        for m in _JS.finditer(text):
+            out.append((m.start(), m.group(1) or m.group(2) or m.group(3)))
+    if not out:
+        return []
+    line_of = _line_of(text)
+    return [(spec, line_of(pos)) for pos, spec in sorted(out)]
+
+
+class ImportCache(ShardedJsonCache):
+    """Raw import lists keyed by blob sha and language under `<root>/imports/v<RULES_VERSION>/`."""
+
+    def __init__(self, root: Path, max_bytes: int = CACHE_MAX_BYTES):
+        super().__init__(root / "imports" / f"v{RULES_VERSION}", max_bytes, evict_root=root / "imports")
+
+
+def _parse_files(reader: RepoReader, paths: Sequence[str]) -> List[Tuple[str, str, List[RawImport]]]:
+    out = []
+    for path in paths:
+        try:
+            data = reader.read_bytes(path)
+        except OSError:
+            continue
+        out.append((path, blob_sha(data), parse_imports(path, data)))
+    return out
+
+
+class _Resolver:
+    """Maps raw specifiers to repo-local module nodes (Python/JS files, Go package dirs)."""
+
+    def __init__(self, reader: RepoReader, index: FileIndex):
+        self.paths = index.paths
+        packages = {posixpath.dirname(p) for p in index.by_basename("__init__.py")}
+        self.py: Dict[str, str] = {}
+        for p in index.by_ext(*PY_EXTS):
+            parts = p[:-3].split("/")
+            if parts[-1] == "__init__":
+                parts.pop()
+            # module name starts at the topmost directory of the enclosing package chain
+            start = len(parts) - 1
+            while start > 0 and "/".join(parts[:start]) in packages:
+                start -= 1
+            for name in (".".join(parts[start:]), ".".join(parts)):
+                if name:
+                    self.py.setdefault(name, p)
+        self.gomods: List[Tuple[str, str]] = []  # (module path, dir), longest module path first
+        for gm in index.by_basename("go.mod"):
+            try:
+                head = reader.read_text(gm)
+            except OSError:
+                continue
+            m = re.search(r"^module[ \t]+(\S+)", head, re.M)
+            if m:
+                self.gomods.append((m.group(1).strip('"'), posixpath.dirname(gm)))
+        self.gomods.sort(key=lambda x: -len(x[0]))
+        self.go_dirs = {posixpath.dirname(p) for p in index.by_ext(*GO_EXTS)}
+
+    def node_of(self, path: str) -> str:
+        if path.endswith(".go"):
+            return posixpath.dirname(path) + "/"
+        return path
+
+    def _py_module(self, name: str) -> Optional[str]:
+        while name:
+            hit = self.py.get(name)
+            if hit:
+                return hit
+            name = name.rpartition(".")[0]
+        return None
+
+    def resolve(self, path: str, spec: str) -> List[str]:
+        if path.endswith(".py"):
+            if ":" not in spec:
+                hit = self._py_module(spec)
+                return [hit] if hit else []
+            mod, _, names = spec.partition(":")
+            if mod.startswith("."):
+                level = len(mod) - len(mod.lstrip("."))
+                pkg = path.split("/")[:-1]
+                pkg = pkg[: max(0, len(pkg) - (level - 1))]
+                here = "/".join(pkg + [p for p in mod[level:].split(".") if p])
+                found = [h for h in (self._py_path(posixpath.join(here, n)) for n in names.split(",") if n) if h]
+                if not found:
+                    hit = self._py_path(here)
+                    found = [hit] if hit else []
+                return found
+            found = [h for h in (self.py.get(f"{mod}.{n}") for n in names.split(",") if n) if h]
+            if not found:
+                hit = self._py_module(mod)
+                found = [hit] if hit else []
+            return found
+        if path.endswith(".go"):
+            for mod, d in self.gomods:
+                if spec == mod or spec.startswith(mod + "/"):
+                    target = posixpath.join(d, spec[len(mod) + 1:]) if spec != mod else d
+                    return [target + "/"] if target in self.go_dirs else []
+            return []
+        if spec.startswith("."):
+            base = posixpath.normpath(posixpath.join(posixpath.dirname(path), spec))
+            for suffix in _JS_RESOLVE:
+                if base + suffix in self.paths:
+                    return [base + suffix]
+        return []
+
+    def _py_path(self, rel: str) -> Optional[str]:
+        for cand in (f"{rel}.py", f"{rel}/__init__.py"):
+            if cand in self.paths:
+                return cand
+        return None
+
+
+@dataclass
+class ImportGraph:
+    """
+    Module-level import graph with interned node ids. Edges are one entry per
+    resolved import reference, kept as two parallel `array('I')` columns, and
+    each edge's source location as `array('I')` (path id, line).
+    """
+
+    nodes: List[str] = field(default_factory=list)
+    node_ids: Dict[str, int] = field(default_factory=dict)
+    src: array = field(default_factory=lambda: array("I"))
+    dst: array = field(default_factory=lambda: array("I"))
+    files: List[str] = field(default_factory=list)
+    file_ids: Dict[str, int] = field(default_factory=dict)
+    loc_file: array = field(default_factory=lambda: array("I"))
+    loc_line: array = field(default_factory=lambda: array("I"))
+
+    def intern(self, node: str) -> int:
+        i = self.node_ids.get(node)
+        if i is None:
+            i = self.node_ids[node] = len(self.nodes)
+            self.nodes.append(node)
+        return i
+
+    def _file_id(self, path: str) -> int:
+        i = self.file_ids.get(path)
+        if i is None:
+            i = self.file_ids[path] = len(self.files)
+            self.files.append(path)
+        return i
+
+    def add(self, src: str, dst: str, path: str, line: int) -> None:
+        self.src.append(self.intern(src))
+        self.dst.append(self.intern(dst))
+        self.loc_file.append(self._file_id(path))
+        self.loc_line.append(line)
+
+    def __len__(self) -> int:
+        return len(self.src)
+
+    def rollup(self, component_of) -> Dict[Tuple[str, str], Tuple[int, str, int]]:
+        """
+        (from component, to component) -> (reference count, example path, line),
+        for edges whose endpoints map to different non-None components. The
+        example is the smallest (path, line), so it doesn't depend on edge order.
+        """
+        comp = [component_of(n) for n in self.nodes]
+        out: Dict[Tuple[str, str], Tuple[int, str, int]] = {}
+        for k in range(len(self.src)):
+            a, b = comp[self.src[k]], comp[self.dst[k]]
+            if a is None or b is None or a == b:
+                continue
+            where = (self.files[self.loc_file[k]], self.loc_line[k])
+            prev = out.get((a, b))
+            if prev is None:
+                out[(a, b)] = (1, *where)
+            else:
+                out[(a, b)] = (prev[0] + 1, *min(where, prev[1:]))
+        return out
+
+
+def build_import_graph(
+    repo_dir: Path,
+    index: FileIndex,
+    cache: Optional[ImportCache] = None,
+    workers: Optional[int] = None,
+    reader: Optional[RepoReader] = None,
+) -> ImportGraph:
+    """
+    Parses imports of every indexed Python, Go and JS/TS file (process pool;
+    cached by blob sha) and resolves them to repo-local modules. External
+    imports are dropped. Files are folded into the graph one at a time, so
+    memory is the compact graph plus one file's raw imports per worker batch.
+    Contents come from `reader`, by default the checkout at `repo_dir`.
+    """
+    paths = index.by_ext(*PY_EXTS, *GO_EXTS, *JS_EXTS)
+    if reader is None:
+        reader = FsReader(repo_dir)
+        shas = git_blob_shas(repo_dir) if cache is not None else {}
+    else:
+        shas = reader.blob_shas() if cache is not None else {}
+    resolver = _Resolver(reader, index)
+    graph = ImportGraph()
+
+    def _fold(path: str, raw: Sequence[RawImport]) -> None:
+        src = resolver.node_of(path)
+        for spec, line in raw:
+            for target in resolver.resolve(path, spec):
+                dst = resolver.node_of(target)
+                if dst != src:
+                    graph.add(src, dst, path, line)
+
+    todo: List[str] = []
+    for p in paths:
+        cached = cache.get(_cache_key(p, shas[p])) if cache is not None and p in shas else None
+        if cached is None:
+            todo.append(p)
+        else:
+            _fold(p, cached)
+
+    n = min(workers or os.cpu_count() or 1, len(todo) // MIN_FILES_PER_WORKER)
+    if n > 1 and not multiprocessing.current_process().daemon:
+        size = -(-len(todo) // (n * 4))
+        batches = [todo[i:i + size] for i in range(0, len(todo), size)]
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            parsed = (r for batch in pool.map(_parse_files, [reader] * len(batches), batches) for r in batch)
+            for path, sha, raw in parsed:
+                _fold(path, raw)
+                if cache is not None:
+                    cache.put(_cache_key(path, sha), raw)
+    else:
+        for path, sha, raw in _parse_files(reader, todo):
+            _fold(path, raw)
+            if cache is not None:
+                cache.put(_cache_key(path, sha), raw)
+    if cache is not None:
+        cache.flush()
+    return graph
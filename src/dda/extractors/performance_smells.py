@@ -1,17 +1,143 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 
+from dda.evidence.store import EvidenceStore
 from dda.ingest.index import FileIndex
+from dda.extractors.content_scan import ScanHit, ScanPattern, in_scope
+from dda.extractors.pyast import PyAstCache, scan_python
+from dda.extractors.registry import register
 
+# Refs kept per evidence record; the count in the risk detail covers the rest.
+MAX_REFS_PER_RISK = 10
 
-def extract_performance_smells(repo_dir: Path, index: FileIndex, evidence_dir: Path, snippets_dir: Path) -> dict[str, Any]:
+# (pattern, title, severity, confidence, detail)
+_DETECTORS = [
+    (
+        ScanPattern(
+            "go-default-http-client",
+            r"\bhttp\.(?:Get|Head|Post|PostForm)\(",
+            literals=("http.",),
+            globs=("*.go",),
+        ),
+        "Outbound HTTP via Go's default client",
+        "medium",
+        0.6,
+        "http.Get/Post use http.DefaultClient, which has no timeout; a slow upstream holds the goroutine and connection indefinitely",
+    ),
+    (
+        ScanPattern(
+            "go-http-client-no-timeout",
+            r"\bhttp\.Client\{\s*\}",
+            literals=("http.Client{",),
+            globs=("*.go",),
+        ),
+        "http.Client constructed without a timeout",
+        "medium",
+        0.6,
+        "an empty http.Client{} literal leaves Timeout at zero (no limit)",
+    ),
+    (
+        ScanPattern(
+            "go-unbounded-readall",
+            r"\b(?:ioutil|io)\.ReadAll\(",
+            literals=("ReadAll(",),
+            globs=("*.go",),
+        ),
+        "Unbounded reads into memory",
+        "low",
+        0.4,
+        "io.ReadAll buffers the whole stream; without an io.LimitReader a large or hostile body can exhaust memory",
+    ),
+    (
+        ScanPattern(
+            "curl-no-timeout",
+            r"^[^#\n]*\bcurl\b(?![^\n]*(?:--max-time|--connect-timeout|\s-m\s?\d))[^\n]*$",
+            literals=("curl",),
+            globs=("*.sh", "*.bash", "Dockerfile", "*.Dockerfile", "Makefile"),
+        ),
+        "curl without a timeout in scripts",
+        "low",
+        0.4,
+        "curl waits indefinitely by default; a hung endpoint stalls builds and deploy scripts",
+    ),
+]
+
+PATTERNS = [d[0] for d in _DETECTORS]
+
+# rule id (see dda.extractors.pyast) -> (title, severity, confidence, detail)
+_PY_RULES = {
+    "requests-no-timeout": (
+        "HTTP calls via requests without a timeout",
+        "medium",
+        0.8,
+        "requests never times out by default; a stalled server blocks the calling thread indefinitely",
+    ),
+    "unbounded-queue": (
+        "Unbounded in-memory queues",
+        "medium",
+        0.6,
+        "Queue() without maxsize gives producers no backpressure, so a slow consumer turns into unbounded memory growth",
+    ),
+    "sleep-in-async": (
+        "Blocking time.sleep inside async code",
+        "high",
+        0.8,
+        "time.sleep in an async def blocks the whole event loop; use await asyncio.sleep",
+    ),
+    "str-concat-in-loop": (
+        "String concatenation in loops",
+        "low",
+        0.6,
+        "repeated += on str copies the accumulated string each iteration (quadratic); collect parts and ''.join them",
+    ),
+}
+
+
+@register("performance_smells", version="5", inputs=["*.py"], patterns=PATTERNS, cached=True)
+def extract_performance_smells(
+    repo_dir: Path,
+    index: FileIndex,
+    evidence: EvidenceStore,
+    snippets_dir: Path,
+    scan: Optional[Dict[str, List[ScanHit]]] = None,
+    cache_dir: Optional[Path] = None,
+) -> dict[str, Any]:
     """
-    Placeholder: real version will scan for obvious perf risks
-    (unbounded buffers, missing timeouts, goroutine leaks, etc.).
-    Keep minimal now to ship.
+    Flags obvious perf risks (missing timeouts, unbounded buffers, blocking
+    calls in async code) from the shared content scan plus AST rules over
+    indexed Python files. One risk per detector, citing up to
+    MAX_REFS_PER_RISK hit locations. `files_scanned` counts the indexed files
+    any detector applies to, so no risks can be told apart from no coverage.
     """
+    scan = scan or {}
+    py_files = index.by_ext("py")
+    py_hits = scan_python(
+        repo_dir, py_files, cache=PyAstCache(cache_dir) if cache_dir else None, reader=index.reader
+    )
+
+    detectors = [(p.id, title, sev, conf, detail, scan.get(p.id, [])) for p, title, sev, conf, detail in _DETECTORS]
+    detectors += [(f"py-{rule}", *meta, py_hits.get(rule, [])) for rule, meta in _PY_RULES.items()]
+
     risks: List[dict[str, Any]] = []
-    # Minimal output; your week-2 upgrade can add real detectors.
-    return {"risks": risks}
+    for rid, title, severity, confidence, detail, hits in detectors:
+        if not hits:
+            continue
+        evid_id = f"EVID-PERF-{rid.upper()}"
+        evidence.add({
+            "id": evid_id,
+            "kind": "performance",
+            "summary": f"{title}: {len(hits)} occurrence(s)",
+            "refs": [{"type": "file_lines", "ref": h.ref} for h in hits[:MAX_REFS_PER_RISK]],
+        })
+        files = len({h.path for h in hits})
+        risks.append({
+            "id": rid,
+            "title": title,
+            "severity": severity,
+            "confidence": confidence,
+            "detail": f"{detail} ({len(hits)} occurrence(s) in {files} file(s), e.g. {hits[0].ref})",
+            "evidence_list": [evid_id],
+        })
+    return {"risks": risks, "files_scanned": len(set(in_scope(index, PATTERNS)).union(py_files))}
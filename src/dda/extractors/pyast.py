@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import ast
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from dda.extractors.content_scan import ScanHit
+from dda.ingest.diff import git_blob_shas
+from dda.ingest.reader import FsReader, RepoReader
+from dda.utils.cache import ShardedJsonCache
+from dda.utils.hashing import blob_sha
+
+# Bump whenever a rule changes so cached findings from older rules are ignored.
+RULES_VERSION = "1"
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Below this many uncached files a process pool costs more than it saves.
+MIN_FILES_PER_WORKER = 32
+
+_REQUESTS_METHODS = {"get", "post", "put", "patch", "delete", "head", "options", "request"}
+_QUEUE_MODULES = {"queue", "asyncio", "multiprocessing"}
+_QUEUE_CLASSES = {"Queue", "LifoQueue", "PriorityQueue"}
+# Every rule needs one of these in the source to fire; files without any skip parsing.
+_TRIGGERS = (b"requests", b"Queue", b"sleep", b"+=")
+
+# (rule, start_line, end_line)
+Finding = Tuple[str, int, int]
+
+
+class _Detector(ast.NodeVisitor):
+    """
+    Rules:
+      requests-no-timeout  requests.get/post/... (or a from-import of them) without timeout=
+      unbounded-queue      queue/asyncio/multiprocessing Queue() without a positive maxsize
+      sleep-in-async       time.sleep() directly inside an `async def`
+      str-concat-in-loop   `s += <str>` inside a for/while loop
+    """
+
+    def __init__(self) -> None:
+        self.findings: List[Finding] = []
+        self.aliases: Dict[str, str] = {}  # local name -> dotted origin ("requests", "time.sleep", ...)
+        self.in_async = False
+        self.loop_depth = 0
+        self.str_names: Set[str] = set()
+
+    def _add(self, rule: str, node: ast.AST) -> None:
+        start = getattr(node, "lineno", 1)
+        self.findings.append((rule, start, getattr(node, "end_lineno", None) or start))
+
+    def _origin(self, func: ast.expr) -> Optional[str]:
+        if isinstance(func, ast.Name):
+            return self.aliases.get(func.id)
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            base = self.aliases.get(func.value.id)
+            return f"{base}.{func.attr}" if base else None
+        return None
+
+    # imports
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for a in node.names:
+            if a.asname:
+                self.aliases[a.asname] = a.name
+            else:
+                top = a.name.split(".")[0]
+                self.aliases[top] = top
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module and not node.level:
+            for a in node.names:
+                self.aliases[a.asname or a.name] = f"{node.module}.{a.name}"
+
+    # scopes: loop/async/str state belongs to the innermost function
+
+    def _scope(self, node: ast.AST, is_async: bool) -> None:
+        saved = (self.in_async, self.loop_depth, self.str_names)
+        self.in_async, self.loop_depth, self.str_names = is_async, 0, set()
+        self.generic_visit(node)
+        self.in_async, self.loop_depth, self.str_names = saved
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._scope(node, False)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._scope(node, True)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self._scope(node, False)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._scope(node, False)
+
+    def _loop(self, node: ast.AST) -> None:
+        self.loop_depth += 1
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    visit_For = visit_AsyncFor = visit_While = _loop
+
+    # rules
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        if _is_str(node.value):
+            self.str_names.update(t.id for t in node.targets if isinstance(t, ast.Name))
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        if (
+            self.loop_depth
+            and isinstance(node.op, ast.Add)
+            and isinstance(node.target, ast.Name)
+            and (_is_str(node.value) or node.target.id in self.str_names)
+        ):
+            self._add("str-concat-in-loop", node)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        origin = self._origin(node.func)
+        if origin:
+            kw = {k.arg for k in node.keywords}
+            mod, _, name = origin.rpartition(".")
+            if mod == "requests" and name in _REQUESTS_METHODS and "timeout" not in kw and None not in kw:
+                self._add("requests-no-timeout", node)
+            elif mod in _QUEUE_MODULES and name in _QUEUE_CLASSES and _unbounded_queue(node):
+                self._add("unbounded-queue", node)
+            elif origin == "time.sleep" and self.in_async:
+                self._add("sleep-in-async", node)
+        self.generic_visit(node)
+
+
+def _is_str(node: ast.expr) -> bool:
+    return isinstance(node, ast.JoinedStr) or (isinstance(node, ast.Constant) and isinstance(node.value, str))
+
+
+def _unbounded_queue(node: ast.Call) -> bool:
+    if any(k.arg is None for k in node.keywords) or any(isinstance(a, ast.Starred) for a in node.args):
+        return False
+    size = node.args[0] if node.args else next((k.value for k in node.keywords if k.arg == "maxsize"), None)
+    if size is None:
+        return True
+    return isinstance(size, ast.Constant) and isinstance(size.value, int) and size.value <= 0
+
+
+def analyze_source(data: bytes) -> List[Finding]:
+    """Findings for one file, sorted by line; unparsable sources yield none."""
+    if not any(t in data for t in _TRIGGERS):
+        return []
+    try:
+        tree = ast.parse(data)
+    except (SyntaxError, ValueError):
+        return []
+    d = _Detector()
+    d.visit(tree)
+    return sorted(d.findings, key=lambda f: (f[1], f[0]))
+
+
+class PyAstCache(ShardedJsonCache):
+    """Findings keyed by blob sha under `<root>/pyast/v<RULES_VERSION>/`."""
+
+    def __init__(self, root: Path, max_bytes: int = CACHE_MAX_BYTES):
+        super().__init__(root / "pyast" / f"v{RULES_VERSION}", max_bytes, evict_root=root / "pyast")
+
+    def get(self, sha: str) -> Optional[List[Finding]]:
+        found = super().get(sha)
+        return None if found is None else [tuple(f) for f in found]
+
+
+def _analyze_files(reader: RepoReader, paths: Sequence[str]) -> List[Tuple[str, str, List[Finding]]]:
+    out = []
+    for path in paths:
+        try:
+            data = reader.read_bytes(path)
+        except OSError:
+            continue
+        out.append((path, blob_sha(data), analyze_source(data)))
+    return out
+
+
+def scan_python(
+    repo_dir: Path,
+    paths: Sequence[str],
+    cache: Optional[PyAstCache] = None,
+    workers: Optional[int] = None,
+    reader: Optional[RepoReader] = None,
+) -> Dict[str, List[ScanHit]]:
+    """
+    Runs the AST rules over `paths` and returns rule -> hits ordered by (path, line).
+    Files whose blob sha is cached are not read at all; the rest are parsed
+    across a process pool (serially when already inside a daemon worker).
+    Contents come from `reader`, by default the checkout at `repo_dir`.
+    """
+    if reader is None:
+        reader = FsReader(repo_dir)
+        shas = git_blob_shas(repo_dir) if cache is not None else {}
+    else:
+        shas = reader.blob_shas() if cache is not None else {}
+    results: Dict[str, List[Finding]] = {}
+    todo: List[str] = []
+    for p in paths:
+        cached = cache.get(shas[p]) if cache is not None and p in shas else None
+        if cached is None:
+            todo.append(p)
+        else:
+            results[p] = cached
+
+    n = min(workers or os.cpu_count() or 1, len(todo) // MIN_FILES_PER_WORKER)
+    if n > 1 and not multiprocessing.current_process().daemon:
+        parts = [todo[i::n] for i in range(n)]
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            analyzed = [r for part in pool.map(_analyze_files, [reader] * n, parts) for r in part]
+    else:
+        analyzed = _analyze_files(reader, todo)
+
+    for path, sha, findings in analyzed:
+        results[path] = findings
+        if cache is not None:
+            cache.put(sha, findings)
+    if cache is not None:
+        cache.flush()
+
+    hits: Dict[str, List[ScanHit]] = {}
+    for path in sorted(results):
+        for rule, start, end in results[path]:
+            hits.setdefault(rule, []).append(ScanHit(rule, path, start, end))
+    return hits
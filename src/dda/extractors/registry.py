@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from typing import Any, Callable, List, Sequence
+
+from dda.extractors.content_scan import ScanPattern
+
+# Imported (in this order) by default_extractors(); the order is also the
+# order signals and evidence are merged in, whatever order extractors finish.
+BUILTIN_MODULES = (
+    "dda.extractors.docs",
+    "dda.extractors.structure",
+    "dda.extractors.ci",
+    "dda.extractors.infra",
+    "dda.extractors.observability",
+    "dda.extractors.security_deps",
+    "dda.extractors.performance_smells",
+)
+
+ExtractFn = Callable[..., dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class ExtractorSpec:
+    """
+    name:       key under which the extractor's signals are stored
+    func:       extract_*(repo_dir, index, evidence, snippets_dir[, deps=...][, scan=...][, cache_dir=...])
+    version:    bump when output changes, so incremental runs don't carry stale results
+    inputs:     gitwildmatch globs of the paths the extractor looks at
+    depends_on: extractors whose signals are passed in as `deps={name: signals}`
+    patterns:   content patterns for the shared scan; hits are passed in as
+                `scan={pattern_id: [ScanHit]}` and their globs count as inputs
+    cached:     passed `cache_dir=` (the shared cache root, or None when caching is off)
+    """
+
+    name: str
+    func: ExtractFn
+    version: str = "1"
+    inputs: tuple[str, ...] = ()
+    depends_on: tuple[str, ...] = ()
+    patterns: tuple[ScanPattern, ...] = ()
+    cached: bool = False
+
+
+_REGISTRY: dict[str, ExtractorSpec] = {}
+
+
+def register(
+    name: str,
+    version: str = "1",
+    inputs: Sequence[str] = (),
+    depends_on: Sequence[str] = (),
+    patterns: Sequence[ScanPattern] = (),
+    cached: bool = False,
+) -> Callable[[ExtractFn], ExtractFn]:
+    def deco(func: ExtractFn) -> ExtractFn:
+        _REGISTRY[name] = ExtractorSpec(
+            name=name,
+            func=func,
+            version=version,
+            inputs=tuple(dict.fromkeys([*inputs, *(g for p in patterns for g in (p.globs or ("*",)))])),
+            depends_on=tuple(depends_on),
+            patterns=tuple(patterns),
+            cached=cached,
+        )
+        return func
+
+    return deco
+
+
+def default_extractors() -> List[ExtractorSpec]:
+    """
+    Built-in extractors in BUILTIN_MODULES order, then any others in
+    registration order (independent of which modules were imported first).
+    """
+    for mod in BUILTIN_MODULES:
+        importlib.import_module(mod)
+    rank = {mod: i for i, mod in enumerate(BUILTIN_MODULES)}
+    return sorted(_REGISTRY.values(), key=lambda s: rank.get(s.func.__module__, len(rank)))
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import cProfile
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait as mp_wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from dda.evidence.store import EvidenceStore
+from dda.extractors.content_scan import ScanHit, scan_contents
+from dda.extractors.registry import ExtractorSpec
+from dda.ingest.index import FileIndex
+
+
+@dataclass
+class ExtractorResult:
+    name: str
+    version: str
+    status: str  # ok | error | timeout | carried
+    signals: dict[str, Any] = field(default_factory=dict)
+    evidence: List[dict[str, Any]] = field(default_factory=list)
+    elapsed_s: float = 0.0
+    cpu_s: float = 0.0
+    error: Optional[str] = None
+
+
+def _invoke(
+    spec: ExtractorSpec,
+    repo_dir: Path,
+    index: FileIndex,
+    snippets_dir: Path,
+    deps: dict[str, Any],
+    scan: Optional[dict[str, List[ScanHit]]] = None,
+    cache_dir: Optional[Path] = None,
+    profile_dir: Optional[Path] = None,
+) -> tuple[dict[str, Any], List[dict[str, Any]], float, float]:
+    """
+    Runs one extractor against a private EvidenceStore and returns its signals,
+    the records it added, and its wall and CPU seconds (CPU of the calling
+    thread only, so concurrent extractors don't count each other).
+    Module-level so it pickles for the process pool.
+
+    With `profile_dir`, the call is also cProfiled to `extract.<name>.prof`.
+    """
+    t0 = time.perf_counter()
+    cpu0 = time.thread_time()
+    evidence = EvidenceStore()
+    kwargs: dict[str, Any] = {"deps": deps} if spec.depends_on else {}
+    if spec.patterns:
+        kwargs["scan"] = scan or {}
+    if spec.cached:
+        kwargs["cache_dir"] = cache_dir
+    if profile_dir is None:
+        signals = spec.func(repo_dir, index, evidence, snippets_dir, **kwargs)
+    else:
+        prof = cProfile.Profile()
+        signals = prof.runcall(spec.func, repo_dir, index, evidence, snippets_dir, **kwargs)
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        prof.dump_stats(str(profile_dir / f"extract.{spec.name}.prof"))
+    return signals, evidence.records(), time.perf_counter() - t0, time.thread_time() - cpu0
+
+
+def _child(conn: Any, args: tuple) -> None:
+    """Process-mode entry point: runs one extractor and sends (out, err) back over `conn`."""
+    try:
+        msg = (_invoke(*args), None)
+    except Exception as exc:
+        msg = (None, f"{type(exc).__name__}: {exc}\n{traceback.format_exc(limit=3)}")
+    conn.send(msg)
+    conn.close()
+
+
+# Threads of timed-out extractors, across all runs in this process. A thread
+# can't be killed, so each keeps its worker slot until it really exits; in a
+# long-lived worker (dda serve, batch) they would otherwise pile up.
+_abandoned: Set[threading.Thread] = set()
+_abandoned_lock = threading.Lock()
+_ABANDONED_POLL_S = 0.1
+
+
+def _abandoned_alive() -> int:
+    with _abandoned_lock:
+        _abandoned.difference_update([t for t in _abandoned if not t.is_alive()])
+        return len(_abandoned)
+
+
+def run_extractors(
+    specs: Sequence[ExtractorSpec],
+    repo_dir: Path,
+    index: FileIndex,
+    snippets_dir: Path,
+    workers: int = 4,
+    timeout_s: Optional[float] = None,
+    mode: str = "thread",
+    carried: Optional[Dict[str, ExtractorResult]] = None,
+    cache_dir: Optional[Path] = None,
+    profile_dir: Optional[Path] = None,
+    scan_stats: Optional[Dict[str, Any]] = None,
+) -> Dict[str, ExtractorResult]:
+    """
+    Runs `specs` concurrently, starting each one once its dependencies have
+    finished. Results come back keyed by name in `specs` order, regardless of
+    completion order, so merged signals and evidence are deterministic.
+
+    - mode "thread" runs on daemon threads; "process" starts one process per
+      extractor. Either way at most `workers` run at once, and an extractor's
+      `timeout_s` clock starts when it actually starts.
+    - An extractor that raises, or runs past `timeout_s`, yields empty signals
+      and no evidence instead of failing the run. Timed-out processes are
+      terminated. Timed-out threads can't be stopped: they hold their worker
+      slot (in this and later runs) until they exit, and extractors that wait
+      `timeout_s` without getting a slot time out too.
+    - `carried` results (e.g. from an incremental run) are used as-is.
+    - Content patterns of every extractor that actually runs are scanned
+      together, once, before any extractor starts.
+    - `profile_dir` cProfiles each extractor into its own stats file.
+    - `scan_stats` receives the files and bytes that shared scan read.
+    """
+    results: Dict[str, ExtractorResult] = dict(carried or {})
+    by_name = {s.name: s for s in specs}
+    pending: List[ExtractorSpec] = [s for s in specs if s.name not in results]
+    running: Dict[str, float] = {}  # name -> start (monotonic)
+    threads: Dict[str, threading.Thread] = {}
+    procs: Dict[str, tuple[Any, Any]] = {}  # name -> (process, parent end of its pipe)
+    done_q: "queue.Queue[tuple[str, Any, Optional[str]]]" = queue.Queue()
+    hits = scan_contents(index, [p for s in pending for p in s.patterns], workers=workers, stats=scan_stats)
+    ctx = multiprocessing.get_context() if mode == "process" else None
+    starved_since: Optional[float] = None  # ready extractors waiting on slots held by abandoned threads
+
+    def _launch(spec: ExtractorSpec) -> None:
+        deps = {d: results[d].signals for d in spec.depends_on}
+        scan = {p.id: hits.get(p.id, []) for p in spec.patterns}
+        args = (spec, repo_dir, index, snippets_dir, deps, scan, cache_dir, profile_dir)
+        if ctx is not None:
+            parent, child = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_child, args=(child, args), name=f"dda-extract-{spec.name}", daemon=True)
+            proc.start()
+            child.close()  # so a worker that dies without sending reads as EOF here
+            procs[spec.name] = (proc, parent)
+            return
+
+        def _target() -> None:
+            try:
+                done_q.put((spec.name, _invoke(*args), None))
+            except Exception as exc:
+                done_q.put((spec.name, None, f"{type(exc).__name__}: {exc}\n{traceback.format_exc(limit=3)}"))
+
+        t = threading.Thread(target=_target, name=f"dda-extract-{spec.name}", daemon=True)
+        threads[spec.name] = t
+        t.start()
+
+    def _next_done(wait: Optional[float]) -> Optional[tuple[str, Any, Optional[str]]]:
+        if ctx is None:
+            try:
+                return done_q.get(timeout=wait)
+            except queue.Empty:
+                return None
+        ready = mp_wait([conn for _, conn in procs.values()], timeout=wait)
+        for name, (proc, conn) in procs.items():
+            if conn in ready:
+                del procs[name]
+                try:
+                    out, err = conn.recv()
+                except EOFError:
+                    proc.join()
+                    out, err = None, f"extractor process exited with code {proc.exitcode}"
+                conn.close()
+                proc.join()
+                return name, out, err
+        return None
+
+    def _stop(name: str) -> None:
+        if name in procs:
+            proc, conn = procs.pop(name)
+            proc.terminate()
+            proc.join()
+            conn.close()
+        elif name in threads:
+            with _abandoned_lock:
+                _abandoned.add(threads.pop(name))
+
+    try:
+        while pending or running:
+            free = max(1, workers) - len(running) - (_abandoned_alive() if ctx is None else 0)
+            ready = [s for s in pending if all(d in results for d in s.depends_on)]
+            for spec in ready[: max(0, free)]:
+                pending.remove(spec)
+                running[spec.name] = time.monotonic()
+                _launch(spec)
+            starved = len(ready) > free and not running
+            starved_since = (starved_since or time.monotonic()) if starved else None
+
+            if not running and not starved:
+                # whatever is left waits on an unknown extractor or a cycle
+                for spec in pending:
+                    missing = [d for d in spec.depends_on if d not in results]
+                    results[spec.name] = ExtractorResult(
+                        spec.name, spec.version, "error", error=f"unresolved dependencies: {missing}"
+                    )
+                break
+
+            if starved:
+                assert starved_since is not None
+                if timeout_s is not None and time.monotonic() - starved_since >= timeout_s:
+                    for spec in ready:
+                        pending.remove(spec)
+                        results[spec.name] = ExtractorResult(
+                            spec.name, spec.version, "timeout",
+                            error=f"no free worker for {timeout_s}s (timed-out extractors still running)",
+                        )
+                    starved_since = None
+                else:
+                    time.sleep(_ABANDONED_POLL_S)
+                continue
+
+            wait = None
+            if timeout_s is not None:
+                wait = max(0.0, min(running.values()) + timeout_s - time.monotonic())
+            done = _next_done(wait)
+            if done is None:
+                now = time.monotonic()
+                for name, started in list(running.items()):
+                    if timeout_s is not None and now - started >= timeout_s:
+                        del running[name]
+                        _stop(name)
+                        results[name] = ExtractorResult(
+                            name, by_name[name].version, "timeout", elapsed_s=round(now - started, 3),
+                            error=f"timed out after {timeout_s}s",
+                        )
+                continue
+
+            name, out, err = done
+            if name not in running:
+                continue  # already timed out; late result is dropped
+            started = running.pop(name)
+            threads.pop(name, None)
+            spec = by_name[name]
+            if err is not None:
+                results[name] = ExtractorResult(
+                    name, spec.version, "error", elapsed_s=round(time.monotonic() - started, 3), error=err
+                )
+            else:
+                signals, records, elapsed, cpu = out
+                results[name] = ExtractorResult(
+                    name, spec.version, "ok", signals, records, round(elapsed, 3), round(cpu, 3)
+                )
+    finally:
+        for name in list(procs):
+            _stop(name)
+
+    return {s.name: results[s.name] for s in specs if s.name in results}
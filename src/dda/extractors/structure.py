@@ -1,41 +1,77 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
+from dda.evidence.store import EvidenceStore
 from dda.ingest.index import FileIndex
-from dda.extractors._common import write_evidence_jsonl
+from dda.extractors._common import make_file_lines_ref
+from dda.extractors.imports import ImportCache, build_import_graph
+from dda.extractors.registry import register
 
+# Component-level flows listed in the report (heaviest first); graph.json keeps all edges.
+MAX_FLOWS = 12
 
-def extract_structure(repo_dir: Path, index: FileIndex, evidence_dir: Path, snippets_dir: Path) -> dict[str, Any]:
-    evidence_path = evidence_dir / "evidence.jsonl"
+
+@register("structure", version="2", inputs=["*"], cached=True)
+def extract_structure(
+    repo_dir: Path,
+    index: FileIndex,
+    evidence: EvidenceStore,
+    snippets_dir: Path,
+    cache_dir: Optional[Path] = None,
+) -> dict[str, Any]:
 
     # very lightweight: infer "components" by top-level folders
-    top = {}
-    for e in index.files:
-        parts = e.path.split("/")
-        if len(parts) > 1:
-            top[parts[0]] = top.get(parts[0], 0) + 1
+    top = index.top_level_dirs()
 
     components = []
     for name, count in sorted(top.items(), key=lambda x: -x[1])[:12]:
         eid = f"EVID-STRUCT-{name.upper()[:16]}"
-        write_evidence_jsonl(
-            evidence_path,
+        evidence.add(
             {
                 "id": "EVID-STRUCT-TOPLEVEL",
                 "kind": "code",
                 "summary": "Top-level repository structure inferred from folder distribution",
                 "refs": [{"type": "file_lines", "ref": f"{name}/:L1-L1"}],
-            },
+            }
         )
         components.append({"name": name, "purpose": f"Inferred component boundary ({count} files scanned)", "evidence_ref": eid})
 
-    # graph placeholder
-    graph = {"nodes": [{"id": c["name"]} for c in components], "edges": []}
+    # import graph (Python/Go/JS/TS) rolled up to the components above
+    names = {c["name"] for c in components}
+    imports = build_import_graph(
+        repo_dir, index, cache=ImportCache(cache_dir) if cache_dir else None, reader=index.reader
+    )
+
+    def component_of(node: str) -> Optional[str]:
+        top, sep, _ = node.partition("/")
+        return top if sep and top in names else None
+
+    rolled = imports.rollup(component_of)
+    edges = sorted(rolled.items(), key=lambda kv: (-kv[1][0], kv[0]))
+
+    flows = []
+    if edges:
+        evidence.add(
+            {
+                "id": "EVID-STRUCT-IMPORTS",
+                "kind": "code",
+                "summary": "Cross-component imports resolved from Python/Go/JS/TS sources",
+                "refs": [{"type": "file_lines", "ref": make_file_lines_ref(path, line, line)} for _, (_, path, line) in edges[:MAX_FLOWS]],
+            }
+        )
+        for (a, b), (count, _, _) in edges[:MAX_FLOWS]:
+            flows.append({"from": a, "to": b, "why": f"{count} import(s)", "evidence_ref": "EVID-STRUCT-IMPORTS"})
+
+    graph = {
+        "nodes": [{"id": c["name"]} for c in components],
+        "edges": [{"from": a, "to": b, "weight": count} for (a, b), (count, _, _) in edges],
+        "stats": {"modules": len(imports.nodes), "import_refs": len(imports)},
+    }
 
     return {
         "summary": "Repo structure indexed",
-        "architecture": {"components": components, "flows": []},
+        "architecture": {"components": components, "flows": flows},
         "graph": graph,
     }
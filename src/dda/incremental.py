@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Set
+
+from dda.extractors.registry import ExtractorSpec
+from dda.ingest.diff import PathChange
+from dda.ingest.index import FileIndex, dump_index, load_index
+from dda.ingest.walk import glob_matcher
+
+INDEX_FILE = "index.json"
+EXTRACTORS_FILE = "extractors.json"
+
+
+@dataclass
+class PreviousRun:
+    commit: str
+    index_config: str
+    index: FileIndex
+    # extractor name -> {"version": ..., "signals": ..., "evidence": [records]}
+    extractors: dict[str, Any]
+
+
+def write_run_state(
+    run_dir: Path,
+    commit: str,
+    index_config: str,
+    index: FileIndex,
+    extractors: dict[str, Any],
+) -> None:
+    """Persists what a later incremental run needs: the index and per-extractor outputs."""
+    state = {"commit": commit, "index_config": index_config, **dump_index(index)}
+    (run_dir / INDEX_FILE).write_text(json.dumps(state, separators=(",", ":")))
+    (run_dir / EXTRACTORS_FILE).write_text(json.dumps(extractors, separators=(",", ":")))
+
+
+def load_previous_run(prev_run_dir: Path, repo_dir: Path) -> Optional[PreviousRun]:
+    try:
+        state = json.loads((prev_run_dir / INDEX_FILE).read_text())
+        extractors = json.loads((prev_run_dir / EXTRACTORS_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+    return PreviousRun(
+        commit=state["commit"],
+        index_config=state["index_config"],
+        index=load_index(state, root=repo_dir),
+        extractors=extractors,
+    )
+
+
+def touches(inputs: Sequence[str], paths: Iterable[str]) -> bool:
+    """
+    True if any path matches one of an extractor's declared input globs.
+    Lower-cased paths are tried too since several detectors match case-insensitively;
+    a false positive only costs a re-run.
+    """
+    if not inputs:
+        return False
+    match = glob_matcher(tuple(inputs))
+    return any(match(p) or match(p.lower()) for p in paths)
+
+
+def extractors_to_rerun(
+    specs: Sequence[ExtractorSpec],
+    changes: List[PathChange],
+    previous: dict[str, Any],
+) -> Set[str]:
+    """
+    Extractors that must run again: new or version-bumped ones, those whose
+    inputs touch a changed path, and everything downstream of those.
+    """
+    changed = [c.path for c in changes]
+    rerun = {
+        s.name
+        for s in specs
+        if s.name not in previous
+        or previous[s.name].get("version") != s.version
+        or touches(s.inputs, changed)
+    }
+    grew = True
+    while grew:
+        grew = False
+        for s in specs:
+            if s.name not in rerun and any(d in rerun for d in s.depends_on):
+                rerun.add(s.name)
+                grew = True
+    return rerun
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Priority tiers for the budgeted scan, filled in this order.
+TIER_RANK = {"manifests": 0, "docs": 1, "config": 2, "code": 3, "tests": 4}
+SKIPPED_EXAMPLES = 20
+# Written next to index.json: the coverage report plus every skipped path, which
+# the report itself (embedded in the scorecard) only samples.
+COVERAGE_FILE = "coverage.json"
+
+_MANIFEST_NAMES = frozenset({
+    "go.mod", "go.sum", "package.json", "package-lock.json", "pnpm-lock.yaml", "poetry.lock", "pyproject.toml",
+    "cargo.toml", "pom.xml", "build.gradle", "chart.yaml", "dockerfile", "makefile", "security.md",
+})
+_TESTS_RE = re.compile(r"(^|/)(tests?|testdata|fixtures|examples?|__tests__|e2e)/|_test\.\w+$|(^|/)test_[^/]+$")
+_DOC_EXTS = (".md", ".rst", ".adoc")
+_CONFIG_EXTS = (".yaml", ".yml", ".json", ".toml", ".ini", ".cfg", ".sh", ".sql")
+
+
+def tier_of(path: str) -> str:
+    """
+    manifests: dependency/build manifests, READMEs, .github/, Terraform
+    tests:     test dirs and files, fixtures, examples (ranked last)
+    docs:      doc dirs and markup
+    config:    YAML/JSON/TOML/ini, shell, SQL
+    code:      everything else
+
+    Checked in that order, so e.g. tests/go.mod is a manifest and tests/x.md a test.
+    Plain string checks; this runs once per walked file.
+    """
+    p = path.lower()
+    base = p.rpartition("/")[2]
+    if (
+        base in _MANIFEST_NAMES
+        or base == "readme"
+        or base.startswith("readme.")
+        or (base.startswith("requirements") and base.endswith(".txt"))
+        or p.startswith(".github/")
+        or base.endswith(".tf")
+    ):
+        return "manifests"
+    if ("test" in p or "fixture" in p or "example" in p or "e2e" in p) and _TESTS_RE.search(p):
+        return "tests"
+    if base.endswith(_DOC_EXTS) or p.startswith(("doc/", "docs/")) or "/doc/" in p or "/docs/" in p:
+        return "docs"
+    if base.endswith(_CONFIG_EXTS):
+        return "config"
+    return "code"
+
+
+def component_of(path: str) -> str:
+    """Top-level directory, or "." for files at the repo root."""
+    head, sep, _ = path.partition("/")
+    return head if sep else "."
+
+
+def select_budgeted(
+    found: Sequence[Tuple[str, int]],
+    max_files: int,
+    max_bytes: Optional[int] = None,
+) -> List[Tuple[str, int]]:
+    """
+    Picks at most `max_files` files totalling at most `max_bytes` from
+    `found` (path, size), sorted by path:
+
+    - tiers are filled in priority order (manifests, docs, config, code, tests);
+    - within a tier, components take turns (round-robin, in name order), each
+      offering its next file in path order, so one huge directory cannot
+      starve the others;
+    - a file that no longer fits the byte budget is passed over and smaller
+      ones after it are still considered.
+
+    The result depends only on `found` and the budgets, never on walk order.
+    """
+    by_tier: Dict[str, Dict[str, List[Tuple[str, int]]]] = defaultdict(lambda: defaultdict(list))
+    for path, size in sorted(found):
+        by_tier[tier_of(path)][component_of(path)].append((path, size))
+
+    selected: List[Tuple[str, int]] = []
+    budget = max_bytes if max_bytes is not None else float("inf")
+    for tier in sorted(by_tier, key=TIER_RANK.__getitem__):
+        queues = [q for _, q in sorted(by_tier[tier].items())]
+        pos = [0] * len(queues)
+        live = list(range(len(queues)))
+        while live and len(selected) < max_files:
+            nxt = []
+            for i in live:
+                if len(selected) >= max_files:
+                    break
+                path, size = queues[i][pos[i]]
+                pos[i] += 1
+                if size <= budget:
+                    selected.append((path, size))
+                    budget -= size
+                if pos[i] < len(queues[i]):
+                    nxt.append(i)
+            live = nxt
+    selected.sort()
+    return selected
+
+
+def skipped_files(found: Sequence[Tuple[str, int]], selected: Sequence[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    """(path, size) of every file in `found` that didn't make `selected`, in `found` order."""
+    kept = {p for p, _ in selected}
+    return [(p, s) for p, s in found if p not in kept]
+
+
+def coverage_report(
+    mode: str,
+    found: Sequence[Tuple[str, int]],
+    selected: Sequence[Tuple[str, int]],
+    budget: Dict[str, Any],
+    deadline_hit: bool = False,
+    unscanned_dirs: Sequence[str] = (),
+    skipped: Optional[Sequence[Tuple[str, int]]] = None,
+) -> Dict[str, Any]:
+    """
+    What the index covers and what it left out, by component and tier with
+    examples; the full list goes to COVERAGE_FILE (see write_coverage).
+    """
+    if skipped is None:
+        skipped = skipped_files(found, selected)
+    by_component: Dict[str, Dict[str, int]] = {}
+    by_tier: Dict[str, Dict[str, int]] = {}
+    for p, s in skipped:
+        for table, key in ((by_component, component_of(p)), (by_tier, tier_of(p))):
+            row = table.setdefault(key, {"files": 0, "bytes": 0})
+            row["files"] += 1
+            row["bytes"] += s
+    return {
+        "mode": mode,
+        "budget": budget,
+        "considered": {"files": len(found), "bytes": sum(s for _, s in found)},
+        "selected": {"files": len(selected), "bytes": sum(s for _, s in selected)},
+        "skipped": {
+            "files": len(skipped),
+            "bytes": sum(s for _, s in skipped),
+            "by_component": dict(sorted(by_component.items())),
+            "by_tier": {t: by_tier[t] for t in sorted(by_tier, key=TIER_RANK.__getitem__)},
+            "examples": sorted(p for p, _ in skipped)[:SKIPPED_EXAMPLES],
+        },
+        "deadline_hit": deadline_hit,
+        "unscanned_dirs": sorted(unscanned_dirs),
+    }
+
+
+def write_coverage(run_dir: Path, coverage: Dict[str, Any], skipped: Sequence[Tuple[str, int]]) -> str:
+    """Writes the coverage report with every skipped path and size; returns the file name."""
+    data = {
+        **coverage,
+        "skipped_paths": [p for p, _ in skipped],
+        "skipped_sizes": [s for _, s in skipped],
+    }
+    (run_dir / COVERAGE_FILE).write_text(json.dumps(data, separators=(",", ":")))
+    return COVERAGE_FILE
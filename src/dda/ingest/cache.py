@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from dda.ingest.index import INDEX_FORMAT, FileIndex, dump_index, load_index
+from dda.ingest.reader import RepoReader
+from dda.utils.cache import atomic_write_bytes, evict_to_size, touch
+from dda.utils.config import AnalysisCfg
+from dda.utils.hashing import short_hash
+
+
+def index_config_hash(analysis: AnalysisCfg, backend: str = "checkout") -> str:
+    """
+    Hash of every knob that changes which files get indexed. The backend is
+    one of them: a checkout walk follows symlinked files, an ls-tree listing
+    skips them (mode 120000).
+    """
+    knobs = {
+        "backend": backend,
+        "include_globs": list(analysis.include_globs),
+        "exclude_globs": list(analysis.exclude_globs),
+        "max_files_scanned": analysis.max_files_scanned,
+        "max_file_bytes": analysis.max_file_bytes,
+        "scan_mode": analysis.scan_mode,
+        "scan_budget_bytes": analysis.scan_budget_bytes,
+    }
+    return short_hash(json.dumps(knobs, sort_keys=True))[:16]
+
+
+def index_cache_key(commit: str, analysis: AnalysisCfg, backend: str = "checkout") -> str:
+    return f"{commit}-{index_config_hash(analysis, backend)}"
+
+
+class IndexCache:
+    """
+    Content-addressed on-disk store of serialized FileIndex objects:
+    one JSON file per key under `<root>/index/`, evicted LRU by total size.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.dir = root / "index"
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.json"
+
+    def get(self, key: str, repo_dir: Path, reader: Optional[RepoReader] = None) -> Optional[FileIndex]:
+        p = self._path(key)
+        try:
+            data = json.loads(p.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_FORMAT:
+            return None
+        touch(p)
+        return load_index(data, root=repo_dir, reader=reader)
+
+    def put(self, key: str, index: FileIndex) -> None:
+        data = json.dumps(dump_index(index), separators=(",", ":")).encode("utf-8")
+        atomic_write_bytes(self._path(key), data)
+        evict_to_size(self.dir, self.max_bytes, "*.json")
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import fcntl
+import shutil
 import subprocess
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from dda.utils.hashing import short_hash
+from dda.utils.text import repo_slug
 
 
 @dataclass(frozen=True)
@@ -12,19 +20,176 @@ class RepoMeta:
     commit: str
 
 
-def clone_repo(repo_url: str, dest: Path) -> RepoMeta:
+def mirror_path(mirror_root: Path, repo_url: str) -> Path:
+    """One bare mirror per URL; the hash keeps same-named repos from different owners apart."""
+    return mirror_root / f"{repo_slug(repo_url)}-{short_hash(repo_url.rstrip('/'))[:12]}.git"
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Exclusive advisory lock on `<path>.lock`, shared by every process touching `path`."""
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@dataclass(frozen=True)
+class GitCmd:
+    """One `git <args>` invocation of a clone plan, with optional stdin."""
+
+    args: Tuple[str, ...]
+    stdin: Optional[str] = None
+
+
+# A clone plan is a list of steps: git commands, and plain filesystem calls
+# (temp-dir cleanup and renames). The strategy lives here once; run_steps and
+# prefetch.run_steps_async execute the same plans synchronously or on asyncio.
+Step = Union[GitCmd, Callable[[], Any]]
+
+
+def run_steps(steps: Sequence[Step]) -> str:
+    """Runs a plan in order; returns the stdout of its last git command."""
+    out = ""
+    for step in steps:
+        if isinstance(step, GitCmd):
+            out = subprocess.run(
+                ["git", *step.args], input=step.stdin, stdout=subprocess.PIPE, text=True, check=True
+            ).stdout
+        else:
+            step()
+    return out
+
+
+def update_mirror_steps(repo_url: str, mirror_root: Path) -> List[Step]:
+    """
+    Plan that creates or refreshes the bare mirror for `repo_url`; build and run
+    it while holding the mirror lock. A first clone goes to a temp dir and is
+    renamed into place, so an interrupted clone never leaves a half-populated
+    mirror behind.
+    """
+    mirror = mirror_path(mirror_root, repo_url)
+    if mirror.exists():
+        return [GitCmd(("-C", str(mirror), "fetch", "--quiet", "--prune", "origin"))]
+    tmp = mirror.with_name(mirror.name + ".tmp")
+    return [
+        partial(shutil.rmtree, tmp, ignore_errors=True),
+        GitCmd(("clone", "--quiet", "--mirror", repo_url, str(tmp))),
+        partial(tmp.rename, mirror),
+    ]
+
+
+def clone_steps(
+    repo_url: str,
+    dest: Path,
+    mirror_root: Optional[Path] = None,
+    sparse: Optional[List[str]] = None,
+) -> List[Step]:
+    """
+    Plan that checks `repo_url` out at `dest` (see clone_repo); with
+    `mirror_root`, from the mirror, which must be up to date and locked.
+    """
+    no_checkout = ("--no-checkout",) if sparse else ()
+    steps: List[Step] = [partial(shutil.rmtree, dest, ignore_errors=True)]  # allow rerun
+    if mirror_root is not None:
+        # local clone of the shared mirror (objects are hardlinked, not copied)
+        mirror = mirror_path(mirror_root, repo_url)
+        steps.append(GitCmd(("clone", "--quiet", "--local", *no_checkout, str(mirror), str(dest))))
+    elif sparse:
+        # blobless shallow clone; checkout below fetches only the blobs it writes
+        steps.append(
+            GitCmd(("clone", "--quiet", "--depth", "1", "--filter=blob:none", *no_checkout, repo_url, str(dest)))
+        )
+    else:
+        # shallow clone for speed
+        steps.append(GitCmd(("clone", "--quiet", "--depth", "1", repo_url, str(dest))))
+    if sparse:
+        patterns = "\n".join(sparse) + "\n"
+        steps.append(GitCmd(("-C", str(dest), "sparse-checkout", "set", "--no-cone", "--stdin"), patterns))
+        steps.append(GitCmd(("-C", str(dest), "checkout", "--quiet")))
+    return steps
+
+
+def head_step(git_dir: Path) -> GitCmd:
+    return GitCmd(("--git-dir", str(git_dir), "rev-parse", "HEAD"))
+
+
+def meta_for(repo_url: str, commit: str) -> RepoMeta:
+    return RepoMeta(name=repo_url.rstrip("/").split("/")[-1], url=repo_url, commit=commit.strip())
+
+
+def update_mirror(repo_url: str, mirror_root: Path) -> Path:
+    """Creates or refreshes the bare mirror for `repo_url`. Caller must hold the mirror lock."""
+    run_steps(update_mirror_steps(repo_url, mirror_root))
+    return mirror_path(mirror_root, repo_url)
+
+
+def remote_head(repo_url: str) -> Optional[str]:
+    """Commit the remote's HEAD points at, from `git ls-remote` (no objects fetched); None if unreachable."""
+    try:
+        out = subprocess.run(
+            ["git", "ls-remote", repo_url, "HEAD"], capture_output=True, check=True, timeout=120
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    sha = out.decode("utf-8", "replace").partition("\t")[0].strip()
+    return sha or None
+
+
+def sparse_patterns(include_globs: List[str], exclude_globs: List[str]) -> List[str]:
+    """
+    Non-cone sparse-checkout patterns equivalent to the index globs: includes
+    first, then excludes negated so they win over any include they overlap.
+    """
+    patterns = [g for g in include_globs if g and not g.startswith("#")]
+    patterns += [g[1:] if g.startswith("!") else f"!{g}" for g in exclude_globs if g and not g.startswith("#")]
+    return patterns
+
+
+def clone_repo(
+    repo_url: str,
+    dest: Path,
+    mirror_root: Optional[Path] = None,
+    sparse: Optional[List[str]] = None,
+) -> RepoMeta:
+    """
+    `sparse` is a list of non-cone sparse-checkout patterns (see sparse_patterns).
+    When set, only matching paths are written to disk, and a direct clone also
+    uses `--filter=blob:none` so blobs outside the patterns are never fetched.
+    """
     dest.parent.mkdir(parents=True, exist_ok=True)
-    if dest.exists():
-        # allow rerun
-        subprocess.check_call(["rm", "-rf", str(dest)])
-
-    # shallow clone for speed
-    subprocess.check_call(["git", "clone", "--depth", "1", repo_url, str(dest)])
-
-    commit = (
-        subprocess.check_output(["git", "-C", str(dest), "rev-parse", "HEAD"])
-        .decode("utf-8")
-        .strip()
-    )
-    name = repo_url.rstrip("/").split("/")[-1]
-    return RepoMeta(name=name, url=repo_url, commit=commit)
+    if mirror_root is not None:
+        # fetch into the shared mirror, then clone from it
+        with _locked(mirror_path(mirror_root, repo_url)):
+            run_steps(update_mirror_steps(repo_url, mirror_root))
+            run_steps(clone_steps(repo_url, dest, mirror_root, sparse))
+    else:
+        run_steps(clone_steps(repo_url, dest, sparse=sparse))
+    return meta_for(repo_url, run_steps([head_step(dest / ".git")]))
+
+
+def fetch_objects(repo_url: str, dest: Path, mirror_root: Optional[Path] = None) -> Tuple[RepoMeta, Path]:
+    """
+    Makes the objects of `repo_url`'s HEAD available without a working tree,
+    for reading through a GitReader. Returns the repo meta and the git dir:
+    the shared mirror itself when `mirror_root` is set (nothing is copied),
+    otherwise a shallow bare clone at `dest`.
+    """
+    if mirror_root is not None:
+        mirror = mirror_path(mirror_root, repo_url)
+        with _locked(mirror):
+            git_dir = update_mirror(repo_url, mirror_root)
+            commit = run_steps([head_step(git_dir)])
+    else:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        git_dir = dest
+        commit = run_steps([
+            partial(shutil.rmtree, dest, ignore_errors=True),
+            GitCmd(("clone", "--quiet", "--bare", "--depth", "1", repo_url, str(dest))),
+            head_step(git_dir),
+        ])
+    return meta_for(repo_url, commit), git_dir
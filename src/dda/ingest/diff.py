@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class PathChange:
+    status: str  # A, M, D, T (type change); renames/copies are split into D + A
+    path: str
+
+
+def _has_commit(repo_dir: Path, commit: str) -> bool:
+    return (
+        subprocess.run(
+            ["git", "-C", str(repo_dir), "cat-file", "-e", f"{commit}^{{commit}}"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ).returncode
+        == 0
+    )
+
+
+def ensure_commit(repo_dir: Path, commit: str) -> bool:
+    """Makes `commit` available in a (possibly shallow) clone. Returns False if it cannot be fetched."""
+    if _has_commit(repo_dir, commit):
+        return True
+    subprocess.run(
+        ["git", "-C", str(repo_dir), "fetch", "--quiet", "--depth", "1", "origin", commit],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return _has_commit(repo_dir, commit)
+
+
+def parse_name_status(raw: str) -> List[PathChange]:
+    """Parses `git diff --name-status -z` output (NUL-separated, unquoted paths)."""
+    tokens = raw.split("\0")
+    changes: List[PathChange] = []
+    i = 0
+    while i < len(tokens):
+        status = tokens[i][:1]
+        if not status:
+            i += 1
+            continue
+        if status in ("R", "C"):
+            if i + 2 >= len(tokens):
+                break
+            if status == "R":
+                changes.append(PathChange("D", tokens[i + 1]))
+            changes.append(PathChange("A", tokens[i + 2]))
+            i += 3
+        else:
+            if i + 1 >= len(tokens):
+                break
+            changes.append(PathChange(status, tokens[i + 1]))
+            i += 2
+    return changes
+
+
+def diff_name_status(repo_dir: Path, old_commit: str, new_commit: str) -> Optional[List[PathChange]]:
+    """
+    `git diff --name-status old new` as a list of changes, or None if the old
+    commit is not reachable (e.g. force-pushed away).
+
+    Rename detection is off: it needs blob contents, which a blobless clone
+    would have to fetch, and a rename is handled as delete + add anyway.
+    """
+    if old_commit == new_commit:
+        return []
+    if not ensure_commit(repo_dir, old_commit):
+        return None
+    out = subprocess.check_output(
+        ["git", "-C", str(repo_dir), "diff", "--name-status", "-z", "--no-color", "--no-renames", old_commit, new_commit]
+    ).decode("utf-8", errors="replace")
+    return parse_name_status(out)
+
+
+def git_blob_shas(repo_dir: Path) -> Dict[str, str]:
+    """path -> blob sha from git's index; empty when repo_dir isn't a git checkout."""
+    try:
+        out = subprocess.check_output(
+            ["git", "-C", str(repo_dir), "ls-files", "-s", "-z"], stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    shas: Dict[str, str] = {}
+    for rec in out.decode("utf-8", "surrogateescape").split("\0"):
+        if rec:
+            meta, _, path = rec.partition("\t")
+            shas[path] = meta.split()[1]
+    return shas
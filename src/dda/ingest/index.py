@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+import time
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
-from typing import Iterable, List, Set
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, overload
+from zlib import crc32
 
-from pathspec import PathSpec
+from dda.ingest.budget import coverage_report, select_budgeted, skipped_files
+from dda.ingest.diff import PathChange
+from dda.ingest.reader import FsReader, GitReader, RepoReader, ls_tree
+from dda.ingest.walk import glob_matcher, glob_spec, walk_files
 
 
 @dataclass(frozen=True)
@@ -13,11 +23,407 @@ class FileEntry:
     size: int
 
 
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+# dump_index layout; 2 added the skipped file list. Cached indexes of other versions are rebuilt.
+INDEX_FORMAT = 2
+
+
+def _ext_of(base: str) -> str:
+    return base.rsplit(".", 1)[-1].lower() if "." in base else ""
+
+
+def _positions(groups: Dict[Any, List[int]]) -> Dict[Any, array]:
+    return {k: array("I", v) for k, v in groups.items()}
+
+
+class FileTable(Sequence[FileEntry]):
+    """
+    Read-only, columnar list of FileEntry.
+
+    Instead of one FileEntry object and one full path string per file it keeps
+    parallel arrays (directory id, basename offset, extension id, size), an
+    interned table of directories and extensions, and all basenames in a
+    single string: roughly 24 bytes per file plus the basename, under half
+    the object form. Entries are built on access, so
+    `for e in index.files` and `index.files[i]` still yield FileEntry; hot
+    paths use `paths()`, `path(i)` and `sizes` to skip that.
+    """
+
+    __slots__ = ("dirs", "exts", "dir_ids", "ext_ids", "sizes", "_dir_pos", "_names", "_offsets")
+
+    def __init__(self, pairs: Iterable[Tuple[str, int]] = ()):
+        self.dirs: List[str] = []  # "" is the repo root
+        self.exts: List[str] = []  # lower-cased, no dot; "" for none
+        self.dir_ids = array("I")
+        self.ext_ids = array("I")
+        self.sizes = array("q")
+        self._dir_pos: Dict[str, int] = {}
+        self._offsets = array("Q", [0])
+        ext_pos: Dict[str, int] = {}
+        names: List[str] = []
+        end = 0
+        for path, size in pairs:
+            d, _, base = path.rpartition("/")
+            di = self._dir_pos.get(d)
+            if di is None:
+                di = self._dir_pos[d] = len(self.dirs)
+                self.dirs.append(d)
+            ext = _ext_of(base)
+            xi = ext_pos.get(ext)
+            if xi is None:
+                xi = ext_pos[ext] = len(self.exts)
+                self.exts.append(ext)
+            self.dir_ids.append(di)
+            self.ext_ids.append(xi)
+            self.sizes.append(size)
+            names.append(base)
+            end += len(base)
+            self._offsets.append(end)
+        self._names = "".join(names)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def basename(self, i: int) -> str:
+        return self._names[self._offsets[i] : self._offsets[i + 1]]
+
+    def path(self, i: int) -> str:
+        d = self.dirs[self.dir_ids[i]]
+        base = self._names[self._offsets[i] : self._offsets[i + 1]]
+        return f"{d}/{base}" if d else base
+
+    def basenames(self) -> Iterator[str]:
+        names, off = self._names, self._offsets
+        for i in range(len(self.sizes)):
+            yield names[off[i] : off[i + 1]]
+
+    def paths(self) -> Iterator[str]:
+        dirs = self.dirs
+        for d, base in zip(self.dir_ids, self.basenames()):
+            yield f"{dirs[d]}/{base}" if dirs[d] else base
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        for path, size in zip(self.paths(), self.sizes):
+            yield FileEntry(path, size)
+
+    @overload
+    def __getitem__(self, i: int) -> FileEntry: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> FileTable: ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[FileEntry, FileTable]:
+        if isinstance(i, slice):
+            return FileTable((self.path(j), self.sizes[j]) for j in range(*i.indices(len(self))))
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("FileTable index out of range")
+        return FileEntry(self.path(i), self.sizes[i])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FileTable):
+            return self.sizes == other.sizes and all(a == b for a, b in zip(self.paths(), other.paths()))
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"FileTable({len(self)} files, {len(self.dirs)} dirs)"
+
+
+class _PathMap(Mapping[str, int]):
+    """
+    path -> position as an open-addressing hash table in one int array, so
+    membership tests don't need a dict holding every full path string. Keys
+    are hashed with crc32 rather than hash() so the table stays valid when the
+    index is pickled into a worker process with a different hash seed.
+    """
+
+    __slots__ = ("_files", "_slots", "_mask")
+
+    def __init__(self, files: FileTable):
+        self._files = files
+        size = 8
+        while size < 2 * len(files):
+            size *= 2
+        self._mask = size - 1
+        self._slots = array("i", [-1]) * size
+        for i, path in enumerate(files.paths()):
+            h = self._home(path)
+            while self._slots[h] != -1:
+                if files.path(self._slots[h]) == path:
+                    break  # duplicate path: the first position wins, as in a lookup by scan
+                h = (h + 1) & self._mask
+            else:
+                self._slots[h] = i
+
+    def _home(self, path: str) -> int:
+        return crc32(path.encode("utf-8", "surrogatepass")) & self._mask
+
+    def get(self, path: str, default: Any = None) -> Any:  # type: ignore[override]
+        if not isinstance(path, str):
+            return default
+        slots, mask, files = self._slots, self._mask, self._files
+        h = self._home(path)
+        while True:
+            i = slots[h]
+            if i == -1:
+                return default
+            if files.path(i) == path:
+                return i
+            h = (h + 1) & mask
+
+    def __getitem__(self, path: str) -> int:
+        i = self.get(path)
+        if i is None:
+            raise KeyError(path)
+        return i
+
+    def __contains__(self, path: object) -> bool:
+        return self.get(path) is not None  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        return self._files.paths()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+class _DirNode:
+    __slots__ = ("children", "files")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _DirNode] = {}
+        self.files: Sequence[int] = ()
+
+    def positions(self) -> List[int]:
+        out = list(self.files)
+        stack = list(self.children.values())
+        while stack:
+            node = stack.pop()
+            out.extend(node.files)
+            stack.extend(node.children.values())
+        return out
+
+
 @dataclass
 class FileIndex:
+    """
+    Indexed files plus lazily built lookup tables over their paths.
+
+    `files` is a FileTable; a plain list of FileEntry passed to the
+    constructor is converted. Lookups return paths in `files` order. The
+    tables are built on first use and keep positions in `array`s rather than
+    lists of ints.
+    """
+
     root: Path
-    files: List[FileEntry]
+    files: FileTable
     languages: List[str]
+    # what the scan considered vs. kept (see budget.coverage_report); empty for hand-built indexes
+    coverage: Dict[str, Any] = field(default_factory=dict, compare=False)
+    # (path, size) of every file the scan considered but left out
+    skipped: List[Tuple[str, int]] = field(default_factory=list, repr=False, compare=False)
+    # where file contents come from; defaults to the checkout at `root`
+    reader: Optional[RepoReader] = field(default=None, repr=False, compare=False)
+    _tables: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.files, FileTable):
+            self.files = FileTable((e.path, e.size) for e in self.files)
+        if self.reader is None:
+            self.reader = FsReader(self.root)
+
+    def _table(self, name: str) -> Any:
+        table = self._tables.get(name)
+        if table is None:
+            table = getattr(self, f"_build_{name}")()
+            self._tables[name] = table
+        return table
+
+    def _build_paths(self) -> _PathMap:
+        return _PathMap(self.files)
+
+    def _build_ext(self) -> Dict[str, array]:
+        by_id: Dict[int, List[int]] = {}
+        for i, x in enumerate(self.files.ext_ids):
+            by_id.setdefault(x, []).append(i)
+        return _positions({self.files.exts[x]: pos for x, pos in by_id.items()})
+
+    def _build_basename(self) -> Dict[str, array]:
+        out: Dict[str, List[int]] = {}
+        for i, base in enumerate(self.files.basenames()):
+            out.setdefault(base, []).append(i)
+        return _positions(out)
+
+    def _build_dir_files(self) -> List[array]:
+        by_dir: List[List[int]] = [[] for _ in self.files.dirs]
+        for i, d in enumerate(self.files.dir_ids):
+            by_dir[d].append(i)
+        return [array("I", pos) for pos in by_dir]
+
+    def _build_token(self) -> tuple[Dict[str, List[int]], Dict[str, array]]:
+        # directory tokens map to directory ids (every file in them matches), so
+        # a token shared by a whole subtree costs one entry per directory, not per file
+        dir_tokens: Dict[str, List[int]] = {}
+        for d, name in enumerate(self.files.dirs):
+            for tok in set(_TOKEN_SPLIT.split(name.lower())):
+                if tok:
+                    dir_tokens.setdefault(tok, []).append(d)
+        base_tokens: Dict[str, List[int]] = {}
+        for i, base in enumerate(self.files.basenames()):
+            for tok in set(_TOKEN_SPLIT.split(base.lower())):
+                if tok:
+                    base_tokens.setdefault(tok, []).append(i)
+        return dir_tokens, _positions(base_tokens)
+
+    def _build_trie(self) -> _DirNode:
+        root = _DirNode()
+        for d, pos in enumerate(self._table("dir_files")):
+            node = root
+            for part in self.files.dirs[d].split("/") if self.files.dirs[d] else ():
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = _DirNode()
+                node = child
+            node.files = pos
+        return root
+
+    def _build_blob(self) -> tuple[str, array]:
+        # every path joined by "\n"; str.find over one buffer beats a Python loop of `in` checks
+        starts = array("q")
+        pos = 0
+        for path in self.files.paths():
+            starts.append(pos)
+            pos += len(path) + 1
+        return "\n".join(self.files.paths()), starts
+
+    def _build_lower_blob(self) -> tuple[str, array]:
+        blob, starts = self._table("blob")
+        return blob.lower(), starts
+
+    def _paths_at(self, positions: Iterable[int]) -> List[str]:
+        path = self.files.path
+        return [path(i) for i in sorted(set(positions))]
+
+    @property
+    def paths(self) -> Mapping[str, int]:
+        """path -> position; use for membership tests (`"README.md" in index.paths`)."""
+        return self._table("paths")
+
+    def ordered(self, paths: Iterable[str]) -> List[str]:
+        """Indexed `paths` in index order, e.g. to merge the results of several lookups."""
+        pos = self.paths
+        return self._paths_at(pos[p] for p in paths if p in pos)
+
+    def by_ext(self, *exts: str) -> List[str]:
+        """Files whose basename ends in `.<ext>` (case-insensitive, no leading dot)."""
+        table = self._table("ext")
+        return self._paths_at(i for ext in exts for i in table.get(ext.lower().lstrip("."), ()))
+
+    def by_basename(self, *names: str) -> List[str]:
+        table = self._table("basename")
+        return self._paths_at(i for name in names for i in table.get(name, ()))
+
+    def with_token(self, token: str) -> List[str]:
+        """Files with `token` as a whole lower-cased path token (split on non-alphanumerics)."""
+        dir_tokens, base_tokens = self._table("token")
+        token = token.lower()
+        by_dir = self._table("dir_files")
+        hits = chain(base_tokens.get(token, ()), *(by_dir[d] for d in dir_tokens.get(token, ())))
+        return self._paths_at(hits)
+
+    def _dir_node(self, prefix: str) -> Optional[_DirNode]:
+        node = self._table("trie")
+        for part in prefix.strip("/").split("/"):
+            if not part:
+                continue
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def under(self, prefix: str) -> List[str]:
+        """Files below directory `prefix` ("" for all), via the directory trie."""
+        node = self._dir_node(prefix)
+        return self._paths_at(node.positions()) if node is not None else []
+
+    def is_dir(self, prefix: str) -> bool:
+        """True if some indexed file lives below directory `prefix`."""
+        return self._dir_node(prefix) is not None
+
+    def line_count(self, path: str) -> Optional[int]:
+        """
+        Number of lines in an indexed file (a final line without a newline
+        counts), read and counted once then memoized; None if `path` isn't
+        indexed or can't be read. Counts already seen by the snippet service
+        (see record_line_count) are not read again.
+        """
+        counts = self._tables.setdefault("lines", {})
+        n = counts.get(path)
+        if n is None and path in self.paths:
+            try:
+                data = self.reader.read_bytes(path)  # type: ignore[union-attr]
+            except OSError:
+                return None
+            n = counts[path] = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+        return n
+
+    def record_line_count(self, path: str, n: int) -> None:
+        """Memoizes `n` as line_count(path), from a caller that has already scanned the file."""
+        if path in self.paths:
+            self._tables.setdefault("lines", {})[path] = n
+
+    def top_level_dirs(self) -> Dict[str, int]:
+        """Top-level directory -> number of indexed files below it."""
+        root = self._table("trie")
+        return {name: len(child.positions()) for name, child in root.children.items()}
+
+    def path_contains(self, needle: str, ignore_case: bool = True) -> List[str]:
+        """Files whose path contains `needle` as a substring."""
+        if not needle:
+            return list(self.files.paths())
+        key = ("contains", needle.lower() if ignore_case else needle, ignore_case)
+        hits = self._tables.get(key)
+        if hits is None:
+            blob, starts = self._table("lower_blob" if ignore_case else "blob")
+            found: Set[int] = set()
+            at = blob.find(key[1])
+            while at != -1:
+                i = bisect_right(starts, at) - 1
+                found.add(i)
+                # skip to the next path; a path only needs to match once
+                at = blob.find(key[1], starts[i + 1] if i + 1 < len(starts) else len(blob))
+            hits = self._tables[key] = self._paths_at(found)
+        return hits
+
+
+def dump_index(index: FileIndex) -> dict[str, Any]:
+    """Compact, root-independent form of an index (parallel path/size arrays)."""
+    return {
+        "version": INDEX_FORMAT,
+        "languages": list(index.languages),
+        "paths": list(index.files.paths()),
+        "sizes": index.files.sizes.tolist(),
+        "coverage": index.coverage,
+        "skipped_paths": [p for p, _ in index.skipped],
+        "skipped_sizes": [s for _, s in index.skipped],
+    }
+
+
+def load_index(data: dict[str, Any], root: Path, reader: Optional[RepoReader] = None) -> FileIndex:
+    files = FileTable(zip(data["paths"], data["sizes"]))
+    return FileIndex(
+        root=root,
+        files=files,
+        languages=list(data.get("languages", [])),
+        coverage=data.get("coverage", {}),
+        skipped=list(zip(data.get("skipped_paths", []), data.get("skipped_sizes", []))),
+        reader=reader,
+    )
 
 
 def _detect_languages(paths: Iterable[str]) -> List[str]:
@@ -48,26 +454,145 @@ def build_file_index(
     exclude_globs: List[str],
     max_files: int,
     max_bytes: int,
+    workers: Optional[int] = None,
+    mode: str = "first_n",
+    budget_bytes: Optional[int] = None,
+    deadline_s: Optional[float] = None,
 ) -> FileIndex:
-    include = PathSpec.from_lines("gitwildmatch", include_globs)
-    exclude = PathSpec.from_lines("gitwildmatch", exclude_globs)
+    """
+    Indexes files under `repo_dir` that match `include_globs`, do not match
+    `exclude_globs` and are at most `max_bytes` in size.
 
-    entries: List[FileEntry] = []
-    for fp in repo_dir.rglob("*"):
-        if not fp.is_file():
-            continue
-        rel = fp.relative_to(repo_dir).as_posix()
-        if exclude.match_file(rel):
+    - mode "first_n": the first `max_files` paths in path order (deterministic
+      rather than dependent on directory listing order).
+    - mode "budgeted": at most `max_files` files and `budget_bytes` bytes, spread
+      over file kinds and top-level components (see budget.select_budgeted).
+      `deadline_s` caps the walk itself; directories not reached are recorded.
+
+    `index.coverage` records what was considered, kept and skipped.
+    """
+    include = glob_spec(tuple(include_globs))
+    exclude = glob_spec(tuple(exclude_globs))
+
+    deadline = time.monotonic() + deadline_s if mode == "budgeted" and deadline_s is not None else None
+    unscanned: List[str] = []
+    found = walk_files(
+        repo_dir, include, exclude, max_bytes=max_bytes, workers=workers, deadline=deadline, unscanned=unscanned
+    )
+    budget = {"deadline_s": deadline_s} if mode == "budgeted" else {}
+    return _select(repo_dir, found, max_files, mode, budget_bytes, budget, unscanned)
+
+
+def build_tree_index(
+    git_dir: Path,
+    commit: str,
+    include_globs: List[str],
+    exclude_globs: List[str],
+    max_files: int,
+    max_bytes: int,
+    mode: str = "first_n",
+    budget_bytes: Optional[int] = None,
+    reader: Optional[RepoReader] = None,
+) -> FileIndex:
+    """
+    build_file_index over the tree of `commit` in `git_dir` instead of a
+    checkout: paths and sizes come from `git ls-tree`, and contents are read
+    through `reader` (a GitReader on the same commit unless given). Only
+    regular files are indexed; symlinks are skipped rather than followed.
+    Listing a tree is fast enough that there is no walk deadline to apply.
+    """
+    include = glob_matcher(tuple(include_globs))
+    exclude = glob_matcher(tuple(exclude_globs))
+    found = sorted(
+        (path, size)
+        for path, _, size in ls_tree(git_dir, commit)
+        if size <= max_bytes and not exclude(path) and include(path)
+    )
+    index = _select(git_dir, found, max_files, mode, budget_bytes, {}, [])
+    index.reader = reader or GitReader(git_dir, commit)
+    return index
+
+
+def _select(
+    root: Path,
+    found: List[Tuple[str, int]],
+    max_files: int,
+    mode: str,
+    budget_bytes: Optional[int],
+    budget: Dict[str, Any],
+    unscanned: List[str],
+) -> FileIndex:
+    """Applies the scan mode to walked (path, size) pairs and records coverage."""
+    if mode == "budgeted":
+        kept = select_budgeted(found, max_files, budget_bytes)
+        budget = {"files": max_files, "bytes": budget_bytes, **budget}
+    else:
+        kept = found[:max_files]
+        budget = {"files": max_files}
+    entries = FileTable(kept)
+
+    langs = _detect_languages(entries.paths())
+    skipped = skipped_files(found, kept)
+    coverage = coverage_report(
+        mode, found, kept, budget, deadline_hit=bool(unscanned), unscanned_dirs=unscanned, skipped=skipped
+    )
+    return FileIndex(root=root, files=entries, languages=langs, coverage=coverage, skipped=skipped)
+
+
+def patch_index(
+    index: FileIndex,
+    changes: List[PathChange],
+    include_globs: List[str],
+    exclude_globs: List[str],
+    max_files: int,
+    max_bytes: int,
+) -> Optional[FileIndex]:
+    """
+    Applies a `git diff --name-status` to an index built with the same globs and
+    caps, re-statting only changed paths under `index.root`.
+
+    Returns None when the old index was truncated at `max_files`: files beyond
+    the cap were never recorded, so deletions could not be backfilled.
+    """
+    if len(index.files) >= max_files or index.coverage.get("skipped", {}).get("files"):
+        return None
+
+    include = glob_matcher(tuple(include_globs))
+    exclude = glob_matcher(tuple(exclude_globs))
+
+    sizes = dict(zip(index.files.paths(), index.files.sizes))
+    for ch in changes:
+        sizes.pop(ch.path, None)
+        if ch.status == "D":
             continue
-        if not include.match_file(rel):
+        if exclude(ch.path) or not include(ch.path):
             continue
-
-        size = fp.stat().st_size
-        if size > max_bytes:
+        fp = index.root / ch.path
+        try:
+            if not fp.is_file():
+                continue
+            size = fp.stat().st_size
+        except OSError:
             continue
-        entries.append(FileEntry(path=rel, size=size))
-        if len(entries) >= max_files:
-            break
+        if size <= max_bytes:
+            sizes[ch.path] = size
 
-    langs = _detect_languages([e.path for e in entries])
-    return FileIndex(root=repo_dir, files=entries, languages=langs)
+    found = sorted(sizes.items())
+    mode = index.coverage.get("mode", "first_n")
+    budget = index.coverage.get("budget", {})
+    if mode == "budgeted" and (
+        len(found) > max_files or sum(s for _, s in found) > (budget.get("bytes") or float("inf"))
+    ):
+        return None  # over budget now: selection must be redone over a full walk
+    kept = found[:max_files]
+    entries = FileTable(kept)
+    skipped = skipped_files(found, kept)
+    coverage = coverage_report(mode, found, kept, budget, skipped=skipped)
+    return FileIndex(
+        root=index.root,
+        files=entries,
+        languages=_detect_languages(entries.paths()),
+        coverage=coverage,
+        skipped=skipped,
+        reader=index.reader,
+    )
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Sequence
+
+from dda.ingest.clone import GitCmd, RepoMeta, Step, clone_steps, head_step, meta_for, mirror_path, update_mirror_steps
+
+
+class GitError(RuntimeError):
+    pass
+
+
+async def _git(*args: str, stdin: Optional[str] = None) -> str:
+    """Runs git without blocking the event loop; raises GitError with stderr on failure."""
+    proc = await asyncio.create_subprocess_exec(
+        "git",
+        *args,
+        stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    out, err = await proc.communicate(stdin.encode() if stdin is not None else None)
+    if proc.returncode != 0:
+        raise GitError(f"git {' '.join(args)} exited {proc.returncode}: {err.decode('utf-8', 'replace').strip()}")
+    return out.decode("utf-8")
+
+
+@asynccontextmanager
+async def _alocked(path: Path) -> AsyncIterator[None]:
+    """clone._locked for coroutines: the blocking flock waits on a thread, not the loop."""
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a") as f:
+        await asyncio.to_thread(fcntl.flock, f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+async def run_steps_async(steps: Sequence[Step]) -> str:
+    """clone.run_steps for coroutines: git as asyncio subprocesses, filesystem steps on a thread."""
+    out = ""
+    for step in steps:
+        if isinstance(step, GitCmd):
+            out = await _git(*step.args, stdin=step.stdin)
+        else:
+            await asyncio.to_thread(step)
+    return out
+
+
+async def clone_repo_async(
+    repo_url: str,
+    dest: Path,
+    mirror_root: Optional[Path] = None,
+    sparse: Optional[List[str]] = None,
+) -> RepoMeta:
+    """clone.clone_repo with the same plans run on asyncio."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if mirror_root is not None:
+        async with _alocked(mirror_path(mirror_root, repo_url)):
+            await run_steps_async(update_mirror_steps(repo_url, mirror_root))
+            await run_steps_async(clone_steps(repo_url, dest, mirror_root, sparse))
+    else:
+        await run_steps_async(clone_steps(repo_url, dest, sparse=sparse))
+    return meta_for(repo_url, await run_steps_async([head_step(dest / ".git")]))
+
+
+def disk_usage(path: Path) -> int:
+    """Apparent size in bytes of everything under `path` (symlinks not followed)."""
+    total = 0
+    stack = [str(path)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    else:
+                        total += e.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return total
+
+
+class DiskBudget:
+    """
+    Caps the bytes of checkouts on disk at once. A clone's size is unknown until
+    it lands, so admission reserves the largest clone seen so far and `settle`
+    swaps that reservation for the real size. One clone is always admitted when
+    nothing is held, so a repo larger than the whole budget still makes progress.
+    """
+
+    def __init__(self, max_bytes: Optional[int]):
+        self.max_bytes = max_bytes
+        self.used = 0  # settled sizes + outstanding reservations
+        self.held = 0
+        self.estimate = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> int:
+        """Waits for room; returns the reservation to pass to `settle`."""
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: self.max_bytes is None or self.held == 0 or self.used + self.estimate <= self.max_bytes
+            )
+            self.held += 1
+            self.used += self.estimate
+            return self.estimate
+
+    async def settle(self, reserved: int, size: int) -> None:
+        """Replaces an admitted clone's reservation with its actual on-disk size."""
+        async with self._cond:
+            self.used += size - reserved
+            self.estimate = max(self.estimate, size)
+            self._cond.notify_all()
+
+    async def release(self, size: int) -> None:
+        """Returns a settled clone's bytes once its checkout is deleted."""
+        async with self._cond:
+            self.used -= size
+            self.held -= 1
+            self._cond.notify_all()
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import mmap
+import os
+import subprocess
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from dda.ingest.diff import git_blob_shas
+
+Buffer = Union[bytes, mmap.mmap]
+
+# ls-tree modes indexed as files: regular and executable blobs. Symlinks (120000)
+# and submodules (160000) have no file content of their own in the object store.
+_FILE_MODES = (b"100644", b"100755")
+_LS_TREE_CHUNK = 1 << 20
+
+
+class RepoReader:
+    """
+    How extractors, the index and the snippet service read repo files, by
+    posix path relative to the repo root. Missing or unreadable files raise
+    OSError, as a plain open() would.
+    """
+
+    def read_bytes(self, path: str) -> bytes:
+        raise NotImplementedError
+
+    def read_text(self, path: str, errors: str = "replace") -> str:
+        return self.read_bytes(path).decode("utf-8", errors)
+
+    @contextmanager
+    def view(self, path: str) -> Iterator[Buffer]:
+        """Whole contents as a bytes-like buffer, valid inside the block (mmapped where possible)."""
+        yield self.read_bytes(path)
+
+    def blob_shas(self) -> Dict[str, str]:
+        """path -> git blob sha where known without reading contents (keys for the extractor caches)."""
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+class FsReader(RepoReader):
+    """Files of a working-tree checkout under `root`."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def read_bytes(self, path: str) -> bytes:
+        with open(os.path.join(self.root, path), "rb") as f:
+            return f.read()
+
+    @contextmanager
+    def view(self, path: str) -> Iterator[Buffer]:
+        with open(os.path.join(self.root, path), "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                yield b""
+                return
+            with mm:
+                yield mm
+
+    def blob_shas(self) -> Dict[str, str]:
+        return git_blob_shas(self.root)
+
+    def __repr__(self) -> str:
+        return f"FsReader({str(self.root)!r})"
+
+
+def ls_tree(git_dir: Path, commit: str) -> Iterator[Tuple[str, str, int]]:
+    """
+    (path, blob sha, size) of every regular file in `commit`, from
+    `git ls-tree -r -l -z`: paths and sizes come from tree objects alone, so
+    nothing is checked out or even decompressed beyond the trees. Streamed, so
+    a huge tree is never held as one output buffer.
+    """
+    proc = subprocess.Popen(
+        ["git", "--git-dir", str(git_dir), "ls-tree", "-r", "-l", "-z", "--full-tree", commit],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert proc.stdout is not None and proc.stderr is not None
+    tail = b""
+    try:
+        while True:
+            chunk = proc.stdout.read(_LS_TREE_CHUNK)
+            if not chunk:
+                break
+            records = (tail + chunk).split(b"\0")
+            tail = records.pop()
+            for rec in records:
+                # "<mode> SP <type> SP <sha> SP+ <size> TAB <path>"
+                meta, _, path = rec.partition(b"\t")
+                fields = meta.split()
+                if fields[0] in _FILE_MODES:
+                    yield path.decode("utf-8", "surrogateescape"), fields[2].decode(), int(fields[3])
+    finally:
+        # also reached when the caller stops early; git then just gets a broken pipe
+        proc.stdout.close()
+        err = proc.stderr.read()
+        proc.stderr.close()
+        proc.wait()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=err)
+
+
+class GitReader(RepoReader):
+    """
+    Blobs of `commit` read straight from the object store of `git_dir` (a bare
+    mirror or clone, or any checkout's .git) through one long-lived
+    `git cat-file --batch`, so no working tree is ever written.
+
+    Requests are serialized on a lock, so extractor threads can share one
+    reader. The subprocess starts on first read and is not pickled: a copy
+    sent to a worker process starts its own.
+    """
+
+    def __init__(self, git_dir: Path, commit: str):
+        self.git_dir = git_dir
+        self.commit = commit
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"git_dir": self.git_dir, "commit": self.commit}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["git_dir"], state["commit"])  # type: ignore[misc]
+
+    def _batch(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["git", "--git-dir", str(self.git_dir), "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._proc
+
+    def read_bytes(self, path: str) -> bytes:
+        if "\n" in path:
+            raise FileNotFoundError(path)  # can't be named on a --batch line
+        rev = f"{self.commit}:{path}".encode("utf-8", "surrogateescape")
+        with self._lock:
+            proc = self._batch()
+            assert proc.stdin is not None and proc.stdout is not None
+            try:
+                proc.stdin.write(rev + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline()
+            except OSError:
+                header = b""
+            if not header:
+                self._proc = None
+                raise OSError(f"git cat-file exited while reading {path}")
+            if header == rev + b" missing\n" or header == rev + b" ambiguous\n":
+                raise FileNotFoundError(path)
+            # "<sha> SP <type> SP <size> LF <contents> LF"
+            _, kind, size = header.split()
+            data = proc.stdout.read(int(size))
+            proc.stdout.read(1)
+        if kind != b"blob":
+            raise IsADirectoryError(path)
+        return data
+
+    def blob_shas(self) -> Dict[str, str]:
+        return {path: sha for path, sha, _ in ls_tree(self.git_dir, self.commit)}
+
+    def close(self) -> None:
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is not None:
+            assert proc.stdin is not None and proc.stdout is not None
+            proc.stdin.close()
+            proc.wait()
+            proc.stdout.close()
+
+    def __repr__(self) -> str:
+        return f"GitReader({str(self.git_dir)!r}, {self.commit[:12]!r})"
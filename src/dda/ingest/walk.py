@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+from pathspec import PathSpec
+
+# Name used to probe whether *everything* below a directory is excluded.
+# Deliberately improbable so that extension/basename patterns never match it.
+_PROBE = "__dda_prune_probe__"
+
+DEFAULT_WALK_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+Matcher = Callable[[str], bool]
+
+
+def _is_positive(spec: PathSpec) -> bool:
+    # A negated pattern ("!keep/**") can re-include files matched by an earlier
+    # pattern, so "any pattern matches" is only equivalent for positive specs.
+    return all(getattr(p, "include", True) is not False for p in spec.patterns)
+
+
+def compile_matcher(spec: PathSpec) -> Matcher:
+    """
+    Folds a positive-only spec into a single alternation regex, which is far
+    cheaper per path than `PathSpec.match_file` trying each pattern in turn.
+    Specs with negations keep the exact `match_file` semantics.
+    """
+    regexes = [getattr(p, "regex", None) for p in spec.patterns if getattr(p, "include", None) is not None]
+    if not _is_positive(spec) or any(r is None for r in regexes):
+        return spec.match_file
+    if not regexes:
+        return lambda path: False
+    # Named groups (pathspec uses `ps_d`) would collide once alternated.
+    parts = [re.sub(r"\(\?P<\w+>", "(?:", r.pattern) for r in regexes]
+    combined = re.compile("|".join(f"(?:{p})" for p in parts))
+    return lambda path: combined.match(path) is not None
+
+
+@lru_cache(maxsize=128)
+def glob_spec(globs: Tuple[str, ...]) -> PathSpec:
+    """Compiled gitwildmatch spec for `globs`, shared across calls (and runs, in long-lived processes)."""
+    return PathSpec.from_lines("gitwildmatch", globs)
+
+
+@lru_cache(maxsize=128)
+def glob_matcher(globs: Tuple[str, ...]) -> Matcher:
+    """`compile_matcher(glob_spec(globs))`, memoized."""
+    return compile_matcher(glob_spec(globs))
+
+
+def dir_is_excluded(exclude: Matcher, rel_dir: str) -> bool:
+    """
+    True if every file below `rel_dir` would be rejected by `exclude`.
+    Probes one and two levels deep so single-level patterns (`build/*`)
+    only prune when they also swallow nested paths.
+    """
+    return exclude(f"{rel_dir}/{_PROBE}") and exclude(f"{rel_dir}/{_PROBE}/{_PROBE}")
+
+
+def _scan_dir(
+    abs_dir: str,
+    rel_dir: str,
+    include: Matcher,
+    exclude: Matcher,
+    prune: bool,
+    max_bytes: int,
+) -> Tuple[List[Tuple[str, int]], List[Tuple[str, str]]]:
+    files: List[Tuple[str, int]] = []
+    subdirs: List[Tuple[str, str]] = []
+    try:
+        it = os.scandir(abs_dir)
+    except OSError:
+        return files, subdirs
+
+    with it:
+        for entry in it:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                # d_type answers both questions without a stat() on most filesystems.
+                # Symlinked directories are not followed (same as Path.rglob).
+                if entry.is_dir(follow_symlinks=False):
+                    if prune and dir_is_excluded(exclude, rel):
+                        continue
+                    subdirs.append((entry.path, rel))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if exclude(rel):
+                continue
+            if not include(rel):
+                continue
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            if size > max_bytes:
+                continue
+            files.append((rel, size))
+    return files, subdirs
+
+
+def walk_files(
+    repo_dir: Path,
+    include: PathSpec,
+    exclude: PathSpec,
+    max_bytes: int,
+    workers: Optional[int] = None,
+    deadline: Optional[float] = None,
+    unscanned: Optional[List[str]] = None,
+) -> List[Tuple[str, int]]:
+    """
+    Walks `repo_dir` and returns (posix relative path, size) for every file that
+    passes the include/exclude specs and the size cap, sorted by path.
+
+    Excluded directories are dropped before they are descended into, and each
+    directory is listed as its own task on a thread pool (`os.scandir` releases
+    the GIL, so listings overlap on I/O).
+
+    Past `deadline` (a time.monotonic() value) directories already queued are
+    still listed but not descended into; the relative paths of the directories
+    left out are appended to `unscanned` if given.
+    """
+    prune = _is_positive(exclude)
+    include_fn = compile_matcher(include)
+    exclude_fn = compile_matcher(exclude)
+    workers = workers or DEFAULT_WALK_WORKERS
+    out: List[Tuple[str, int]] = []
+
+    if workers <= 1:
+        stack = [(str(repo_dir), "")]
+        while stack:
+            abs_dir, rel_dir = stack.pop()
+            files, subdirs = _scan_dir(abs_dir, rel_dir, include_fn, exclude_fn, prune, max_bytes)
+            out.extend(files)
+            if deadline is not None and subdirs and time.monotonic() >= deadline:
+                if unscanned is not None:
+                    unscanned.extend(rel for _, rel in subdirs)
+                continue
+            stack.extend(subdirs)
+        out.sort()
+        return out
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dda-walk") as pool:
+        pending: Set[Future] = {pool.submit(_scan_dir, str(repo_dir), "", include_fn, exclude_fn, prune, max_bytes)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                files, subdirs = fut.result()
+                out.extend(files)
+                if deadline is not None and subdirs and time.monotonic() >= deadline:
+                    if unscanned is not None:
+                        unscanned.extend(rel for _, rel in subdirs)
+                    continue
+                for abs_dir, rel_dir in subdirs:
+                    pending.add(pool.submit(_scan_dir, abs_dir, rel_dir, include_fn, exclude_fn, prune, max_bytes))
+
+    out.sort()
+    return out
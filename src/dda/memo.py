@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from dataclasses import asdict
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from dda.extractors.registry import default_extractors
+from dda.scoring.rubric import RUBRIC, RUBRIC_VERSION
+from dda.utils.config import RootCfg
+from dda.utils.hashing import short_hash
+
+# Everything a finished run leaves behind that a later run can reuse as-is,
+# including the state `--since-run` incremental runs start from.
+RESULT_FILES = (
+    "scorecard.json",
+    "graph.json",
+    "report.md",
+    "summary.json",
+    "index.json",
+    "coverage.json",
+    "extractors.json",
+    "evidence/evidence.jsonl",
+)
+SNIPPETS_DIR = "evidence/snippets"
+# describe the run that wrote them (run id, timestamp): rewritten per run, never linked
+PER_RUN_FILES = ("scorecard.json", "summary.json", "report.md")
+
+
+def _package_version() -> str:
+    try:
+        return metadata.version("due-diligence-agent")
+    except metadata.PackageNotFoundError:
+        return "dev"
+
+
+def result_key(commit: str, cfg: RootCfg, focus: Optional[str]) -> str:
+    """
+    Deterministic key of everything a run's outputs depend on: the commit, the
+    focus, the effective config, each extractor's version and content
+    patterns, the rubric, the report template's text and the package version.
+
+    Left out of the config: cache/db settings and the mirror/sparse clone
+    options, which change how a run gets its inputs, and the extractor
+    workers/timeout_s/mode, which change how fast it runs, but not what it
+    outputs. (A timeout does change the results, but runs with a timed-out
+    extractor are never memoized.) ingest.backend stays, since the two
+    backends treat symlinks differently.
+    """
+    try:
+        template = short_hash(Path(cfg.report.template).read_text(encoding="utf-8"))
+    except OSError:
+        template = None
+    parts = {
+        "commit": commit,
+        "focus": focus,
+        "config": cfg.model_dump(mode="json", exclude={"cache": True, "db": True, "ingest": {"mirror", "sparse"}, "extractors": True}),
+        "extractors": [
+            [s.name, s.version, [[p.id, p.regex, list(p.literals), list(p.globs)] for p in s.patterns]]
+            for s in default_extractors()
+        ],
+        "rubric": [RUBRIC_VERSION, [asdict(c) for c in RUBRIC]],
+        "template": template,
+        "dda": _package_version(),
+    }
+    return short_hash(json.dumps(parts, sort_keys=True))[:32]
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def detach(run_dir: Path) -> None:
+    """
+    Unlinks outputs in `run_dir` that share an inode with a cache entry, so
+    analyzing into the same dir again rewrites new files, not the entry's.
+    """
+    for name in RESULT_FILES:
+        p = run_dir / name
+        try:
+            if p.stat().st_nlink > 1:
+                p.unlink()
+        except OSError:
+            continue
+
+
+class ResultCache:
+    """
+    Finished runs keyed by result_key, one directory per key under
+    `<root>/results/`.
+
+    - `put` copies a run's artifacts in (a tmp dir renamed into place, so a
+      reader never sees a half-written entry). Copies, not links, so rewriting
+      the source run dir later can't change the entry.
+    - `get` hardlinks them into a new run dir (copying across filesystems),
+      except PER_RUN_FILES; the linked files are shared with the cache and must
+      not be edited in place.
+    - Entries older than `max_age_s`, then the least recently used ones past
+      `max_bytes`, are evicted whole.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, max_age_s: Optional[float] = None):
+        self.dir = root / "results"
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+
+    def _entry(self, key: str) -> Path:
+        return self.dir / key
+
+    def _files(self, run_dir: Path) -> List[str]:
+        names = [n for n in RESULT_FILES if (run_dir / n).is_file()]
+        snippets = run_dir / SNIPPETS_DIR
+        if snippets.is_dir():
+            names += sorted(f"{SNIPPETS_DIR}/{p.name}" for p in snippets.iterdir() if p.is_file())
+        return names
+
+    def get(self, key: str, run_dir: Path) -> Optional[Dict[str, Any]]:
+        """
+        Materializes entry `key` into `run_dir` and returns its scorecard,
+        summary and report text (None if it has none), or None on a miss.
+        PER_RUN_FILES are left for the caller to write, since they describe the
+        run that produced them.
+        """
+        entry = self._entry(key)
+        if self.max_age_s is not None:
+            try:
+                if time.time() - entry.stat().st_mtime > self.max_age_s:
+                    return None
+            except OSError:
+                return None
+        try:
+            scorecard = json.loads((entry / "scorecard.json").read_bytes())
+            summary = json.loads((entry / "summary.json").read_bytes())
+            report = (entry / "report.md").read_text(encoding="utf-8") if (entry / "report.md").is_file() else None
+            for name in self._files(entry):
+                if name in PER_RUN_FILES:
+                    continue
+                dst = run_dir / name
+                dst.unlink(missing_ok=True)
+                _link_or_copy(entry / name, dst)
+        except (OSError, ValueError):
+            return None
+        os.utime(entry, None)  # recently used, for eviction
+        return {"scorecard": scorecard, "summary": summary, "report": report}
+
+    def put(self, key: str, run_dir: Path) -> None:
+        entry = self._entry(key)
+        if entry.exists():
+            os.utime(entry, None)
+            return
+        tmp = self.dir / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        try:
+            for name in self._files(run_dir):
+                (tmp / name).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(run_dir / name, tmp / name)
+            tmp.rename(entry)
+        except OSError:
+            # lost a race with another writer of the same key, or the disk is full
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        out = []
+        for entry in self.dir.iterdir() if self.dir.is_dir() else ():
+            if entry.name.startswith("."):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+                size = sum(p.stat().st_size for p in entry.rglob("*") if p.is_file())
+            except OSError:
+                continue
+            out.append((mtime, size, entry))
+        return sorted(out)
+
+    def evict(self) -> int:
+        """Drops expired entries, then least recently used ones until under max_bytes. Returns entries removed."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        removed = 0
+        for mtime, size, entry in entries:
+            expired = self.max_age_s is not None and now - mtime > self.max_age_s
+            if not expired and total <= self.max_bytes:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from dda.ingest.index import FileIndex
+from dda.ingest.walk import glob_matcher
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+METRICS_NAME = "metrics.json"
+PROFILE_MODES = ("cpu", "mem")
+# Extractor input footprints (files/bytes matching each spec's input globs) are
+# skipped above this many indexed files; the glob match is O(files x globs).
+FOOTPRINT_MAX_FILES = 50_000
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water resident set size of this process over its whole lifetime."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux /proc), or None."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def reset_peak_rss() -> bool:
+    """
+    Restarts the kernel's RSS high-water mark (VmHWM) from the current RSS
+    (Linux >= 4.0). False where that isn't possible; ru_maxrss never resets.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def hwm_rss_bytes() -> Optional[int]:
+    """VmHWM: peak RSS since the last reset_peak_rss (or process start)."""
+    try:
+        with open("/proc/self/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _cpu_s() -> float:
+    """CPU seconds of this process plus its reaped children (git runs as a subprocess)."""
+    cpu = time.process_time()
+    if resource is not None:
+        ch = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu += ch.ru_utime + ch.ru_stime
+    return cpu
+
+
+def input_footprint(inputs: Sequence[str], index: FileIndex) -> Optional[Dict[str, int]]:
+    """Files and bytes in `index` matching an extractor's input globs (None when too large to count)."""
+    if not inputs or len(index.files) > FOOTPRINT_MAX_FILES:
+        return None
+    match = glob_matcher(tuple(inputs))
+    files = n_bytes = 0
+    for path, size in zip(index.files.paths(), index.files.sizes):
+        if match(path):
+            files += 1
+            n_bytes += size
+    return {"files": files, "bytes": n_bytes}
+
+
+class RunMetrics:
+    """
+    Per-stage wall time, CPU time, peak-RSS growth and item counts for one run,
+    written to `<run_dir>/metrics.json`.
+
+    Each stage resets the kernel's RSS high-water mark on entry, so its
+    `peak_rss_bytes` is the stage's own peak and `peak_rss_delta_bytes` how
+    far that rose above the RSS it started with; this holds in warm,
+    long-lived workers (dda serve, batch) too. Where the mark can't be reset
+    (not Linux), the delta falls back to growth of the lifetime peak, which
+    is 0 for any stage that stays below an earlier one.
+
+    With `profile` ("cpu" or "mem") each stage also dumps a cProfile stats file
+    (`<stage>.prof`, open with pstats/snakeviz) or a tracemalloc snapshot
+    (`<stage>.tracemalloc`, load with tracemalloc.Snapshot.load) under
+    `profile_dir`.
+    """
+
+    def __init__(self, profile: Optional[str] = None, profile_dir: Optional[Path] = None):
+        if profile is not None and profile not in PROFILE_MODES:
+            raise ValueError(f"profile must be one of {PROFILE_MODES}, got {profile!r}")
+        if profile is not None and profile_dir is None:
+            raise ValueError("profile_dir is required when profiling")
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.stages: List[Dict[str, Any]] = []
+        self.extractors: Dict[str, Dict[str, Any]] = {}
+        self._t0 = time.perf_counter()
+        self._cpu0 = _cpu_s()
+        self._rss0 = rss_bytes()
+        self._lifetime_peak0 = peak_rss_bytes()
+        self._peak = 0  # highest stage peak, when stage peaks are resettable
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Times the block as stage `name`. The yielded dict is stored with the
+        stage, so callers can add counts (`files`, `bytes`, ...) as they go.
+        """
+        counts: Dict[str, Any] = {}
+        prof = None
+        if self.profile == "cpu":
+            prof = cProfile.Profile()
+            prof.enable()
+        elif self.profile == "mem" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        rss0 = rss_bytes()
+        hwm = reset_peak_rss() and rss0 is not None
+        if not hwm:
+            rss0 = peak_rss_bytes()
+        cpu0 = _cpu_s()
+        t0 = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            wall = time.perf_counter() - t0
+            cpu = _cpu_s() - cpu0
+            rss1 = hwm_rss_bytes() if hwm else peak_rss_bytes()
+            if hwm and rss1 is not None:
+                self._peak = max(self._peak, rss1)
+            if prof is not None:
+                prof.disable()
+                self._dump(name, "prof", prof.dump_stats)
+            elif self.profile == "mem":
+                self._dump(name, "tracemalloc", tracemalloc.take_snapshot().dump)
+            self.stages.append({
+                "name": name,
+                "wall_s": round(wall, 4),
+                "cpu_s": round(cpu, 4),
+                "peak_rss_bytes": rss1 if hwm else None,
+                "peak_rss_delta_bytes": max(0, rss1 - rss0) if rss0 is not None and rss1 is not None else None,
+                **counts,
+            })
+
+    def _dump(self, stage: str, ext: str, dump: Any) -> None:
+        assert self.profile_dir is not None
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        dump(str(self.profile_dir / f"{stage}.{ext}"))
+
+    def add_extractor(self, name: str, **fields: Any) -> None:
+        self.extractors[name] = fields
+
+    def to_dict(self) -> Dict[str, Any]:
+        # with resettable peaks, the run's peak is the highest stage peak (not the worker's lifetime peak)
+        rss, rss0 = (self._peak, self._rss0) if self._peak else (peak_rss_bytes(), self._lifetime_peak0)
+        return {
+            "version": 1,
+            "pid": os.getpid(),
+            "profile": self.profile,
+            "total": {
+                "wall_s": round(time.perf_counter() - self._t0, 4),
+                "cpu_s": round(_cpu_s() - self._cpu0, 4),
+                "peak_rss_bytes": rss,
+                "peak_rss_delta_bytes": (
+                    max(0, rss - rss0) if rss is not None and rss0 is not None else None
+                ),
+            },
+            "stages": self.stages,
+            "extractors": self.extractors,
+        }
+
+    def write(self, run_dir: Path) -> Path:
+        if self.profile == "mem" and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        path = run_dir / METRICS_NAME
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        return path
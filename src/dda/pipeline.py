@@ -3,25 +3,31 @@ from __future__ import annotations
 import json
 import shutil
 import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, ContextManager, Optional
 
-from dda.ingest.clone import clone_repo
-from dda.ingest.index import build_file_index
+from dda.incremental import extractors_to_rerun, load_previous_run, write_run_state
+from dda.ingest.budget import write_coverage
+from dda.ingest.cache import IndexCache, index_cache_key, index_config_hash
+from dda.ingest.clone import RepoMeta, clone_repo, fetch_objects, remote_head, sparse_patterns
+from dda.ingest.diff import diff_name_status
+from dda.ingest.index import build_file_index, build_tree_index, patch_index
+from dda.ingest.reader import GitReader, RepoReader
+from dda.memo import ResultCache, detach, result_key
+from dda.metrics import RunMetrics, input_footprint
 from dda.report.render import render_report
+from dda.rundb import RunDB
 from dda.scoring.score import score_repo
-from dda.utils.config import load_config
+from dda.evidence.snippets import SnippetService
+from dda.evidence.store import EvidenceStore
+from dda.utils.config import RootCfg, load_config
 from dda.utils.hashing import short_hash
 from dda.verifier.evidence_gate import evidence_gate
 
 # Extractors (signals)
-from dda.extractors.docs import extract_docs
-from dda.extractors.structure import extract_structure
-from dda.extractors.ci import extract_ci
-from dda.extractors.infra import extract_infra
-from dda.extractors.observability import extract_observability
-from dda.extractors.security_deps import extract_security_deps
-from dda.extractors.performance_smells import extract_performance_smells
+from dda.extractors.registry import default_extractors
+from dda.extractors.scheduler import ExtractorResult, run_extractors
 
 
 def run_analysis(
@@ -30,39 +36,193 @@ def run_analysis(
     focus: Optional[str],
     config_path: Path,
     keep_repo: bool,
+    previous_run: Optional[Path] = None,
+    clone_slot: Optional[ContextManager[Any]] = None,
+    analysis_slot: Optional[ContextManager[Any]] = None,
+    profile: Optional[str] = None,
+    reuse_results: bool = True,
 ) -> dict[str, Any]:
+    """
+    With `previous_run` (an earlier run dir of the same repo), the stored index
+    is patched from `git diff --name-status` and only extractors whose inputs
+    touch changed paths are re-run; the rest carry their evidence forward.
+    Falls back to a full analysis whenever the previous run cannot be reused.
+
+    `clone_slot` / `analysis_slot` are held around the clone and the analysis
+    respectively, so callers running many repos can cap each stage separately.
+
+    Per-stage metrics go to `run_dir/metrics.json`; `profile` ("cpu" or "mem")
+    additionally dumps a profile per stage under `run_dir/profile/`.
+
+    With cache.results on, a run whose remote HEAD, config, extractor versions,
+    rubric and template match an earlier complete run links that run's
+    outputs into `run_dir` instead of cloning (see dda.memo); `reuse_results`
+    False (implied by `profile`, which needs the stages to actually run) skips
+    the lookup but still records the result.
+    """
+    reuse_results = reuse_results and not profile
     cfg = load_config(config_path)
+    metrics = RunMetrics(profile=profile, profile_dir=run_dir / "profile" if profile else None)
+    memo = (
+        ResultCache(cfg.cache.path, cfg.cache.results_max_bytes, cfg.cache.results_max_age_s)
+        if cfg.cache.enabled and cfg.cache.results
+        else None
+    )
 
-    def _present_evidence_ids(evidence_jsonl_path: Path) -> set[str]:
-        ids: set[str] = set()
-        if not evidence_jsonl_path.exists():
-            return ids
-        for line in evidence_jsonl_path.read_text().splitlines():
-            try:
-                obj = json.loads(line)
-                if "id" in obj:
-                    ids.add(obj["id"])
-            except Exception:
-                continue
-        return ids
-
-    # 1) clone
+    # 0) memoized result of the same commit + config + code
+    if memo is not None:
+        detach(run_dir)  # a re-run into this dir must not rewrite files linked from the cache
+    if memo is not None and reuse_results:
+        with metrics.stage("memo") as m:
+            commit = remote_head(repo_url)
+            key = result_key(commit, cfg, focus) if commit else None
+            hit = memo.get(key, run_dir) if key else None
+            m["hit"] = hit is not None
+        if hit is not None:
+            # a new run as far as the run id, timestamp and run DB go; `memoized` names the source
+            scorecard, summary, report = hit["scorecard"], hit["summary"], hit.pop("report")
+            source = summary["memoized"] = {
+                "key": key,
+                "run_id": scorecard["run"]["id"],
+                "generated_at": summary["generated_at"],
+            }
+            summary["generated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            scorecard["run"]["id"] = short_hash(f"{repo_url}:{commit}:{time.time()}")[:12]
+            (run_dir / "scorecard.json").write_text(json.dumps(scorecard, indent=2))
+            (run_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+            if report is not None:
+                # the report header names the run too
+                report = report.replace(source["run_id"], scorecard["run"]["id"])
+                report = report.replace(source["generated_at"], summary["generated_at"])
+                (run_dir / "report.md").write_text(report, encoding="utf-8")
+            if cfg.db.enabled:
+                with RunDB(Path(cfg.db.path).expanduser()) as db:
+                    db.import_run(run_dir)
+            metrics.write(run_dir)
+            return hit
+
+    # 1) clone (or, with ingest.backend "git", just fetch objects: no working tree)
     work_dir = run_dir / "_work"
     work_dir.mkdir(parents=True, exist_ok=True)
     repo_dir = work_dir / "repo"
+    mirror_root = cfg.cache.mirrors if cfg.ingest.mirror else None
+    reader: Optional[GitReader] = None
+
+    try:
+        with clone_slot or nullcontext(), metrics.stage("clone"):
+            if cfg.ingest.backend == "git":
+                repo_meta, repo_dir = fetch_objects(repo_url, dest=work_dir / "repo.git", mirror_root=mirror_root)
+                reader = GitReader(repo_dir, repo_meta.commit)
+            else:
+                repo_meta = clone_repo(
+                    repo_url=repo_url,
+                    dest=repo_dir,
+                    mirror_root=mirror_root,
+                    sparse=(
+                        sparse_patterns(cfg.analysis.include_globs, cfg.analysis.exclude_globs)
+                        if cfg.ingest.sparse
+                        else None
+                    ),
+                )
+        with analysis_slot or nullcontext():
+            result = analyze_checkout(
+                cfg, repo_url, repo_dir, repo_meta, run_dir, focus, previous_run, metrics, reader=reader
+            )
+        # only complete, deterministic runs: failed extractors should be retried, and a
+        # deadline-cut scan depends on timing
+        complete = all(e["status"] in ("ok", "carried") for e in result["summary"]["extractors"].values())
+        if memo is not None and complete and not result["scorecard"].get("coverage", {}).get("deadline_hit"):
+            memo.put(result_key(repo_meta.commit, cfg, focus), run_dir)
+        return result
+    finally:
+        if reader is not None:
+            reader.close()
+        # cleanup
+        if not keep_repo:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
 
-    repo_meta = clone_repo(repo_url=repo_url, dest=repo_dir)
+def analyze_checkout(
+    cfg: RootCfg,
+    repo_url: str,
+    repo_dir: Path,
+    repo_meta: RepoMeta,
+    run_dir: Path,
+    focus: Optional[str],
+    previous_run: Optional[Path] = None,
+    metrics: Optional[RunMetrics] = None,
+    reader: Optional[RepoReader] = None,
+) -> dict[str, Any]:
+    """
+    Steps 2-7 of run_analysis against an existing checkout at `repo_dir`, or,
+    with a GitReader, against the commit's objects in the git dir `repo_dir`.
+    """
+    metrics = metrics or RunMetrics()
     # stable-ish run id if needed
     run_id = short_hash(f"{repo_url}:{repo_meta.commit}:{time.time()}")[:12]
 
-    # 2) index files
-    index = build_file_index(
-        repo_dir=repo_dir,
-        include_globs=cfg.analysis.include_globs,
-        exclude_globs=cfg.analysis.exclude_globs,
-        max_files=cfg.analysis.max_files_scanned,
-        max_bytes=cfg.analysis.max_file_bytes,
-    )
+    # 2) index files (reused across runs of the same commit + index config)
+    with metrics.stage("index") as m:
+        index_cache = IndexCache(cfg.cache.path, cfg.cache.max_bytes) if cfg.cache.enabled else None
+        tree = isinstance(reader, GitReader)
+        backend = "git" if tree else "checkout"
+        index_config = index_config_hash(cfg.analysis, backend)
+        index_key = index_cache_key(repo_meta.commit, cfg.analysis, backend)
+        index = index_cache.get(index_key, repo_dir, reader) if index_cache else None
+
+        # incremental: patch the previous run's index from the commit diff
+        prev = load_previous_run(previous_run, repo_dir) if previous_run else None
+        changes = None
+        if prev is not None and prev.index_config == index_config:
+            changes = diff_name_status(repo_dir, prev.commit, repo_meta.commit)
+        if changes is None or len(prev.index.files) >= cfg.analysis.max_files_scanned:
+            # unreachable base commit, or a truncated index whose tail we never saw
+            prev = None
+        elif index is None and not tree:
+            # (from a tree, a fresh ls-tree index is as cheap as patching one)
+            index = patch_index(
+                prev.index,
+                changes,
+                include_globs=cfg.analysis.include_globs,
+                exclude_globs=cfg.analysis.exclude_globs,
+                max_files=cfg.analysis.max_files_scanned,
+                max_bytes=cfg.analysis.max_file_bytes,
+            )
+            if index is None:
+                prev = None  # a budgeted index over budget is re-selected from a full walk
+            elif index_cache:
+                index_cache.put(index_key, index)
+
+        if index is None and tree:
+            index = build_tree_index(
+                git_dir=repo_dir,
+                commit=repo_meta.commit,
+                include_globs=cfg.analysis.include_globs,
+                exclude_globs=cfg.analysis.exclude_globs,
+                max_files=cfg.analysis.max_files_scanned,
+                max_bytes=cfg.analysis.max_file_bytes,
+                mode=cfg.analysis.scan_mode,
+                budget_bytes=cfg.analysis.scan_budget_bytes,
+                reader=reader,
+            )
+            if index_cache:
+                index_cache.put(index_key, index)
+        elif index is None:
+            index = build_file_index(
+                repo_dir=repo_dir,
+                include_globs=cfg.analysis.include_globs,
+                exclude_globs=cfg.analysis.exclude_globs,
+                max_files=cfg.analysis.max_files_scanned,
+                max_bytes=cfg.analysis.max_file_bytes,
+                mode=cfg.analysis.scan_mode,
+                budget_bytes=cfg.analysis.scan_budget_bytes,
+                deadline_s=cfg.analysis.scan_deadline_s,
+            )
+            # a walk cut short by the deadline depends on timing; don't let it outlive this run
+            if index_cache and not index.coverage.get("deadline_hit"):
+                index_cache.put(index_key, index)
+        m["files"] = len(index.files)
+        m["bytes"] = sum(index.files.sizes)
 
     # create output dirs
     evidence_dir = run_dir / "evidence"
@@ -70,38 +230,87 @@ def run_analysis(
     evidence_dir.mkdir(parents=True, exist_ok=True)
     snippets_dir.mkdir(parents=True, exist_ok=True)
 
-    # 3) extract signals (tool executors)
-    signals: dict[str, Any] = {}
-    signals["docs"] = extract_docs(repo_dir, index, evidence_dir, snippets_dir)
-    signals["structure"] = extract_structure(repo_dir, index, evidence_dir, snippets_dir)
-    signals["ci"] = extract_ci(repo_dir, index, evidence_dir, snippets_dir)
-    signals["infra"] = extract_infra(repo_dir, index, evidence_dir, snippets_dir)
-    signals["observability"] = extract_observability(repo_dir, index, evidence_dir, snippets_dir)
-    signals["security_deps"] = extract_security_deps(repo_dir, index, evidence_dir, snippets_dir)
-    signals["performance_smells"] = extract_performance_smells(repo_dir, index, evidence_dir, snippets_dir)
+    # 3) extract signals (tool executors); independent extractors run concurrently
+    evidence_path = evidence_dir / "evidence.jsonl"
+    specs = default_extractors()
+    rerun = {spec.name for spec in specs}
+    carried: dict[str, ExtractorResult] = {}
+    if prev is not None:
+        rerun = extractors_to_rerun(specs, changes, prev.extractors)
+        for spec in specs:
+            if spec.name not in rerun:
+                st = prev.extractors[spec.name]
+                carried[spec.name] = ExtractorResult(spec.name, spec.version, "carried", st["signals"], st["evidence"])
 
-    present_ids = _present_evidence_ids(evidence_dir / "evidence.jsonl")
+    with metrics.stage("extract") as m:
+        results = run_extractors(
+            specs,
+            repo_dir,
+            index,
+            snippets_dir,
+            workers=cfg.extractors.workers,
+            timeout_s=cfg.extractors.timeout_s,
+            mode=cfg.extractors.mode,
+            carried=carried,
+            cache_dir=cfg.cache.path if cfg.cache.enabled else None,
+            profile_dir=metrics.profile_dir if metrics.profile == "cpu" else None,
+            scan_stats=m,  # files/bytes the shared content scan read
+        )
+        m["rerun"] = len(rerun)
 
-    # 4) scoring (rubric engine)
-    scorecard = score_repo(
-        repo_meta=repo_meta,
-        run_id=run_id,
-        focus=focus,
-        cfg=cfg,
-        index=index,
-        signals=signals,
-        evidence_jsonl_path=evidence_dir / "evidence.jsonl",
-        present_evidence_ids=present_ids,
+        signals: dict[str, Any] = {}
+        extractor_state: dict[str, Any] = {}
+        evidence = EvidenceStore()
+        for name, res in results.items():
+            signals[name] = res.signals
+            evidence.extend(res.evidence)
+            if res.status in ("ok", "carried"):
+                # failed/timed-out extractors are left out so the next incremental run retries them
+                extractor_state[name] = {"version": res.version, "signals": res.signals, "evidence": res.evidence}
 
-    )
+    with metrics.stage("evidence") as m:
+        write_run_state(run_dir, repo_meta.commit, index_config, index, extractor_state)
+        coverage_file = write_coverage(run_dir, index.coverage, index.skipped) if index.coverage else None
+
+        # quote every cited line range (after write_run_state, so carried state stays snippet-free)
+        if cfg.evidence.materialize_snippets:
+            m["snippets"] = SnippetService(
+                repo_dir,
+                snippets_dir,
+                cfg.evidence.snippet_max_chars,
+                cache_dir=cfg.cache.path if cfg.cache.enabled else None,
+                index=index,
+            ).attach(evidence)
+
+        evidence.flush(evidence_path)
+        present_ids = evidence.ids()
+        m["records"] = len(present_ids)
+
+    # 4) scoring (rubric engine)
+    with metrics.stage("score"):
+        scorecard = score_repo(
+            repo_meta=repo_meta,
+            run_id=run_id,
+            focus=focus,
+            cfg=cfg,
+            index=index,
+            signals=signals,
+            evidence_jsonl_path=evidence_path,
+            present_evidence_ids=present_ids,
+        )
 
     # 5) verifier (evidence gate)
-    scorecard = evidence_gate(
-        scorecard=scorecard,
-        evidence_jsonl_path=evidence_dir / "evidence.jsonl",
-        require_evidence=cfg.evidence.require_for_claims,
-        min_conf_if_missing=cfg.evidence.min_confidence_if_no_evidence,
-    )
+    with metrics.stage("gate"):
+        scorecard = evidence_gate(
+            scorecard=scorecard,
+            evidence_jsonl_path=evidence_path,
+            require_evidence=cfg.evidence.require_for_claims,
+            min_conf_if_missing=cfg.evidence.min_confidence_if_no_evidence,
+            evidence=evidence,
+            index=index,
+        )
+        if coverage_file:
+            scorecard["coverage"] = {**scorecard["coverage"], "skipped_list": coverage_file}
 
     # 6) graph + summary (minimal placeholders)
     graph = signals.get("structure", {}).get("graph", {"nodes": [], "edges": []})
@@ -109,40 +318,66 @@ def run_analysis(
         "repo": {"name": repo_meta.name, "url": repo_meta.url, "commit": repo_meta.commit},
         "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
         "focus": focus,
+        "extractors": {
+            name: {"status": r.status, "elapsed_s": r.elapsed_s, **({"error": r.error} if r.error else {})}
+            for name, r in results.items()
+        },
     }
+    if prev is not None:
+        summary["incremental"] = {
+            "base_commit": prev.commit,
+            "changed_paths": len(changes),
+            "rerun": sorted(rerun),
+            "carried_forward": sorted(carried),
+        }
 
     # 7) render report
-    render_report(
-        template_path=Path(cfg.report.template),
-        out_path=run_dir / "report.md",
-        context={
-            "repo": {
-                "name": repo_meta.name,
-                "url": repo_meta.url,
-                "commit": repo_meta.commit,
-                "languages": ", ".join(index.languages) if index.languages else "unknown",
-                "ci_summary": signals.get("ci", {}).get("summary", "unknown"),
-                "deploy_summary": signals.get("infra", {}).get("summary", "unknown"),
-                "observability_summary": signals.get("observability", {}).get("summary", "unknown"),
+    with metrics.stage("render"):
+        render_report(
+            template_path=Path(cfg.report.template),
+            out_path=run_dir / "report.md",
+            context={
+                "repo": {
+                    "name": repo_meta.name,
+                    "url": repo_meta.url,
+                    "commit": repo_meta.commit,
+                    "languages": ", ".join(index.languages) if index.languages else "unknown",
+                    "ci_summary": signals.get("ci", {}).get("summary", "unknown"),
+                    "deploy_summary": signals.get("infra", {}).get("summary", "unknown"),
+                    "observability_summary": signals.get("observability", {}).get("summary", "unknown"),
+                },
+                "run": {"id": run_id, "timestamp": summary["generated_at"]},
+                "summary": {"executive": scorecard.get("overall", {}).get("rationale", "")},
+                "scorecard": scorecard,
+                "architecture": signals.get("structure", {}).get("architecture", {"components": [], "flows": []}),
+                "findings": signals.get("docs", {}).get("findings", {"top": []}),
+                "risks": signals.get("performance_smells", {}).get("risks", []),
+                "quick_wins": signals.get("docs", {}).get("quick_wins", []),
+                "roadmap": signals.get("docs", {}).get("roadmap", []),
             },
-            "run": {"id": run_id, "timestamp": summary["generated_at"]},
-            "summary": {"executive": scorecard.get("overall", {}).get("rationale", "")},
-            "scorecard": scorecard,
-            "architecture": signals.get("structure", {}).get("architecture", {"components": [], "flows": []}),
-            "findings": signals.get("docs", {}).get("findings", {"top": []}),
-            "risks": signals.get("performance_smells", {}).get("risks", []),
-            "quick_wins": signals.get("docs", {}).get("quick_wins", []),
-            "roadmap": signals.get("docs", {}).get("roadmap", []),
-        },
-    )
+            bytecode_cache_dir=cfg.cache.path / "jinja" if cfg.cache.enabled else None,
+        )
 
     # write other artifacts
-    (run_dir / "scorecard.json").write_text(json.dumps(scorecard, indent=2))
-    (run_dir / "graph.json").write_text(json.dumps(graph, indent=2))
-    (run_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+    with metrics.stage("write"):
+        (run_dir / "scorecard.json").write_text(json.dumps(scorecard, indent=2))
+        (run_dir / "graph.json").write_text(json.dumps(graph, indent=2))
+        (run_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+
+        if cfg.db.enabled:
+            with RunDB(Path(cfg.db.path).expanduser()) as db:
+                db.import_run(run_dir)
 
-    # cleanup
-    if not keep_repo:
-        shutil.rmtree(work_dir, ignore_errors=True)
+    by_name = {spec.name: spec for spec in specs}
+    for name, r in results.items():
+        metrics.add_extractor(
+            name,
+            status=r.status,
+            wall_s=r.elapsed_s,
+            cpu_s=r.cpu_s,
+            **(input_footprint(by_name[name].inputs, index) or {}),
+        )
+    metrics.write(run_dir)
 
     return {"scorecard": scorecard, "summary": summary}
+
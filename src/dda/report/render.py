@@ -1,17 +1,63 @@
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
+# One Environment per (template dir, bytecode dir): Jinja keeps compiled templates
+# on the environment, so batch runs compile each template once per process.
+_ENVS: Dict[Tuple[str, Optional[str]], Environment] = {}
+_ENVS_LOCK = threading.Lock()
 
-def render_report(template_path: Path, out_path: Path, context: dict[str, Any]) -> None:
-    env = Environment(
-        loader=FileSystemLoader(str(template_path.parent)),
-        autoescape=select_autoescape(enabled_extensions=()),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
-    tmpl = env.get_template(template_path.name)
-    out_path.write_text(tmpl.render(**context), encoding="utf-8")
+
+def get_environment(template_dir: Path, bytecode_cache_dir: Optional[Path] = None) -> Environment:
+    """
+    Cached Environment for `template_dir`. With `bytecode_cache_dir`, compiled
+    templates are also persisted there, so new processes skip compilation too.
+    Templates are still reloaded when their file changes.
+    """
+    key = (str(template_dir.resolve()), str(bytecode_cache_dir) if bytecode_cache_dir else None)
+    env = _ENVS.get(key)
+    if env is None:
+        with _ENVS_LOCK:
+            env = _ENVS.get(key)
+            if env is None:
+                bcc = None
+                if bytecode_cache_dir is not None:
+                    bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+                    bcc = FileSystemBytecodeCache(str(bytecode_cache_dir))
+                env = _ENVS[key] = Environment(
+                    loader=FileSystemLoader(key[0]),
+                    autoescape=select_autoescape(enabled_extensions=()),
+                    trim_blocks=True,
+                    lstrip_blocks=True,
+                    bytecode_cache=bcc,
+                )
+    return env
+
+
+def render_report(
+    template_path: Path,
+    out_path: Path,
+    context: dict[str, Any],
+    bytecode_cache_dir: Optional[Path] = None,
+) -> None:
+    """
+    Renders `template_path` with `context`, streaming chunks into a sibling
+    temp file that is renamed over `out_path`, so a failed render never
+    leaves a truncated report behind.
+    """
+    tmpl = get_environment(template_path.parent, bytecode_cache_dir).get_template(template_path.name)
+    # a plain open (not mkstemp, whose 0600 would stick) so the report gets the umask's mode like
+    # the other artifacts; the name is unique per process and thread
+    tmp = out_path.with_name(f".{out_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            f.writelines(tmpl.generate(**context))
+        os.replace(tmp, out_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+from dda.evidence.store import EvidenceStore
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_pk INTEGER PRIMARY KEY,
+    run_dir TEXT NOT NULL UNIQUE,
+    run_id TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    repo_url TEXT,
+    commit_sha TEXT,
+    generated_at TEXT,
+    focus TEXT,
+    overall_score REAL,
+    overall_confidence REAL
+);
+CREATE TABLE IF NOT EXISTS evidence (
+    run_pk INTEGER NOT NULL REFERENCES runs(run_pk) ON DELETE CASCADE,
+    evid TEXT NOT NULL,
+    kind TEXT,
+    summary TEXT,
+    PRIMARY KEY (run_pk, evid)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS refs (
+    run_pk INTEGER NOT NULL REFERENCES runs(run_pk) ON DELETE CASCADE,
+    evid TEXT NOT NULL,
+    type TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS category_scores (
+    run_pk INTEGER NOT NULL REFERENCES runs(run_pk) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    score REAL,
+    confidence REAL,
+    PRIMARY KEY (run_pk, category)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS runs_repo ON runs(repo, generated_at);
+CREATE INDEX IF NOT EXISTS runs_repo_key ON runs(coalesce(repo_url, repo), generated_at);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs(commit_sha);
+CREATE INDEX IF NOT EXISTS evidence_evid ON evidence(evid);
+CREATE INDEX IF NOT EXISTS evidence_kind ON evidence(kind);
+CREATE INDEX IF NOT EXISTS refs_run_evid ON refs(run_pk, evid);
+CREATE INDEX IF NOT EXISTS category_scores_category ON category_scores(category, score);
+
+-- most recent run per repo; fleet questions usually mean "as of the latest run".
+-- Repos are told apart by URL: the name is only its basename (a/api vs b/api).
+CREATE VIEW IF NOT EXISTS latest_runs AS
+SELECT * FROM runs r
+WHERE r.run_pk = (
+    SELECT r2.run_pk FROM runs r2 WHERE coalesce(r2.repo_url, r2.repo) = coalesce(r.repo_url, r.repo)
+    ORDER BY r2.generated_at DESC, r2.run_pk DESC LIMIT 1
+);
+"""
+
+# Canned fleet questions for `dda query --preset`; `?` is the preset argument.
+PRESETS = {
+    "missing-evidence": (
+        "SELECT repo, commit_sha, run_dir FROM latest_runs r "
+        "WHERE NOT EXISTS (SELECT 1 FROM evidence e WHERE e.run_pk = r.run_pk AND e.evid = ?) ORDER BY repo"
+    ),
+    "has-evidence": (
+        "SELECT r.repo, r.commit_sha, r.run_dir FROM latest_runs r "
+        "JOIN evidence e ON e.run_pk = r.run_pk AND e.evid = ? ORDER BY r.repo"
+    ),
+    "category": (
+        "SELECT r.repo, c.score, c.confidence, r.run_dir FROM latest_runs r "
+        "JOIN category_scores c ON c.run_pk = r.run_pk AND c.category = ? ORDER BY c.score, r.repo"
+    ),
+}
+
+
+def _read_json(path: Path) -> dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def find_run_dirs(root: Path) -> Iterator[Path]:
+    """Run dirs below `root`, recognised by their scorecard.json."""
+    for p in sorted(root.rglob("scorecard.json")):
+        yield p.parent
+
+
+class RunDB:
+    """
+    SQLite index over finished runs (run metadata, evidence records, refs and
+    category scores). Runs are keyed by their run dir, so re-importing a run
+    replaces its rows. Optional: nothing in the pipeline reads from it.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        # batch workers may finish runs concurrently; wait for the write lock rather than fail
+        self.conn = sqlite3.connect(str(path), timeout=30.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < 2:
+            # version 1 grouped latest_runs by repo name
+            self.conn.execute("DROP VIEW IF EXISTS latest_runs")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "RunDB":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _insert_run(self, run_dir: Path) -> bool:
+        scorecard = _read_json(run_dir / "scorecard.json")
+        if not scorecard:
+            return False
+        summary = _read_json(run_dir / "summary.json")
+        repo = {**scorecard.get("repo", {}), **summary.get("repo", {})}
+        overall = scorecard.get("overall", {})
+        key = str(run_dir.resolve())
+
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM runs WHERE run_dir = ?", (key,))
+        cur.execute(
+            "INSERT INTO runs (run_dir, run_id, repo, repo_url, commit_sha, generated_at, focus, overall_score, overall_confidence)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                str(scorecard.get("run", {}).get("id") or run_dir.name),
+                repo.get("name") or run_dir.parent.name,
+                repo.get("url"),
+                repo.get("commit"),
+                summary.get("generated_at") or scorecard.get("run", {}).get("timestamp"),
+                summary.get("focus"),
+                overall.get("score"),
+                overall.get("confidence"),
+            ),
+        )
+        run_pk = cur.lastrowid
+
+        store = EvidenceStore.load(run_dir / "evidence" / "evidence.jsonl")
+        cur.executemany(
+            "INSERT INTO evidence (run_pk, evid, kind, summary) VALUES (?, ?, ?, ?)",
+            ((run_pk, r["id"], r.get("kind"), r.get("summary")) for r in store),
+        )
+        cur.executemany(
+            "INSERT INTO refs (run_pk, evid, type, ref, note) VALUES (?, ?, ?, ?, ?)",
+            (
+                (run_pk, r["id"], ref.get("type"), ref.get("ref"), ref.get("note"))
+                for r in store
+                for ref in r.get("refs", [])
+            ),
+        )
+        cur.executemany(
+            "INSERT OR REPLACE INTO category_scores (run_pk, category, score, confidence) VALUES (?, ?, ?, ?)",
+            ((run_pk, c.get("id"), c.get("score"), c.get("confidence")) for c in scorecard.get("categories", [])),
+        )
+        return True
+
+    def import_run(self, run_dir: Path) -> bool:
+        """Indexes one finished run dir; False if it has no readable scorecard.json."""
+        with self.conn:
+            return self._insert_run(run_dir)
+
+    def import_runs(self, run_dirs: Iterable[Path]) -> int:
+        """Bulk import in a single transaction. Returns the number of runs indexed."""
+        n = 0
+        with self.conn:
+            for d in run_dirs:
+                n += self._insert_run(d)
+        return n
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> Tuple[List[str], List[tuple]]:
+        cur = self.conn.execute(sql, params)
+        cols = [d[0] for d in cur.description or ()]
+        return cols, cur.fetchall()
+
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
 from typing import List
 
+# Bump whenever scoring or gating rules change, so memoized run results (dda.memo) are recomputed.
+RUBRIC_VERSION = "1"
+
 
 @dataclass(frozen=True)
 class RubricCategory:
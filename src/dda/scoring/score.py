@@ -8,6 +8,7 @@ from dda.ingest.index import FileIndex
 from dda.scoring.rubric import RUBRIC
 
 CATEGORY_IDS = {c.id: c.name for c in RUBRIC}
+PERF_RISK_PENALTY = {"high": 1.0, "medium": 0.5, "low": 0.25}
 
 
 def score_repo(
@@ -33,7 +34,7 @@ def score_repo(
     obs_summary = signals.get("observability", {}).get("summary", "")
     deps = signals.get("security_deps", {}).get("deps", [])
 
-    fileset = {e.path for e in index.files}
+    fileset = index.paths
 
     def clamp(x: float) -> float:
         return max(0.0, min(5.0, x))
@@ -140,18 +141,37 @@ def score_repo(
         )
     )
 
-    # Performance (placeholder)
-    perf = 2.5
-    categories.append(
-        _cat(
-            "performance",
-            clamp(perf),
-            0.4,
-            "v1: not deeply analyzed yet",
-            [],
-            present_evidence_ids,
+    # Performance: start from "nothing obvious found" and deduct per detected risk,
+    # unless none of the indexed files is one the detectors look at (e.g. Java, Rust)
+    perf_signals = signals.get("performance_smells", {})
+    risks = perf_signals.get("risks", [])
+    if not perf_signals.get("files_scanned"):
+        categories.append(
+            _cat(
+                "performance",
+                2.5,
+                0.35,
+                "Not assessed: no indexed files the static perf detectors cover (Go, Python, shell, Dockerfiles)",
+                [],
+                present_evidence_ids,
+            )
+        )
+    else:
+        perf = 4.0 - sum(PERF_RISK_PENALTY.get(r.get("severity"), 0.25) for r in risks)
+        categories.append(
+            _cat(
+                "performance",
+                max(1.0, clamp(perf)),
+                0.55 if risks else 0.45,
+                (
+                    f"{len(risks)} perf risk(s) from static detectors: " + ", ".join(r["title"] for r in risks)
+                    if risks
+                    else "No obvious perf risks from static detectors (timeouts, unbounded buffers, blocking calls)"
+                ),
+                [eid for r in risks for eid in r["evidence_list"]],
+                present_evidence_ids,
+            )
         )
-    )
 
     # Deployment maturity
     dep = 3.0 + (1.5 if infra_summary else 0.0)
@@ -196,6 +216,7 @@ def score_repo(
         "run": {"id": run_id, "timestamp": ""},
         "overall": overall,
         "categories": categories,
+        **({"coverage": index.coverage} if index.coverage else {}),
     }
 
 
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import re
+import socketserver
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dda.utils.text import repo_slug
+
+# Finished jobs kept for GET /jobs/<id>; their run dirs stay on disk regardless.
+MAX_HISTORY = 1000
+_DONE = ("ok", "failed", "cancelled")
+_JOB_PATH_RE = re.compile(r"^/jobs/(?P<id>[0-9a-f]{12})(?P<sub>/scorecard|/metrics)?$")
+
+log = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    pass
+
+
+def _warm(config_path: Path) -> None:
+    """Pool initializer: pay imports, config parsing, glob compilation and template compilation once per worker."""
+    from dda.pipeline import run_analysis  # noqa: F401
+    from dda.ingest.walk import glob_spec
+    from dda.report.render import get_environment
+    from dda.utils.config import load_config
+
+    try:
+        cfg = load_config(config_path)
+        glob_spec(tuple(cfg.analysis.include_globs))
+        glob_spec(tuple(cfg.analysis.exclude_globs))
+        template = Path(cfg.report.template)
+        env = get_environment(template.parent, cfg.cache.path / "jinja" if cfg.cache.enabled else None)
+        env.get_template(template.name)
+    except Exception:
+        # best effort: a broken config or template is reported by each job instead
+        log.warning("dda serve: warm-up failed for %s", config_path, exc_info=True)
+
+
+def _run_job(
+    repo: str,
+    run_dir: Path,
+    focus: Optional[str],
+    config_path: Path,
+    keep_repo: bool,
+    previous_run: Optional[Path],
+) -> dict[str, Any]:
+    from dda.pipeline import run_analysis
+
+    result = run_analysis(
+        repo_url=repo,
+        run_dir=run_dir,
+        focus=focus,
+        config_path=config_path,
+        keep_repo=keep_repo,
+        previous_run=previous_run,
+    )
+    return {"commit": result["summary"]["repo"]["commit"], "overall": result["scorecard"]["overall"]}
+
+
+class JobQueue:
+    """
+    Bounded FIFO of analysis jobs run on long-lived worker processes.
+
+    - At most `max_queue` jobs wait; `submit` raises QueueFull beyond that, so
+      callers get back-pressure instead of an unbounded backlog.
+    - `workers` dispatcher threads each keep one job in flight on their own
+      single-process pool, so a job is `running` exactly while a worker
+      process has it.
+    - Workers are warmed by `_warm` and reused across jobs, so imports, the
+      parsed config, compiled globs and templates survive from job to job.
+    - A worker that dies (OOM kill, crash in a parser) fails only the job it
+      was running; its dispatcher starts a fresh worker for the next one.
+    """
+
+    def __init__(
+        self,
+        out_root: Path,
+        config_path: Path,
+        workers: Optional[int] = None,
+        max_queue: int = 64,
+        keep_repo: bool = False,
+    ):
+        self.out_root = out_root
+        self.config_path = config_path.resolve()
+        self.workers = workers or os.cpu_count() or 1
+        self.keep_repo = keep_repo
+        self._pending: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max(1, max_queue))
+        self._jobs: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pools = [self._new_pool() for _ in range(self.workers)]
+        self._threads = [
+            threading.Thread(target=self._dispatch, args=(i,), name=f"dda-serve-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, initializer=_warm, initargs=(self.config_path,))
+
+    def submit(
+        self,
+        repo: str,
+        focus: Optional[str] = None,
+        since_run: Optional[str] = None,
+    ) -> dict[str, Any]:
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "repo": repo,
+            "focus": focus,
+            "since_run": since_run,
+            "status": "queued",
+            "run_dir": (self.out_root / repo_slug(repo) / job_id).as_posix(),
+            "submitted_at": time.time(),
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            try:
+                self._pending.put_nowait(job_id)
+            except queue.Full:
+                del self._jobs[job_id]
+                raise QueueFull(f"{self._pending.maxsize} jobs already queued")
+            self._trim()
+        return dict(job)
+
+    def _trim(self) -> None:
+        finished = [j for j, v in self._jobs.items() if v["status"] in _DONE]
+        for j in finished[: max(0, len(self._jobs) - MAX_HISTORY)]:
+            del self._jobs[j]
+
+    def _dispatch(self, slot: int) -> None:
+        while True:
+            job_id = self._pending.get()
+            if job_id is None:
+                return
+            with self._lock:
+                job = self._jobs[job_id]
+                job["status"] = "running"
+                job["started_at"] = time.time()
+            run_dir = Path(job["run_dir"])
+            run_dir.mkdir(parents=True, exist_ok=True)
+            update: dict[str, Any]
+            try:
+                fut = self._pools[slot].submit(
+                    _run_job,
+                    job["repo"],
+                    run_dir,
+                    job["focus"],
+                    self.config_path,
+                    self.keep_repo,
+                    Path(job["since_run"]) if job["since_run"] else None,
+                )
+                update = {"status": "ok", **fut.result()}
+            except BrokenProcessPool as exc:
+                # the worker died mid-job; the pool can't be reused, so replace it
+                self._pools[slot].shutdown(wait=False)
+                self._pools[slot] = self._new_pool()
+                update = {
+                    "status": "failed",
+                    "error": f"worker process died: {exc}",
+                    "traceback": traceback.format_exc(limit=5),
+                }
+            except Exception as exc:
+                update = {
+                    "status": "failed",
+                    "error": f"{type(exc).__name__}: {exc}",
+                    "traceback": traceback.format_exc(limit=5),
+                }
+            with self._lock:
+                job.update(update, finished_at=time.time())
+                job["elapsed_s"] = round(job["finished_at"] - job["started_at"], 3)
+
+    def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def jobs(self) -> List[dict[str, Any]]:
+        with self._lock:
+            return [dict(j) for j in self._jobs.values()]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            by_status: Dict[str, int] = {}
+            for j in self._jobs.values():
+                by_status[j["status"]] = by_status.get(j["status"], 0) + 1
+        return {"workers": self.workers, "max_queue": self._pending.maxsize, **by_status}
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll_s: float = 0.05) -> Optional[dict[str, Any]]:
+        """Blocks until `job_id` finishes (or `timeout`); returns its last known state."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in _DONE:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(poll_s)
+
+    def close(self) -> None:
+        """Lets running jobs finish, cancels queued ones, and stops the pool."""
+        with self._lock:
+            while True:
+                try:
+                    job_id = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if job_id is not None:
+                    self._jobs[job_id]["status"] = "cancelled"
+        for _ in self._threads:
+            self._pending.put(None)
+        for t in self._threads:
+            t.join()
+        for pool in self._pools:
+            pool.shutdown(wait=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    POST /jobs              {"repo": ..., "focus"?: ..., "since_run"?: ...} -> 202 job | 429 queue full
+    GET  /jobs              all known jobs
+    GET  /jobs/<id>         one job (status: queued | running | ok | failed | cancelled)
+    GET  /jobs/<id>/scorecard, /jobs/<id>/metrics   artifacts of a finished job
+    GET  /health            worker / queue counts
+    """
+
+    server_version = "dda-serve/1"
+    jobs: JobQueue  # set on the subclass built by make_server
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+    def _send(self, code: int, body: Any) -> None:
+        data = json.dumps(body, indent=2).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            return self._send(200, {"status": "ok", **self.jobs.stats()})
+        if self.path == "/jobs":
+            return self._send(200, self.jobs.jobs())
+        m = _JOB_PATH_RE.match(self.path)
+        job = self.jobs.get(m.group("id")) if m else None
+        if job is None:
+            return self._send(404, {"error": "not found"})
+        if not m.group("sub"):
+            return self._send(200, job)
+        if job["status"] != "ok":
+            return self._send(409, {"error": f"job is {job['status']}"})
+        path = Path(job["run_dir"]) / f"{m.group('sub')[1:]}.json"
+        try:
+            return self._send(200, json.loads(path.read_text()))
+        except (OSError, ValueError):
+            return self._send(404, {"error": f"{path.name} not found"})
+
+    def do_POST(self) -> None:
+        if self.path != "/jobs":
+            return self._send(404, {"error": "not found"})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        except ValueError:
+            return self._send(400, {"error": "body must be JSON"})
+        if not isinstance(body, dict) or not isinstance(body.get("repo"), str) or not body["repo"]:
+            return self._send(400, {"error": "`repo` (URL or local path) is required"})
+        try:
+            job = self.jobs.submit(body["repo"], focus=body.get("focus"), since_run=body.get("since_run"))
+        except QueueFull as exc:
+            return self._send(429, {"error": str(exc)})
+        self._send(202, job)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(
+    jobs: JobQueue,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[Path] = None,
+    quiet: bool = False,
+) -> socketserver.BaseServer:
+    """HTTP server over `jobs`, on host:port or, with `socket_path`, a Unix socket."""
+    handler = type("Handler", (_Handler,), {"jobs": jobs})
+    if socket_path is not None:
+        if socket_path.exists():
+            socket_path.unlink()  # stale socket from an earlier run
+        server: socketserver.BaseServer = _UnixHTTPServer(str(socket_path), handler)
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+    server.quiet = quiet  # type: ignore[attr-defined]
+    return server
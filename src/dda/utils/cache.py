@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a sibling temp file + rename so readers never see a partial entry."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def touch(path: Path) -> None:
+    """Bump mtime so size-based eviction treats the entry as recently used."""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def evict_to_size(root: Path, max_bytes: int, pattern: str = "*") -> int:
+    """
+    Deletes the least recently used files matching `pattern` under `root`
+    until their total size is at most `max_bytes`. Returns bytes freed.
+    """
+    if not root.exists():
+        return 0
+    entries = []
+    total = 0
+    for p in root.rglob(pattern):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if not p.is_file():
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+        total += st.st_size
+
+    freed = 0
+    for _, size, p in sorted(entries, key=lambda e: e[0]):
+        if total - freed <= max_bytes:
+            break
+        try:
+            p.unlink()
+        except OSError:
+            continue
+        freed += size
+    return freed
+
+
+class ShardedJsonCache:
+    """
+    Small values keyed by a hex digest, sharded by its first two characters
+    into `<dir>/<xx>.json`. Shards are loaded on demand and written back
+    atomically on flush(), then everything under `evict_root` (default `dir`)
+    is trimmed to `max_bytes`. Concurrent writers may drop each other's new
+    entries, which only costs recomputing them.
+    """
+
+    def __init__(self, dir: Path, max_bytes: int, evict_root: Optional[Path] = None):
+        self.dir = dir
+        self.max_bytes = max_bytes
+        self.evict_root = evict_root or dir
+        self._shards: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+
+    def _shard(self, key: str) -> Dict[str, Any]:
+        name = key[:2]
+        shard = self._shards.get(name)
+        if shard is None:
+            try:
+                shard = json.loads((self.dir / f"{name}.json").read_bytes())
+            except (OSError, ValueError):
+                shard = {}
+            self._shards[name] = shard
+        return shard
+
+    def get(self, key: str) -> Any:
+        return self._shard(key).get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        self._shard(key)[key] = value
+        self._dirty.add(key[:2])
+
+    def flush(self) -> None:
+        for name in sorted(self._dirty):
+            data = json.dumps(self._shards[name], separators=(",", ":")).encode("utf-8")
+            atomic_write_bytes(self.dir / f"{name}.json", data)
+        if self._dirty:
+            evict_to_size(self.evict_root, self.max_bytes, "*.json")
+        self._dirty.clear()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Literal, Optional, Tuple
 
 import yaml
 from pydantic import BaseModel
@@ -12,12 +13,20 @@ class AnalysisCfg(BaseModel):
     max_file_bytes: int = 750_000
     include_globs: List[str]
     exclude_globs: List[str]
+    # first_n: first max_files_scanned paths in path order
+    # budgeted: spread max_files_scanned / scan_budget_bytes over file kinds and components
+    scan_mode: Literal["first_n", "budgeted"] = "first_n"
+    scan_budget_bytes: Optional[int] = None
+    # budgeted mode: stop walking after this long; unreached dirs are reported as skipped
+    scan_deadline_s: Optional[float] = None
 
 
 class EvidenceCfg(BaseModel):
     require_for_claims: bool = True
     min_confidence_if_no_evidence: float = 0.35
     snippet_max_chars: int = 1800
+    # write a quoted snippet for every file_lines ref (content-addressed, see dda.evidence.snippets)
+    materialize_snippets: bool = True
 
 
 class ReportCfg(BaseModel):
@@ -27,13 +36,77 @@ class ReportCfg(BaseModel):
     include_risks: int = 7
 
 
+class CacheCfg(BaseModel):
+    # opt-in: nothing is written under `dir` (and the memo never calls the remote) unless enabled
+    enabled: bool = False
+    dir: str = "~/.cache/dda"
+    max_bytes: int = 512 * 1024 * 1024
+    # whole-run memo (see dda.memo): an unchanged commit + config + code reuses an earlier run's outputs
+    results: bool = True
+    results_max_bytes: int = 1024 * 1024 * 1024
+    results_max_age_s: Optional[float] = 7 * 24 * 3600
+
+    @property
+    def path(self) -> Path:
+        return Path(self.dir).expanduser()
+
+    @property
+    def mirrors(self) -> Path:
+        return self.path / "mirrors"
+
+
+class IngestCfg(BaseModel):
+    # keep a bare mirror per repo under <cache.dir>/mirrors and clone locally from it
+    mirror: bool = False
+    # blobless clone + sparse checkout limited to analysis include/exclude globs
+    sparse: bool = False
+    # checkout: clone a working tree and read files from disk
+    # git: no working tree; index from `git ls-tree`, read blobs via `git cat-file --batch`
+    #      (from the mirror itself with `mirror`, else a shallow bare clone; `sparse` is ignored)
+    backend: Literal["checkout", "git"] = "checkout"
+
+
+class ExtractorsCfg(BaseModel):
+    workers: int = 4
+    timeout_s: Optional[float] = 300.0
+    mode: Literal["thread", "process"] = "thread"
+
+
+class DbCfg(BaseModel):
+    # index every finished run into a SQLite run store (see `dda query`)
+    enabled: bool = False
+    path: str = "./out/dda.sqlite"
+
+
 class RootCfg(BaseModel):
     version: int = 1
     analysis: AnalysisCfg
     evidence: EvidenceCfg
     report: ReportCfg
+    cache: CacheCfg = CacheCfg()
+    ingest: IngestCfg = IngestCfg()
+    extractors: ExtractorsCfg = ExtractorsCfg()
+    db: DbCfg = DbCfg()
+
+
+_LOADED: Dict[Tuple[str, int, int], RootCfg] = {}
+_LOADED_LOCK = threading.Lock()
 
 
 def load_config(path: Path) -> RootCfg:
-    data = yaml.safe_load(path.read_text())
-    return RootCfg(**data)
+    """
+    Parses and validates `path`, memoized on (path, mtime, size) so a
+    long-lived process (`dda serve`, batch workers) pays for it once per edit.
+    Returns a private deep copy; callers may mutate it.
+    """
+    st = path.stat()
+    key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    with _LOADED_LOCK:
+        cfg = _LOADED.get(key)
+    if cfg is None:
+        cfg = RootCfg(**yaml.safe_load(path.read_text()))
+        with _LOADED_LOCK:
+            for stale in [k for k in _LOADED if k[0] == key[0]]:
+                del _LOADED[stale]
+            _LOADED[key] = cfg
+    return cfg.model_copy(deep=True)
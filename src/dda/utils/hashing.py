@@ -5,3 +5,8 @@ import hashlib
 
 def short_hash(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+
+def blob_sha(data: bytes) -> str:
+    """Same id git gives the file's contents, so git's index can stand in for hashing."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
@@ -7,3 +7,8 @@ def slugify(s: str) -> str:
     s = s.strip().lower()
     s = re.sub(r"[^a-z0-9]+", "-", s)
     return s.strip("-")
+
+
+def repo_slug(repo_url: str) -> str:
+    """Output directory name for a repo URL or local path."""
+    return slugify(repo_url.rstrip("/").split("/")[-1])
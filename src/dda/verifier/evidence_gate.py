@@ -1,8 +1,41 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, List, Optional
+
+from dda.evidence.snippets import parse_file_lines_ref
+from dda.evidence.store import EvidenceStore
+from dda.ingest.index import FileIndex
+
+
+def file_lines_ok(ref: str, index: FileIndex) -> bool:
+    """
+    True if `path:Lx-Ly` names an indexed file with at least `y` lines, or
+    `dir/:Lx-Ly` a directory with indexed files. An empty file may still be
+    cited as L1-L1.
+    """
+    parsed = parse_file_lines_ref(ref)
+    if parsed is None:
+        return False
+    path, start, end = parsed
+    if path.endswith("/"):
+        return index.is_dir(path)
+    n = index.line_count(path)
+    return n is not None and 1 <= start <= end <= max(n, 1)
+
+
+def broken_file_lines(evidence: EvidenceStore, index: FileIndex) -> Dict[str, List[str]]:
+    """evidence id -> its file_lines refs that don't resolve against `index`."""
+    out: Dict[str, List[str]] = {}
+    for rec in evidence:
+        bad = [
+            r["ref"]
+            for r in rec.get("refs", [])
+            if r.get("type") == "file_lines" and not file_lines_ok(r.get("ref", ""), index)
+        ]
+        if bad:
+            out[rec["id"]] = bad
+    return out
 
 
 def evidence_gate(
@@ -10,23 +43,23 @@ def evidence_gate(
     evidence_jsonl_path: Path,
     require_evidence: bool,
     min_conf_if_missing: float,
+    evidence: Optional[EvidenceStore] = None,
+    index: Optional[FileIndex] = None,
 ) -> dict[str, Any]:
     """
-    Ensures referenced evidence IDs exist in evidence.jsonl.
-    If missing, marks category as lower confidence; and overall confidence lowered.
+    Ensures referenced evidence IDs exist in evidence.jsonl (or in `evidence`,
+    the run's in-memory store, when given; the file is then not re-read).
+    With `index`, the file_lines refs of cited evidence must also resolve to
+    real files/line ranges (line counts are computed once per file).
+    If missing or broken, marks category as lower confidence; and overall confidence lowered.
     """
     if not require_evidence:
         return scorecard
 
-    present_ids = set()
-    if evidence_jsonl_path.exists():
-        for line in evidence_jsonl_path.read_text().splitlines():
-            try:
-                obj = json.loads(line)
-                if "id" in obj:
-                    present_ids.add(obj["id"])
-            except Exception:
-                continue
+    if evidence is None:
+        evidence = EvidenceStore.load(evidence_jsonl_path)
+    present_ids = evidence.ids()
+    broken = broken_file_lines(evidence, index) if index is not None else {}
 
     # walk categories
     for cat in scorecard.get("categories", []):
@@ -37,6 +70,8 @@ def evidence_gate(
             ref = e.get("ref")
             if ref and ref not in present_ids:
                 missing.append(ref)
+            elif ref in broken:
+                missing.extend(broken[ref])
 
         if missing:
             cat["notes"] = (cat.get("notes", "") + f" | Unverified refs: {missing}").strip()
@@ -0,0 +1,38 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+FIXTURES = Path(__file__).parent / "fixtures"
+TEMPLATES = Path(__file__).parents[1] / "templates"
+
+
+def git(repo: Path, *args: str) -> None:
+    subprocess.check_call(
+        ["git", "-C", str(repo), "-c", "user.email=t@t", "-c", "user.name=t", *args],
+        stdout=subprocess.DEVNULL,
+    )
+
+
+@pytest.fixture
+def tiny_git_repo(tmp_path) -> Path:
+    """tests/fixtures/tiny_repo committed into a fresh git repo."""
+    src = tmp_path / "tiny"
+    shutil.copytree(FIXTURES / "tiny_repo", src)
+    git(src, "init", "-q")
+    git(src, "add", "-A")
+    git(src, "commit", "-qm", "init")
+    return src
+
+
+@pytest.fixture
+def config_path(tmp_path) -> Path:
+    """templates/config.yaml with the cache enabled under tmp_path and an absolute template path."""
+    text = (TEMPLATES / "config.yaml").read_text()
+    text = text.replace("cache:\n", "cache:\n  enabled: true\n", 1).replace("  enabled: false\n  dir:", "  dir:")
+    text = text.replace('dir: "~/.cache/dda"', f'dir: "{tmp_path / "cache"}"')
+    text = text.replace('template: "templates/report.md.tmpl"', f'template: "{TEMPLATES / "report.md.tmpl"}"')
+    cfg = tmp_path / "config.yaml"
+    cfg.write_text(text)
+    return cfg
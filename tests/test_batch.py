@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+from dda.batch import read_repo_list, run_batch, run_batch_pipelined
+from dda.ingest.prefetch import DiskBudget
+
+
+def test_read_repo_list_skips_comments(tmp_path):
+    f = tmp_path / "repos.txt"
+    f.write_text("# fleet\nhttps://github.com/a/b\n\n/src/c  # local\n")
+    assert read_repo_list(f) == ["https://github.com/a/b", "/src/c"]
+
+
+def test_batch_isolates_failures(tmp_path, tiny_git_repo, config_path):
+    out = tmp_path / "out"
+    manifest = run_batch([str(tiny_git_repo), str(tmp_path / "missing")], out, config_path, "b1", workers=2, max_clones=1)
+
+    assert manifest["counts"] == {"total": 2, "ok": 1, "failed": 1}
+    ok, failed = manifest["repos"]
+    assert ok["status"] == "ok" and "clone_wait_s" in ok["timings"]
+    assert failed["status"] == "failed" and failed["error"]
+    assert (out / "tiny" / "b1" / "scorecard.json").exists()
+    assert json.loads((out / "batch-b1" / "manifest.json").read_text())["batch_id"] == "b1"
+
+
+def test_pipelined_batch_overlaps_clone_and_analysis(tmp_path, tiny_git_repo, config_path):
+    out = tmp_path / "out"
+    repos = [str(tiny_git_repo), str(tmp_path / "missing"), str(tiny_git_repo)]
+    manifest = run_batch_pipelined(repos, out, config_path, "p1", prefetch=2, max_analyses=1, disk_budget_bytes=1)
+
+    assert manifest["counts"] == {"total": 3, "ok": 2, "failed": 1}
+    first, failed, second = manifest["repos"]
+    assert first["status"] == "ok" and first["disk_bytes"] > 0 and "analysis_s" in first["timings"]
+    assert failed["status"] == "failed" and "GitError" in failed["error"]
+    assert second["commit"] == first["commit"]
+    # checkouts are removed once analyzed
+    assert not (out / "tiny" / "p1" / "_work").exists()
+    assert (out / "tiny-2" / "p1" / "scorecard.json").exists()
+
+
+def test_disk_budget_holds_clones_until_space_is_released():
+    async def scenario():
+        budget = DiskBudget(100)
+        first = await budget.acquire()  # nothing held: always admitted
+        await budget.settle(first, 80)
+        waiter = asyncio.create_task(budget.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()  # 80 used + 80 estimated > 100
+        await budget.release(80)
+        assert await asyncio.wait_for(waiter, 1) == 80
+
+    asyncio.run(scenario())
@@ -0,0 +1,33 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import bench_stages  # noqa: E402
+from synth import make_synthetic_repo  # noqa: E402
+
+
+def test_synthetic_repo_has_exactly_n_files_and_valid_json(tmp_path):
+    root = make_synthetic_repo(tmp_path / "repo", 1000, mix={"config": 30})
+    files = [p for p in root.rglob("*") if p.is_file()]
+    assert len(files) == 1000
+    configs = [p for p in files if p.suffix == ".json"]
+    assert configs and all(json.loads(p.read_text())["k"] == 1 for p in configs)
+
+
+def test_compare_flags_only_real_regressions():
+    def doc(stages):
+        return {"results": {"1000": {"stages": stages}}}
+
+    baseline = doc({"index": 1.0, "render_report": 1.0, "tiny": 0.001, "gone": 1.0})
+    current = doc({"index": 1.3, "render_report": 1.3, "tiny": 0.005, "new": 1.0})
+    default, per_stage = bench_stages._parse_thresholds(["0.2", "render_report=0.5"])
+    assert (default, per_stage) == (0.2, {"render_report": 0.5})
+
+    rows = {r["stage"]: r for r in bench_stages.compare(current, baseline, default, per_stage, min_delta=0.01)}
+    assert set(rows) == {"index", "render_report", "tiny"}  # only stages in both
+    assert rows["index"]["regressed"] and rows["index"]["ratio"] == 1.3
+    assert not rows["render_report"]["regressed"]  # within its own threshold
+    assert not rows["tiny"]["regressed"]  # 5x slower, but under min_delta
+    assert bench_stages._parse_thresholds([]) == (0.25, {})
@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Modules only the analysis commands need; `validate` / `--help` must not pay for them.
+HEAVY = ("dda.pipeline", "dda.extractors", "jinja2", "pydantic", "yaml", "pathspec")
+# Cumulative `import dda.cli` time, in microseconds. Measured ~95ms (typer + rich);
+# the budget leaves headroom for slow CI machines but fails if the pipeline creeps back in (~400ms).
+IMPORT_BUDGET_US = 250_000
+
+
+def _importtime(code: str) -> dict:
+    """module -> cumulative import time (us) from `python -X importtime`."""
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    out = {}
+    for line in res.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = (p.strip() for p in line[len("import time:"):].split("|"))
+            if cumulative.isdigit():
+                out[name] = int(cumulative)
+    return out
+
+
+def test_validate_startup_skips_heavy_imports(tmp_path):
+    scorecard = tmp_path / "scorecard.json"
+    scorecard.write_text(json.dumps({"version": 1, "repo": {}, "run": {}, "overall": {}, "categories": []}))
+
+    loaded = _importtime(f"from dda.cli import app; app(['validate', {str(scorecard)!r}])")
+    assert "dda.cli" in loaded
+    assert [m for m in loaded if m.startswith(HEAVY)] == []
+
+
+# Wall-clock budgets flake on loaded CI machines and under coverage; the heavy-import
+# check above catches the regression this guards against, so timing is opt-in.
+@pytest.mark.skipif(not os.environ.get("DDA_TIMING_TESTS"), reason="set DDA_TIMING_TESTS=1 to check import time")
+def test_cli_import_time_budget():
+    # best of three, so one noisy run doesn't fail the suite
+    best = min(_importtime("import dda.cli")["dda.cli"] for _ in range(3))
+    assert best < IMPORT_BUDGET_US, f"import dda.cli took {best}us (budget {IMPORT_BUDGET_US}us)"
@@ -0,0 +1,36 @@
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import git
+from dda.ingest.clone import clone_repo, mirror_path
+
+
+def _head(repo):
+    return subprocess.check_output(["git", "-C", str(repo), "rev-parse", "HEAD"]).decode().strip()
+
+
+def test_mirror_is_reused_and_refreshed(tmp_path, tiny_git_repo):
+    url = f"file://{tiny_git_repo}"
+    mirrors = tmp_path / "mirrors"
+
+    meta = clone_repo(url, tmp_path / "w1", mirror_root=mirrors)
+    assert meta.commit == _head(tiny_git_repo)
+    assert (mirror_path(mirrors, url) / "HEAD").exists()
+
+    (tiny_git_repo / "SECURITY.md").write_text("# Security\n")
+    git(tiny_git_repo, "add", "-A")
+    git(tiny_git_repo, "commit", "-qm", "next")
+
+    meta2 = clone_repo(url, tmp_path / "w1", mirror_root=mirrors)
+    assert meta2.commit == _head(tiny_git_repo) != meta.commit
+    assert (tmp_path / "w1" / "SECURITY.md").exists()
+    assert [p.name for p in mirrors.iterdir() if p.suffix == ".git"] == [mirror_path(mirrors, url).name]
+
+
+def test_parallel_clones_share_one_mirror(tmp_path, tiny_git_repo):
+    url = f"file://{tiny_git_repo}"
+    mirrors = tmp_path / "mirrors"
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        metas = list(pool.map(lambda i: clone_repo(url, tmp_path / f"w{i}", mirror_root=mirrors), range(4)))
+    assert {m.commit for m in metas} == {_head(tiny_git_repo)}
+    subprocess.check_call(["git", "-C", str(mirror_path(mirrors, url)), "fsck", "--no-progress"])
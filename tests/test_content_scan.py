@@ -0,0 +1,78 @@
+from dda.evidence.store import EvidenceStore
+from dda.extractors import content_scan, performance_smells
+from dda.extractors.content_scan import ScanPattern, scan_contents
+from dda.ingest.index import FileEntry, FileIndex
+
+GO = b"""package main
+
+func fetch() {
+\tresp, _ := http.Get(url)
+\tbody, _ := io.ReadAll(resp.Body)
+\tc := &http.Client{
+\t}
+\t_ = http.Get(other); _ = io.ReadAll(r)
+}
+"""
+
+PATTERNS = [
+    ScanPattern("get", r"\bhttp\.Get\(", literals=("http.Get",), globs=("*.go",)),
+    ScanPattern("readall", r"\bio\.ReadAll\(", literals=("ReadAll",), globs=("*.go",)),
+    ScanPattern("client", r"\bhttp\.Client\{\s*\}", literals=("http.Client{",)),
+    ScanPattern("never", r"unreachable", literals=("zzz-not-present",)),
+]
+
+
+def _index(tmp_path, files):
+    for rel, data in files.items():
+        (tmp_path / rel).write_bytes(data)
+    return FileIndex(root=tmp_path, files=[FileEntry(p, len(d)) for p, d in sorted(files.items())], languages=[])
+
+
+def _lines(hits):
+    return [(h.path, h.start_line, h.end_line) for h in hits]
+
+
+def test_single_pass_reports_every_pattern_with_line_ranges(tmp_path, monkeypatch):
+    index = _index(tmp_path, {"main.go": GO, "notes.md": b"http.Get( is fine in docs\n"})
+    hits = scan_contents(index, PATTERNS)
+
+    assert _lines(hits["get"]) == [("main.go", 4, 4), ("main.go", 8, 8)]
+    assert _lines(hits["readall"]) == [("main.go", 5, 5), ("main.go", 8, 8)]
+    assert _lines(hits["client"]) == [("main.go", 6, 7)]
+    assert hits["never"] == []
+    assert hits["client"][0].ref == "main.go:L6-L7"
+
+    # mmap'd reads and the process pool give identical results
+    monkeypatch.setattr(content_scan, "MMAP_THRESHOLD", 1)
+    monkeypatch.setattr(content_scan, "MIN_FILES_PER_WORKER", 1)
+    assert scan_contents(index, PATTERNS, workers=2) == hits
+
+
+def test_perf_risks_cite_evidence_like_other_findings(tmp_path):
+    index = _index(tmp_path, {"main.go": GO})
+    evidence = EvidenceStore()
+    out = performance_smells.extract_performance_smells(
+        tmp_path, index, evidence, tmp_path / "snippets", scan=scan_contents(index, performance_smells.PATTERNS)
+    )
+    assert [r["id"] for r in out["risks"]] == ["go-default-http-client", "go-http-client-no-timeout", "go-unbounded-readall"]
+    assert out["files_scanned"] == 1
+    for r in out["risks"]:
+        assert isinstance(r["confidence"], float)
+        assert r["evidence_list"] == [f"EVID-PERF-{r['id'].upper()}"] and r["evidence_list"][0] in evidence.ids()
+
+
+def test_multi_line_match_does_not_hide_other_patterns(tmp_path):
+    src = b"c := &http.Client{\n\tTransport: wrap(http.Get(u)),\n\tJar: jar(io.ReadAll(r)),\n}\n_ = http.Get(v)\n"
+    patterns = [
+        ScanPattern("client", r"\bhttp\.Client\{[^}]*\}", literals=("http.Client{",)),
+        *PATTERNS[:2],
+    ]
+    index = _index(tmp_path, {"main.go": src})
+    hits = scan_contents(index, patterns)
+
+    assert _lines(hits["client"]) == [("main.go", 1, 4)]
+    assert _lines(hits["get"]) == [("main.go", 2, 2), ("main.go", 5, 5)]
+    assert _lines(hits["readall"]) == [("main.go", 3, 3)]
+    # same as scanning for each pattern on its own
+    for p in patterns:
+        assert scan_contents(index, [p])[p.id] == hits[p.id]
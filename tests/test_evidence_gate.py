@@ -15,3 +15,37 @@ def test_evidence_gate_downgrades_missing(tmp_path):
 
     out = evidence_gate(scorecard, tmp_path / "evidence.jsonl", True, 0.3)
     assert out["categories"][0]["confidence"] < 0.8
+
+
+def test_evidence_gate_checks_file_lines_against_index(tmp_path):
+    from dda.evidence.store import EvidenceStore
+    from dda.ingest.index import FileEntry, FileIndex
+
+    (tmp_path / "charts").mkdir()
+    (tmp_path / "charts" / "values.yaml").write_text("a: 1\nb: 2\nc: 3")  # 3 lines, no trailing newline
+    index = FileIndex(root=tmp_path, files=[FileEntry("charts/values.yaml", 14)], languages=[])
+    store = EvidenceStore([
+        {"id": "EVID-GOOD", "kind": "infra", "summary": "s", "refs": [
+            {"type": "file_lines", "ref": "charts/values.yaml:L1-L3"},
+            {"type": "file_lines", "ref": "charts/:L1-L1"},
+        ]},
+        {"id": "EVID-BAD", "kind": "infra", "summary": "s", "refs": [
+            {"type": "file_lines", "ref": "charts/values.yaml:L1-L80"},
+            {"type": "file_lines", "ref": "missing.yaml:L1-L1"},
+        ]},
+    ])
+
+    def card():
+        return {
+            "categories": [
+                {"id": c, "confidence": 0.8, "notes": "", "evidence": [{"type": "evidence_id", "ref": f"EVID-{c.upper()}"}]}
+                for c in ("good", "bad")
+            ],
+            "overall": {"confidence": 0.8},
+        }
+
+    out = evidence_gate(card(), tmp_path / "unused.jsonl", True, 0.3, evidence=store, index=index)
+    good, bad = out["categories"]
+    assert good["confidence"] == 0.8 and good["notes"] == ""
+    assert bad["confidence"] < 0.8
+    assert "charts/values.yaml:L1-L80" in bad["notes"] and "missing.yaml:L1-L1" in bad["notes"]
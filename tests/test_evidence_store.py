@@ -0,0 +1,20 @@
+import json
+
+from dda.evidence.store import EvidenceStore
+
+
+def test_duplicate_ids_merge_refs_and_flush_once(tmp_path):
+    store = EvidenceStore()
+    for name in ["cmd", "pkg", "cmd"]:
+        store.add({"id": "EVID-STRUCT-TOPLEVEL", "kind": "code", "summary": "s",
+                   "refs": [{"type": "file_lines", "ref": f"{name}/:L1-L1"}]})
+    store.add({"id": "EVID-DOC-README", "kind": "doc", "summary": "d", "refs": []})
+
+    assert len(store) == 2 and "EVID-DOC-README" in store
+    assert [r["ref"] for r in store.get("EVID-STRUCT-TOPLEVEL")["refs"]] == ["cmd/:L1-L1", "pkg/:L1-L1"]
+
+    path = tmp_path / "evidence" / "evidence.jsonl"
+    store.flush(path)
+    lines = path.read_text().splitlines()
+    assert [json.loads(l)["id"] for l in lines] == ["EVID-STRUCT-TOPLEVEL", "EVID-DOC-README"]
+    assert EvidenceStore.load(path).records() == store.records()
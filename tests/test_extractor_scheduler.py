@@ -0,0 +1,82 @@
+import threading
+import time
+from functools import partial
+
+from dda.extractors.registry import ExtractorSpec, default_extractors
+from dda.extractors.scheduler import run_extractors
+from dda.ingest.index import FileIndex
+
+
+def _emit(name, delay=0.0):
+    def fn(repo_dir, index, evidence, snippets_dir, **kw):
+        time.sleep(delay)
+        evidence.add({"id": f"EVID-{name}"})
+        return {"name": name, "deps": sorted(kw.get("deps", {}))}
+    return fn
+
+
+def _boom(repo_dir, index, evidence, snippets_dir):
+    raise RuntimeError("boom")
+
+
+def _sleep(seconds, repo_dir, index, evidence, snippets_dir):
+    time.sleep(seconds)
+    return {}
+
+
+def _quick(repo_dir, index, evidence, snippets_dir):
+    return {"quick": True}
+
+
+def test_builtin_registry_order():
+    names = [s.name for s in default_extractors()][:7]
+    assert names == ["docs", "structure", "ci", "infra", "observability", "security_deps", "performance_smells"]
+
+
+def test_scheduler_merges_in_spec_order_with_deps_timeouts_and_errors(tmp_path):
+    specs = [
+        ExtractorSpec("slow", _emit("slow", delay=0.2)),
+        ExtractorSpec("fast", _emit("fast")),
+        ExtractorSpec("after", _emit("after"), depends_on=("slow", "fast")),
+        ExtractorSpec("stuck", _emit("stuck", delay=2)),
+        ExtractorSpec("broken", _boom),
+    ]
+    index = FileIndex(root=tmp_path, files=[], languages=[])
+    t0 = time.monotonic()
+    res = run_extractors(specs, tmp_path, index, tmp_path / "snippets", workers=4, timeout_s=1.0)
+    assert time.monotonic() - t0 < 3
+
+    assert list(res) == ["slow", "fast", "after", "stuck", "broken"]
+    assert res["after"].signals["deps"] == ["fast", "slow"]
+    assert [r.evidence for r in res.values() if r.status == "ok"] == [
+        [{"id": "EVID-slow", "refs": []}], [{"id": "EVID-fast", "refs": []}], [{"id": "EVID-after", "refs": []}],
+    ]
+    assert res["stuck"].status == "timeout" and res["stuck"].evidence == []
+    assert res["broken"].status == "error" and "boom" in res["broken"].error
+
+
+def test_scheduler_process_mode(tmp_path):
+    specs = [s for s in default_extractors() if s.name in ("docs", "ci")]
+    index = FileIndex(root=tmp_path, files=[], languages=[])
+    res = run_extractors(specs, tmp_path, index, tmp_path / "snippets", workers=2, mode="process")
+    assert {r.status for r in res.values()} == {"ok"}
+    assert res["docs"].signals["findings"]["top"][0]["title"] == "Missing README overview"
+
+
+def test_timeout_clock_starts_when_an_extractor_starts(tmp_path):
+    index = FileIndex(root=tmp_path, files=[], languages=[])
+    # process mode kills the stuck worker, so quick gets a fresh one right away
+    specs = [ExtractorSpec("slow", partial(_sleep, 3.0)), ExtractorSpec("quick", _quick)]
+    res = run_extractors(specs, tmp_path, index, tmp_path / "snippets", workers=1, timeout_s=1.0, mode="process")
+    assert res["slow"].status == "timeout"
+    assert res["quick"].status == "ok" and res["quick"].signals == {"quick": True}
+
+    # a timed-out thread keeps its slot until it exits (stuck threads of earlier tests too)
+    for t in threading.enumerate():
+        if t.name.startswith("dda-extract-"):
+            t.join()
+    specs = [ExtractorSpec("slow", partial(_sleep, 1.5)), ExtractorSpec("quick", _quick)]
+    t0 = time.monotonic()
+    res = run_extractors(specs, tmp_path, index, tmp_path / "snippets", workers=1, timeout_s=1.0)
+    assert res["slow"].status == "timeout" and res["quick"].status == "ok"
+    assert time.monotonic() - t0 >= 1.5
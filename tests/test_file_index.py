@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+from pathspec import PathSpec
+
+from dda.ingest.budget import write_coverage
+from dda.ingest.index import build_file_index, dump_index, load_index
+
+INCLUDE = ["**/*.md", "**/*.go", "**/*.yaml", "**/Dockerfile"]
+EXCLUDE = ["**/vendor/**", "**/node_modules/**", "**/.git/**", "**/*.png"]
+
+
+def _rglob_reference(repo_dir: Path, include_globs, exclude_globs, max_bytes):
+    # The pre-walker implementation, kept here as the behavioural oracle.
+    include = PathSpec.from_lines("gitwildmatch", include_globs)
+    exclude = PathSpec.from_lines("gitwildmatch", exclude_globs)
+    out = set()
+    for fp in repo_dir.rglob("*"):
+        if not fp.is_file():
+            continue
+        rel = fp.relative_to(repo_dir).as_posix()
+        if exclude.match_file(rel) or not include.match_file(rel):
+            continue
+        size = fp.stat().st_size
+        if size <= max_bytes:
+            out.add((rel, size))
+    return out
+
+
+def _make_tree(root: Path) -> None:
+    files = {
+        "README.md": "# hi\n",
+        "go.mod": "module x\n",
+        "cmd/main.go": "package main\n",
+        "deploy/Dockerfile": "FROM scratch\n",
+        "deploy/chart/values.yaml": "a: 1\n",
+        "vendor/lib/lib.go": "package lib\n",
+        "web/node_modules/pkg/README.md": "# pkg\n",
+        ".git/HEAD.md": "ref\n",
+        "docs/img.png/notes.md": "x\n",
+        "docs/big.md": "x" * 200,
+        "docs/guide.md": "guide\n",
+    }
+    for rel, text in files.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(text)
+
+
+def test_walker_matches_rglob(tmp_path):
+    _make_tree(tmp_path)
+    for workers in (1, 4):
+        index = build_file_index(tmp_path, INCLUDE, EXCLUDE, max_files=100, max_bytes=100, workers=workers)
+        got = {(e.path, e.size) for e in index.files}
+        assert got == _rglob_reference(tmp_path, INCLUDE, EXCLUDE, 100)
+        assert [e.path for e in index.files] == sorted(e.path for e in index.files)
+
+    assert "Go" in index.languages
+
+
+def test_walker_honours_negated_excludes(tmp_path):
+    _make_tree(tmp_path)
+    exclude = EXCLUDE + ["!vendor/lib/**"]
+    index = build_file_index(tmp_path, INCLUDE, exclude, max_files=100, max_bytes=100)
+    assert {(e.path, e.size) for e in index.files} == _rglob_reference(tmp_path, INCLUDE, exclude, 100)
+    assert "vendor/lib/lib.go" in {e.path for e in index.files}
+
+
+def test_max_files_truncation_is_deterministic(tmp_path):
+    _make_tree(tmp_path)
+    index = build_file_index(tmp_path, INCLUDE, EXCLUDE, max_files=2, max_bytes=100)
+    assert [e.path for e in index.files] == ["README.md", "cmd/main.go"]
+
+
+def test_budgeted_scan_prefers_manifests_and_reports_skips(tmp_path):
+    _make_tree(tmp_path)
+    index = build_file_index(tmp_path, INCLUDE, EXCLUDE, max_files=3, max_bytes=100, mode="budgeted")
+    # manifests from every component first (README, Dockerfile), then docs; code and config wait
+    assert [e.path for e in index.files] == ["README.md", "deploy/Dockerfile", "docs/guide.md"]
+
+    cov = index.coverage
+    assert cov["mode"] == "budgeted" and cov["selected"]["files"] == 3
+    assert cov["skipped"]["files"] == cov["considered"]["files"] - 3
+    assert cov["skipped"]["by_tier"]["code"] == {"files": 1, "bytes": len("package main\n")}
+    assert "cmd/main.go" in cov["skipped"]["examples"]
+    assert not cov["deadline_hit"]
+
+    # every skipped file, not just the examples, is kept and written next to index.json
+    assert len(index.skipped) == cov["skipped"]["files"] and "cmd/main.go" in dict(index.skipped)
+    assert load_index(dump_index(index), tmp_path).skipped == index.skipped
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    written = json.loads((run_dir / write_coverage(run_dir, cov, index.skipped)).read_text())
+    assert written["skipped_paths"] == [p for p, _ in index.skipped] and written["mode"] == "budgeted"
+
+    # same answer whatever the walk order
+    again = build_file_index(tmp_path, INCLUDE, EXCLUDE, max_files=3, max_bytes=100, mode="budgeted", workers=1)
+    assert again.files == index.files
+
+
+def test_budgeted_scan_byte_budget_and_deadline(tmp_path):
+    _make_tree(tmp_path)
+    index = build_file_index(
+        tmp_path, INCLUDE, EXCLUDE, max_files=100, max_bytes=100, mode="budgeted", budget_bytes=10
+    )
+    assert sum(e.size for e in index.files) <= 10
+    # README (5 bytes) first; the 13-byte Dockerfile no longer fits, but the 5-byte values.yaml does
+    assert {e.path for e in index.files} == {"README.md", "deploy/chart/values.yaml"}
+
+    cut = build_file_index(tmp_path, INCLUDE, EXCLUDE, max_files=100, max_bytes=100, mode="budgeted", deadline_s=0)
+    assert cut.coverage["deadline_hit"]
+    assert {"cmd", "deploy", "docs"} <= set(cut.coverage["unscanned_dirs"])
+    assert [e.path for e in cut.files] == ["README.md"]
@@ -0,0 +1,76 @@
+import json
+import pickle
+import subprocess
+
+import pytest
+
+from dda.ingest.index import build_file_index, build_tree_index
+from dda.ingest.reader import GitReader
+from dda.pipeline import run_analysis
+
+INCLUDE = ["**/*.md", "**/*.yaml", "**/go.mod"]
+EXCLUDE = ["**/vendor/**", "**/.git/**"]
+
+
+def _head(repo):
+    return subprocess.check_output(["git", "-C", str(repo), "rev-parse", "HEAD"]).decode().strip()
+
+
+def test_tree_index_and_blob_reads_match_the_checkout(tiny_git_repo):
+    commit = _head(tiny_git_repo)
+    tree = build_tree_index(tiny_git_repo / ".git", commit, INCLUDE, EXCLUDE, max_files=100, max_bytes=10**6)
+    disk = build_file_index(tiny_git_repo, INCLUDE, EXCLUDE, max_files=100, max_bytes=10**6)
+    assert tree.files == disk.files and tree.coverage == disk.coverage
+
+    reader = tree.reader
+    assert isinstance(reader, GitReader)
+    for e in tree.files:
+        assert reader.read_bytes(e.path) == (tiny_git_repo / e.path).read_bytes()
+        assert tree.line_count(e.path) == disk.line_count(e.path)
+    with pytest.raises(FileNotFoundError):
+        reader.read_bytes("no/such file.md")
+    with pytest.raises(IsADirectoryError):
+        reader.read_bytes(".github")
+    # a copy in another process starts its own cat-file
+    copy = pickle.loads(pickle.dumps(reader))
+    assert copy.read_text("README.md") == reader.read_text("README.md")
+    copy.close()
+    reader.close()
+
+
+def test_git_backend_writes_no_checkout_and_scores_the_same(tmp_path, tiny_git_repo, config_path):
+    checkout = tmp_path / "out" / "checkout"
+    run_analysis(str(tiny_git_repo), checkout, None, config_path, keep_repo=False)
+
+    config_path.write_text(config_path.read_text().replace('backend: "checkout"', 'backend: "git"'))
+    objects = tmp_path / "out" / "objects"
+    run_analysis(str(tiny_git_repo), objects, None, config_path, keep_repo=True, reuse_results=False)
+    assert sorted(p.name for p in (objects / "_work").iterdir()) == ["repo.git"]
+    assert not (objects / "_work" / "repo.git" / "README.md").exists()
+
+    a, b = (json.loads((d / "scorecard.json").read_text()) for d in (checkout, objects))
+    a.pop("run"), b.pop("run")
+    assert a == b
+    assert a["coverage"]["skipped_list"] == "coverage.json" and (objects / "coverage.json").exists()
+    assert (checkout / "evidence" / "evidence.jsonl").read_text() == (objects / "evidence" / "evidence.jsonl").read_text()
+    assert sorted(p.name for p in (objects / "evidence" / "snippets").iterdir()) == sorted(
+        p.name for p in (checkout / "evidence" / "snippets").iterdir()
+    )
+
+
+def test_index_cache_is_not_shared_between_backends(tmp_path, tiny_git_repo, config_path):
+    # the checkout walk follows a symlinked file, ls-tree skips it
+    (tiny_git_repo / "GUIDE.md").symlink_to("README.md")
+    subprocess.check_call(["git", "-C", str(tiny_git_repo), "add", "GUIDE.md"])
+    subprocess.check_call(
+        ["git", "-C", str(tiny_git_repo), "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qm", "link"]
+    )
+
+    def indexed(run_dir):
+        return json.loads((run_dir / "index.json").read_text())["paths"]
+
+    run_analysis(str(tiny_git_repo), tmp_path / "checkout", None, config_path, keep_repo=False)
+    config_path.write_text(config_path.read_text().replace('backend: "checkout"', 'backend: "git"'))
+    run_analysis(str(tiny_git_repo), tmp_path / "objects", None, config_path, keep_repo=False, reuse_results=False)
+    assert "GUIDE.md" in indexed(tmp_path / "checkout")
+    assert "GUIDE.md" not in indexed(tmp_path / "objects")
@@ -0,0 +1,62 @@
+from dda.extractors import imports
+from dda.extractors.imports import ImportCache, build_import_graph, parse_imports
+from dda.ingest.index import FileEntry, FileIndex
+
+FILES = {
+    "src/app/__init__.py": "",
+    "src/app/main.py": "import os\nfrom app.core import engine\nfrom . import util\n",
+    "src/app/util.py": "from .core.engine import run\n",
+    "src/app/core/__init__.py": "",
+    "src/app/core/engine.py": "import app.util as u\n",
+    "tools/gen.py": "from app import main\n",
+}
+
+
+def _index(tmp_path):
+    for rel, text in FILES.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(text)
+    return FileIndex(root=tmp_path, files=[FileEntry(p, len(t)) for p, t in sorted(FILES.items())], languages=["python"])
+
+
+def _edges(graph):
+    return sorted({(graph.nodes[a], graph.nodes[b]) for a, b in zip(graph.src, graph.dst)})
+
+
+def test_python_imports_resolve_and_roll_up(tmp_path, monkeypatch):
+    index = _index(tmp_path)
+    graph = build_import_graph(tmp_path, index, cache=ImportCache(tmp_path / "cache"))
+    assert _edges(graph) == [
+        ("src/app/core/engine.py", "src/app/util.py"),
+        ("src/app/main.py", "src/app/core/engine.py"),
+        ("src/app/main.py", "src/app/util.py"),
+        ("src/app/util.py", "src/app/core/engine.py"),
+        ("tools/gen.py", "src/app/main.py"),
+    ]
+    assert graph.rollup(lambda n: n.split("/")[0]) == {("tools", "src"): (1, "tools/gen.py", 1)}
+
+    # warm run comes entirely from the cache (non-git dir: keyed by hashing contents)
+    monkeypatch.setattr(imports, "git_blob_shas", lambda repo_dir: {p: imports.blob_sha(t.encode()) for p, t in FILES.items()})
+    monkeypatch.setattr(imports, "parse_imports", lambda path, data: [])
+    assert _edges(build_import_graph(tmp_path, index, cache=ImportCache(tmp_path / "cache"))) == _edges(graph)
+
+
+def test_go_and_js_specifiers():
+    go = b'package a\nimport "fmt"\nimport (\n\tx "github.com/o/r/pkg/x"\n)\n'
+    assert parse_imports("a/a.go", go) == [("fmt", 2), ("github.com/o/r/pkg/x", 4)]
+    js = b'import a from "./a";\nconst b = require("../b")\nexport * from "./c"\n'
+    assert parse_imports("w/i.ts", js) == [("./a", 1), ("../b", 2), ("./c", 3)]
+
+
+def test_cache_keeps_languages_apart(tmp_path, monkeypatch):
+    same = 'import a from "./b"\n'  # `import a` to Python, `./b` to TypeScript
+    files = {"a.py": "", "b.ts": "", "x.py": same, "y.ts": same}
+    for rel, text in files.items():
+        (tmp_path / rel).write_text(text)
+    index = FileIndex(root=tmp_path, files=[FileEntry(p, len(t)) for p, t in sorted(files.items())], languages=[])
+    cold = _edges(build_import_graph(tmp_path, index, cache=ImportCache(tmp_path / "cache")))
+    assert cold == [("x.py", "a.py"), ("y.ts", "b.ts")]
+
+    monkeypatch.setattr(imports, "git_blob_shas", lambda repo_dir: {p: imports.blob_sha(t.encode()) for p, t in files.items()})
+    monkeypatch.setattr(imports, "parse_imports", lambda path, data: [])
+    assert _edges(build_import_graph(tmp_path, index, cache=ImportCache(tmp_path / "cache"))) == cold
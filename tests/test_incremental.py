@@ -0,0 +1,33 @@
+import json
+
+from conftest import git
+from dda.ingest.diff import parse_name_status
+from dda.pipeline import run_analysis
+
+
+def test_parse_name_status_splits_renames():
+    raw = "M\0a.go\0R087\0old.md\0new.md\0D\0gone.yaml\0"
+    assert [(c.status, c.path) for c in parse_name_status(raw)] == [
+        ("M", "a.go"), ("D", "old.md"), ("A", "new.md"), ("D", "gone.yaml"),
+    ]
+
+
+def test_incremental_reruns_only_touched_extractors(tmp_path, tiny_git_repo, config_path):
+    first = tmp_path / "out" / "r1"
+    run_analysis(str(tiny_git_repo), first, None, config_path, keep_repo=False)
+
+    (tiny_git_repo / "SECURITY.md").write_text("# Security\n")
+    git(tiny_git_repo, "add", "-A")
+    git(tiny_git_repo, "commit", "-qm", "security policy")
+
+    second = tmp_path / "out" / "r2"
+    run_analysis(str(tiny_git_repo), second, None, config_path, keep_repo=False, previous_run=first)
+
+    inc = json.loads((second / "summary.json").read_text())["incremental"]
+    assert inc["changed_paths"] == 1
+    assert "docs" in inc["rerun"] and "ci" in inc["carried_forward"]
+
+    ids = [json.loads(l)["id"] for l in (second / "evidence" / "evidence.jsonl").read_text().splitlines()]
+    assert "EVID-DOC-SECURITY" in ids and "EVID-CI-GHA-001" in ids
+    index = json.loads((second / "index.json").read_text())
+    assert "SECURITY.md" in index["paths"]
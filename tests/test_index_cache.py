@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from dda.ingest.cache import IndexCache, index_cache_key
+from dda.ingest.index import FileEntry, FileIndex
+from dda.utils.config import AnalysisCfg
+
+
+def _cfg(**kw) -> AnalysisCfg:
+    base = {"include_globs": ["**/*.md"], "exclude_globs": ["**/vendor/**"]}
+    base.update(kw)
+    return AnalysisCfg(**base)
+
+
+def test_key_tracks_commit_and_index_config():
+    k = index_cache_key("abc", _cfg())
+    assert k == index_cache_key("abc", _cfg())
+    assert k != index_cache_key("def", _cfg())
+    assert k != index_cache_key("abc", _cfg(max_file_bytes=1))
+    assert k != index_cache_key("abc", _cfg(exclude_globs=[]))
+    assert k != index_cache_key("abc", _cfg(), backend="git")
+
+
+def test_roundtrip_and_eviction(tmp_path):
+    cache = IndexCache(tmp_path / "cache", max_bytes=10**6)
+    index = FileIndex(root=Path("/old"), files=[FileEntry("README.md", 12), FileEntry("a/b.go", 3)], languages=["Go"])
+    cache.put("k1", index)
+
+    got = cache.get("k1", tmp_path / "repo")
+    assert got.root == tmp_path / "repo"
+    assert got.files == index.files
+    assert got.languages == ["Go"]
+    assert cache.get("missing", tmp_path) is None
+
+    small = IndexCache(tmp_path / "cache", max_bytes=1)
+    small.put("k2", index)
+    assert small.get("k1", tmp_path) is None
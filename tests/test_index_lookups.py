@@ -0,0 +1,53 @@
+import pickle
+from pathlib import Path
+
+from dda.ingest.index import FileEntry, FileIndex, FileTable
+
+PATHS = [
+    ".github/workflows/ci.yaml",
+    "README.md",
+    "charts/app/Chart.yaml",
+    "deploy/kube-prometheus/rules.yml",
+    "docs/Grafana.JSON",
+    "infra/main.tf",
+    "pkg/otel/exporter.go",
+]
+
+
+def _index():
+    return FileIndex(root=Path("."), files=[FileEntry(p, 1) for p in PATHS], languages=[])
+
+
+def test_lookups_match_linear_scans():
+    index = _index()
+    assert "README.md" in index.paths and "nope" not in index.paths
+    assert index.by_ext("yaml", "YML") == [p for p in PATHS if p.endswith((".yaml", ".yml"))]
+    assert index.by_ext("json") == ["docs/Grafana.JSON"]
+    assert index.by_basename("Chart.yaml") == ["charts/app/Chart.yaml"]
+    assert index.with_token("prometheus") == ["deploy/kube-prometheus/rules.yml"]
+    assert index.under(".github/workflows/") == [".github/workflows/ci.yaml"]
+    assert index.under("charts") == ["charts/app/Chart.yaml"]
+    assert index.under("missing/dir") == []
+    assert index.top_level_dirs() == {".github": 1, "charts": 1, "deploy": 1, "docs": 1, "infra": 1, "pkg": 1}
+    for needle in ["prom", "grafana", "otel", "/", "a"]:
+        assert index.path_contains(needle) == [p for p in PATHS if needle in p.lower()]
+    assert index.path_contains("Grafana", ignore_case=False) == ["docs/Grafana.JSON"]
+    assert index.path_contains("grafana", ignore_case=False) == []
+    assert index.ordered({"infra/main.tf", "README.md", "unknown"}) == ["README.md", "infra/main.tf"]
+
+
+def test_file_table_behaves_like_entry_list():
+    entries = [FileEntry(p, i) for i, p in enumerate(PATHS)]
+    index = FileIndex(root=Path("."), files=entries, languages=[])
+    table = index.files
+    assert isinstance(table, FileTable)
+    assert list(table) == entries and table == entries
+    assert table[1] == entries[1] and table[-1] == entries[-1]
+    assert list(table[2:4]) == entries[2:4]
+    assert list(table.paths()) == PATHS and list(table.sizes) == list(range(len(PATHS)))
+    assert table.dirs.count("") == 1 and len(table.exts) < len(PATHS)
+    # lookup tables survive pickling into process-mode extractor workers
+    index.paths
+    copy = pickle.loads(pickle.dumps(index))
+    assert copy.files == table and "infra/main.tf" in copy.paths and copy.paths["README.md"] == 1
+    assert "infra/main" not in copy.paths and 3 not in copy.paths
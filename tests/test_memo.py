@@ -0,0 +1,94 @@
+import json
+import os
+import time
+
+from conftest import git
+from dda.memo import ResultCache
+from dda.pipeline import run_analysis
+
+
+def test_unchanged_commit_reuses_the_previous_run(tmp_path, tiny_git_repo, config_path):
+    first = tmp_path / "out" / "r1"
+    run_analysis(str(tiny_git_repo), first, None, config_path, keep_repo=False)
+
+    second = tmp_path / "out" / "r2"
+    result = run_analysis(str(tiny_git_repo), second, None, config_path, keep_repo=False)
+    metrics = json.loads((second / "metrics.json").read_text())
+    assert [s["name"] for s in metrics["stages"]] == ["memo"] and metrics["stages"][0]["hit"] is True
+    assert not (second / "_work").exists()
+
+    for name in ("graph.json", "evidence/evidence.jsonl"):
+        assert (second / name).read_bytes() == (first / name).read_bytes()
+        assert (second / name).stat().st_nlink == 2  # linked from the cache entry
+    summary = json.loads((second / "summary.json").read_text())
+    assert result["summary"]["memoized"]["key"] == summary["memoized"]["key"]
+
+    # the hit is recorded as a new run that points at its source
+    old_card, old_summary = (json.loads((first / n).read_text()) for n in ("scorecard.json", "summary.json"))
+    new_card = json.loads((second / "scorecard.json").read_text())
+    assert new_card["run"]["id"] != old_card["run"]["id"] and summary["memoized"]["run_id"] == old_card["run"]["id"]
+    assert summary["memoized"]["generated_at"] == old_summary["generated_at"]
+    # ... and so does the report's header, the rest of it is the source run's
+    report, old_report = ((d / "report.md").read_text() for d in (second, first))
+    assert (second / "report.md").stat().st_nlink == 1
+    assert f"**Run ID:** {new_card['run']['id']}" in report and old_card["run"]["id"] not in report
+    assert f"**Generated:** {summary['generated_at']}" in report
+    assert report.splitlines()[8:] == old_report.splitlines()[8:]
+    new_card.pop("run"), old_card.pop("run")
+    assert new_card == old_card
+
+    # profiling needs the stages to run
+    profiled = tmp_path / "out" / "profiled"
+    run_analysis(str(tiny_git_repo), profiled, None, config_path, keep_repo=False, profile="cpu")
+    assert "memoized" not in json.loads((profiled / "summary.json").read_text())
+
+    # the git backend indexes differently (symlinks), so it doesn't share entries with a checkout
+    git_cfg = tmp_path / "git.yaml"
+    git_cfg.write_text(config_path.read_text().replace('backend: "checkout"', 'backend: "git"'))
+    run_analysis(str(tiny_git_repo), tmp_path / "out" / "git", None, git_cfg, keep_repo=False)
+    assert "memoized" not in json.loads((tmp_path / "out" / "git" / "summary.json").read_text())
+
+    # execution knobs (worker count, pool mode, timeout) don't change the outputs: still a hit
+    fast_cfg = tmp_path / "fast.yaml"
+    fast_cfg.write_text(
+        config_path.read_text()
+        .replace("workers: 4", "workers: 1")
+        .replace('mode: "thread"', 'mode: "process"')
+        .replace("timeout_s: 300", "timeout_s: 600")
+    )
+    run_analysis(str(tiny_git_repo), tmp_path / "out" / "fast", None, fast_cfg, keep_repo=False)
+    assert "memoized" in json.loads((tmp_path / "out" / "fast" / "summary.json").read_text())
+
+    # a new commit or a changed config is a miss
+    (tiny_git_repo / "SECURITY.md").write_text("# Security\n")
+    git(tiny_git_repo, "add", "-A")
+    git(tiny_git_repo, "commit", "-qm", "security policy")
+    third = tmp_path / "out" / "r3"
+    run_analysis(str(tiny_git_repo), third, None, config_path, keep_repo=False)
+    assert "memoized" not in json.loads((third / "summary.json").read_text())
+
+    config_path.write_text(config_path.read_text().replace("snippet_max_chars: 1800", "snippet_max_chars: 900"))
+    fourth = tmp_path / "out" / "r4"
+    run_analysis(str(tiny_git_repo), fourth, None, config_path, keep_repo=False)
+    assert "memoized" not in json.loads((fourth / "summary.json").read_text())
+
+
+def test_result_cache_evicts_by_age_then_size(tmp_path):
+    run = tmp_path / "run"
+    (run / "evidence").mkdir(parents=True)
+    (run / "scorecard.json").write_text("{}")
+    (run / "summary.json").write_text("{}")
+    (run / "evidence" / "evidence.jsonl").write_text("x" * 100)
+
+    cache = ResultCache(tmp_path / "cache", max_bytes=10**6, max_age_s=3600)
+    for key in ("old", "a", "b"):
+        cache.put(key, run)
+    stale = time.time() - 7200
+    os.utime(cache.dir / "old", (stale, stale))
+    assert cache.get("old", tmp_path / "hit") is None
+    assert cache.evict() == 1 and sorted(p.name for p in cache.dir.iterdir()) == ["a", "b"]
+
+    os.utime(cache.dir / "a", (time.time() - 60,) * 2)
+    cache.max_bytes = 150  # room for one entry: the least recently used goes
+    assert cache.evict() == 1 and [p.name for p in cache.dir.iterdir()] == ["b"]
+    assert cache.get("b", tmp_path / "hit")["scorecard"] == {}
@@ -0,0 +1,44 @@
+import json
+import pstats
+
+import pytest
+
+from dda.metrics import RunMetrics, reset_peak_rss
+from dda.pipeline import run_analysis
+
+
+def test_run_writes_per_stage_metrics(tmp_path, tiny_git_repo, config_path):
+    run_dir = tmp_path / "out" / "r1"
+    run_analysis(str(tiny_git_repo), run_dir, None, config_path, keep_repo=False, profile="cpu")
+
+    metrics = json.loads((run_dir / "metrics.json").read_text())
+    stages = {s["name"]: s for s in metrics["stages"]}
+    # (no memo lookup: a profiled run always runs its stages)
+    assert list(stages) == ["clone", "index", "extract", "evidence", "score", "gate", "render", "write"]
+    for s in stages.values():
+        assert s["wall_s"] >= 0 and s["cpu_s"] >= 0
+        assert "peak_rss_delta_bytes" in s
+    assert stages["index"]["files"] > 0 and stages["index"]["bytes"] > 0
+    # what the shared content scan read (no pattern globs match this fixture), not the index totals again
+    assert (stages["extract"]["files"], stages["extract"]["bytes"]) == (0, 0)
+    assert stages["evidence"]["records"] > 0
+
+    ci = metrics["extractors"]["ci"]
+    assert ci["status"] == "ok" and ci["files"] == 1  # .github/workflows/ci.yaml
+
+    # one cProfile dump per stage, plus one per extractor
+    prof = run_dir / "profile"
+    assert (prof / "render.prof").exists() and (prof / "extract.docs.prof").exists()
+    pstats.Stats(str(prof / "index.prof"))
+
+
+@pytest.mark.skipif(not reset_peak_rss(), reason="needs a resettable RSS high-water mark (Linux /proc)")
+def test_stage_peaks_are_per_stage():
+    metrics = RunMetrics()
+    for name in ("first", "second"):
+        with metrics.stage(name):
+            blob = b"x" * (64 << 20)
+            del blob
+    # a lifetime peak would leave the second stage at ~0
+    assert all(s["peak_rss_delta_bytes"] >= 48 << 20 for s in metrics.stages)
+    assert metrics.to_dict()["total"]["peak_rss_bytes"] == max(s["peak_rss_bytes"] for s in metrics.stages)
@@ -0,0 +1,56 @@
+from dda.extractors import pyast
+from dda.extractors.pyast import PyAstCache, analyze_source, scan_python
+from dda.utils.hashing import blob_sha
+
+SRC = b'''import asyncio, time
+import requests as rq
+from queue import Queue
+
+
+async def poll():
+    time.sleep(1)
+    def inner():
+        time.sleep(1)
+    await asyncio.sleep(1)
+
+
+def fetch(urls, **kw):
+    out = ""
+    for u in urls:
+        out += rq.get(u).text
+    rq.get(urls[0], timeout=5)
+    rq.post(urls[0], **kw)
+    return out
+
+
+q = Queue()
+bounded = Queue(maxsize=100)
+aq = asyncio.Queue(0)
+'''
+
+
+def test_rules_flag_expected_lines():
+    assert analyze_source(SRC) == [
+        ("sleep-in-async", 7, 7),
+        ("requests-no-timeout", 16, 16),
+        ("str-concat-in-loop", 16, 16),
+        ("unbounded-queue", 22, 22),
+        ("unbounded-queue", 24, 24),
+    ]
+    assert analyze_source(b"def broken(:\n") == []
+
+
+def test_scan_python_caches_by_blob_sha(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_bytes(SRC)
+    cache_root = tmp_path / "cache"
+
+    first = scan_python(repo, ["a.py"], cache=PyAstCache(cache_root))
+    assert [h.ref for h in first["unbounded-queue"]] == ["a.py:L22-L22", "a.py:L24-L24"]
+
+    # cached findings are reused without re-parsing (sha comes from hashing when not a git checkout)
+    monkeypatch.setattr(pyast, "git_blob_shas", lambda repo_dir: {"a.py": blob_sha(SRC)})
+    monkeypatch.setattr(pyast, "analyze_source", lambda data: [])
+    assert scan_python(repo, ["a.py"], cache=PyAstCache(cache_root)) == first
+    assert scan_python(repo, ["a.py"], cache=None) == {}
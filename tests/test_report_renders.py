@@ -7,3 +7,38 @@ def test_report_renders(tmp_path):
     out = tmp_path / "out.md"
     render_report(tmpl, out, {"repo": {"name": "x"}, "scorecard": {"categories": [{"name": "A"}]}})
     assert out.read_text().startswith("# x")
+
+
+def test_environment_is_cached_and_bytecode_persisted(tmp_path):
+    from dda.report.render import get_environment
+
+    tmpl = tmp_path / "report.md.tmpl"
+    tmpl.write_text("{% for i in items %}{{ i }},{% endfor %}")
+    bcc = tmp_path / "jinja"
+    for n in (3, 5):
+        out = tmp_path / f"out{n}.md"
+        render_report(tmpl, out, {"items": range(n)}, bytecode_cache_dir=bcc)
+    assert (tmp_path / "out5.md").read_text() == "0,1,2,3,4,"
+    assert get_environment(tmp_path, bcc) is get_environment(tmp_path, bcc)
+    assert list(bcc.iterdir())
+
+
+def test_failed_render_keeps_previous_report(tmp_path):
+    import pytest
+
+    tmpl = tmp_path / "report.md.tmpl"
+    tmpl.write_text("{% for i in items %}{{ i }},{% endfor %}{{ missing.attr }}")
+    out = tmp_path / "out.md"
+    out.write_text("previous")
+    with pytest.raises(Exception):
+        render_report(tmpl, out, {"items": range(3)})
+    assert out.read_text() == "previous"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.md", "report.md.tmpl"]
+
+
+def test_report_gets_the_same_mode_as_other_artifacts(tmp_path):
+    tmpl = tmp_path / "report.md.tmpl"
+    tmpl.write_text("# {{ name }}\n")
+    (tmp_path / "scorecard.json").write_text("{}")
+    render_report(tmpl, tmp_path / "report.md", {"name": "x"})
+    assert (tmp_path / "report.md").stat().st_mode == (tmp_path / "scorecard.json").stat().st_mode
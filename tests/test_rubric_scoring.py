@@ -30,3 +30,25 @@ def test_basic_scoring_structure(tmp_path):
     assert "categories" in scorecard
     assert len(scorecard["categories"]) >= 5
     assert "overall" in scorecard
+
+
+def test_performance_is_neutral_without_detector_coverage(tmp_path):
+    def perf(smells):
+        scorecard = score_repo(
+            repo_meta=RepoMeta(name="dummy", url="https://example.com", commit="abc123"),
+            run_id="test-run",
+            focus=None,
+            cfg=type("Cfg", (), {})(),
+            index=FileIndex(root=tmp_path, files=[], languages=[]),
+            signals={"performance_smells": smells},
+            evidence_jsonl_path=tmp_path / "evidence.jsonl",
+            present_evidence_ids=set(),
+        )
+        return next(c for c in scorecard["categories"] if c["id"] == "performance")
+
+    # e.g. a Java-only repo: no risks because nothing was looked at
+    uncovered = perf({"risks": [], "files_scanned": 0})
+    assert (uncovered["score"], uncovered["confidence"]) == (2.5, 0.35)
+    assert perf({"risks": [], "files_scanned": 12})["score"] == 4.0
+    risky = {"id": "x", "title": "t", "severity": "high", "evidence_list": ["EVID-PERF-X"]}
+    assert perf({"risks": [risky], "files_scanned": 12})["score"] == 3.0
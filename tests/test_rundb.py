@@ -0,0 +1,45 @@
+import json
+
+from typer.testing import CliRunner
+
+from dda.cli import app
+from dda.rundb import PRESETS, RunDB, find_run_dirs
+
+
+def _write_run(root, repo, run_id, when, evidence_ids, perf, owner="acme"):
+    run_dir = root / f"{repo}-{owner}" / run_id
+    (run_dir / "evidence").mkdir(parents=True)
+    (run_dir / "scorecard.json").write_text(json.dumps({
+        "repo": {"name": repo, "url": f"https://example.com/{owner}/{repo}", "commit": f"{repo}-{run_id}"},
+        "run": {"id": run_id},
+        "overall": {"score": 3.0, "confidence": 0.6},
+        "categories": [{"id": "performance", "score": perf, "confidence": 0.5}],
+    }))
+    (run_dir / "summary.json").write_text(json.dumps({"generated_at": when}))
+    (run_dir / "evidence" / "evidence.jsonl").write_text("".join(
+        json.dumps({"id": e, "kind": "security", "summary": e, "refs": [{"type": "file_lines", "ref": "a:L1-L1"}]}) + "\n"
+        for e in evidence_ids
+    ))
+
+
+def test_import_and_fleet_queries(tmp_path):
+    out = tmp_path / "out"
+    _write_run(out, "alpha", "1", "2026-01-01T00:00:00Z", ["EVID-SEC-SCANNERS"], 2.0)
+    _write_run(out, "alpha", "2", "2026-02-01T00:00:00Z", [], 3.5)  # latest run dropped the scanners
+    _write_run(out, "beta", "1", "2026-01-15T00:00:00Z", ["EVID-SEC-SCANNERS", "EVID-SEC-DEPS"], 4.0)
+    _write_run(out, "beta", "1", "2026-03-01T00:00:00Z", [], 1.0, owner="other")  # same name, another repo
+
+    db_path = out / "dda.sqlite"
+    with RunDB(db_path) as db:
+        assert db.import_runs(find_run_dirs(out)) == 4
+        assert db.import_runs(find_run_dirs(out)) == 4  # re-import replaces rather than duplicates
+        assert db.query("SELECT count(*) FROM runs")[1] == [(4,)]
+        assert db.query("SELECT count(*) FROM refs")[1] == [(3,)]
+        assert [r[0] for r in db.query(PRESETS["missing-evidence"], ("EVID-SEC-SCANNERS",))[1]] == ["alpha", "beta"]
+        assert [(r[0], r[1]) for r in db.query(PRESETS["category"], ("performance",))[1]] == [
+            ("beta", 1.0), ("alpha", 3.5), ("beta", 4.0),
+        ]
+
+    res = CliRunner().invoke(app, ["query", "--db", str(db_path), "--preset", "has-evidence", "--arg", "EVID-SEC-DEPS", "--json"])
+    assert res.exit_code == 0, res.output
+    assert '"repo": "beta"' in res.output and "alpha" not in res.output
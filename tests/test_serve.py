@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from dda import serve
+from dda.serve import JobQueue, QueueFull, make_server
+
+
+def _call(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method="POST" if data else "GET")
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as err:
+        return err.code, json.loads(err.read())
+
+
+def test_serve_runs_jobs_over_http(tmp_path, tiny_git_repo, config_path):
+    jobs = JobQueue(out_root=tmp_path / "out", config_path=config_path, workers=1, max_queue=4)
+    server = make_server(jobs, port=0, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        code, job = _call(f"{base}/jobs", {"repo": str(tiny_git_repo)})
+        assert code == 202 and job["status"] == "queued"
+
+        done = jobs.wait(job["id"], timeout=60)
+        assert done["status"] == "ok", done.get("error")
+        code, got = _call(f"{base}/jobs/{job['id']}")
+        assert code == 200 and got["overall"] == done["overall"]
+        code, scorecard = _call(f"{base}/jobs/{job['id']}/scorecard")
+        assert code == 200 and "categories" in scorecard
+
+        assert _call(f"{base}/jobs", {"nope": 1})[0] == 400
+        assert _call(f"{base}/jobs/000000000000")[0] == 404
+        assert _call(f"{base}/health")[1]["ok"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        jobs.close()
+
+
+def test_submit_rejects_when_queue_is_full(tmp_path, tiny_git_repo, config_path):
+    jobs = JobQueue(out_root=tmp_path / "out", config_path=config_path, workers=1, max_queue=1)
+    try:
+        with pytest.raises(QueueFull):
+            for _ in range(3):
+                jobs.submit(str(tiny_git_repo))
+    finally:
+        jobs.close()
+    assert {j["status"] for j in jobs.jobs()} <= {"ok", "cancelled"}
+
+
+def _die(*args):
+    os._exit(1)
+
+
+def test_dead_worker_fails_only_its_job(tmp_path, tiny_git_repo, config_path, monkeypatch):
+    jobs = JobQueue(out_root=tmp_path / "out", config_path=config_path, workers=1, max_queue=4)
+    try:
+        monkeypatch.setattr(serve, "_run_job", _die)
+        crashed = jobs.wait(jobs.submit(str(tiny_git_repo))["id"], timeout=60)
+        assert crashed["status"] == "failed" and "worker process died" in crashed["error"]
+
+        monkeypatch.undo()  # the replacement worker runs the real job
+        done = jobs.wait(jobs.submit(str(tiny_git_repo))["id"], timeout=60)
+        assert done["status"] == "ok", done.get("error")
+    finally:
+        jobs.close()
@@ -0,0 +1,74 @@
+from dda.evidence.snippets import TRUNCATED_MARK, SnippetService
+from dda.evidence.store import EvidenceStore
+from dda.ingest.index import FileEntry, FileIndex
+from dda.ingest.reader import FsReader
+from dda.verifier.evidence_gate import broken_file_lines
+
+
+def _records():
+    return [
+        {"id": "EVID-A", "kind": "doc", "summary": "a", "refs": [{"type": "file_lines", "ref": "README.md:L2-L3"}]},
+        # same text cited again, an out-of-range ref, and a range that runs past EOF
+        {"id": "EVID-B", "kind": "doc", "summary": "b", "refs": [
+            {"type": "file_lines", "ref": "README.md:L2-L3"},
+            {"type": "file_lines", "ref": "README.md:L40-L80"},
+            {"type": "file_lines", "ref": "big.txt:L1-L120"},
+        ]},
+    ]
+
+
+def test_snippets_are_clamped_truncated_and_deduplicated(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "README.md").write_text("# Title\nline two\nline three\nline four\n")
+    (repo / "big.txt").write_text("x" * 30 + "\n" + "y" * 30)
+    cache = tmp_path / "cache"
+
+    runs = []
+    for run in ("r1", "r2"):
+        store = EvidenceStore(_records())
+        snippets = tmp_path / run / "snippets"
+        assert SnippetService(repo, snippets, max_chars=40, cache_dir=cache).attach(store) == 3
+        runs.append((store, snippets))
+
+    store, snippets = runs[0]
+    a = [r for r in store.get("EVID-A")["refs"] if r["type"] == "snippet"]
+    b = [r for r in store.get("EVID-B")["refs"] if r["type"] == "snippet"]
+    assert a[0]["ref"] == b[0]["ref"] and a[0]["note"] == "README.md:L2-L3"
+    assert (snippets.parent / a[0]["ref"]).read_text() == "line two\nline three\n"
+    assert (snippets.parent / b[1]["ref"]).read_text() == ("x" * 30 + "\n" + "y" * 9) + TRUNCATED_MARK
+    assert len(list(snippets.iterdir())) == 2
+
+    # the second run links the cached copies instead of writing new ones
+    later = runs[1][1] / a[0]["ref"].split("/")[-1]
+    assert later.stat().st_ino == (snippets / a[0]["ref"].split("/")[-1]).stat().st_ino
+
+
+class _CountingReader(FsReader):
+    def __init__(self, root):
+        super().__init__(root)
+        self.reads = []
+
+    def read_bytes(self, path):
+        self.reads.append(path)
+        return super().read_bytes(path)
+
+    def view(self, path):
+        self.reads.append(path)
+        return super().view(path)
+
+
+def test_gate_reuses_line_counts_from_snippets(tmp_path):
+    (tmp_path / "README.md").write_text("# Title\nline two\nline three\nline four\n")
+    (tmp_path / "big.txt").write_text("x" * 30 + "\n" + "y" * 30)
+    reader = _CountingReader(tmp_path)
+    index = FileIndex(
+        root=tmp_path, files=[FileEntry("README.md", 41), FileEntry("big.txt", 61)], languages=[], reader=reader
+    )
+    store = EvidenceStore(_records())
+    SnippetService(tmp_path, tmp_path / "snippets", max_chars=40, index=index).attach(store)
+    assert sorted(reader.reads) == ["README.md", "big.txt"]
+
+    assert broken_file_lines(store, index) == {"EVID-B": ["README.md:L40-L80", "big.txt:L1-L120"]}
+    assert (index.line_count("README.md"), index.line_count("big.txt")) == (4, 2)
+    assert len(reader.reads) == 2  # each file read once per run
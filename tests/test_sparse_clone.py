@@ -0,0 +1,52 @@
+import asyncio
+import subprocess
+
+from conftest import git
+from dda.ingest.clone import clone_repo, sparse_patterns
+from dda.ingest.index import build_file_index
+from dda.ingest.prefetch import clone_repo_async
+
+INCLUDE = ["**/*.md", "**/*.yaml", "**/go.mod"]
+EXCLUDE = ["**/vendor/**", "**/*.png"]
+
+
+def test_sparse_patterns_negate_excludes():
+    assert sparse_patterns(["**/*.md"], ["**/vendor/**", "!vendor/keep/**"]) == [
+        "**/*.md", "!**/vendor/**", "vendor/keep/**",
+    ]
+
+
+def test_sparse_blobless_clone_skips_excluded_blobs(tmp_path, tiny_git_repo):
+    (tiny_git_repo / "vendor" / "lib").mkdir(parents=True)
+    (tiny_git_repo / "vendor" / "lib" / "README.md").write_text("vendored\n")
+    (tiny_git_repo / "logo.png").write_bytes(b"\x89PNG" + b"0" * 1024)
+    git(tiny_git_repo, "add", "-A")
+    git(tiny_git_repo, "commit", "-qm", "assets")
+    git(tiny_git_repo, "config", "uploadpack.allowfilter", "true")
+
+    dest = tmp_path / "work"
+    clone_repo(f"file://{tiny_git_repo}", dest, sparse=sparse_patterns(INCLUDE, EXCLUDE))
+
+    on_disk = {p.relative_to(dest).as_posix() for p in dest.rglob("*") if p.is_file() and ".git" not in p.parts}
+    assert on_disk == {"README.md", "go.mod", ".github/workflows/ci.yaml"}
+
+    missing = subprocess.check_output(
+        ["git", "-C", str(dest), "rev-list", "--objects", "--missing=print", "HEAD"]
+    ).decode().split()
+    assert sum(1 for o in missing if o.startswith("?")) == 2
+
+    index = build_file_index(dest, INCLUDE, EXCLUDE, max_files=100, max_bytes=10**6)
+    full = build_file_index(tiny_git_repo, INCLUDE, EXCLUDE + ["**/.git/**"], max_files=100, max_bytes=10**6)
+    assert index.files == full.files
+
+
+def test_sparse_checkout_from_mirror(tmp_path, tiny_git_repo):
+    dest = tmp_path / "work"
+    url, mirrors, sparse = f"file://{tiny_git_repo}", tmp_path / "mirrors", sparse_patterns(["**/*.md"], [])
+    meta = clone_repo(url, dest, mirror_root=mirrors, sparse=sparse)
+    assert (dest / "README.md").exists() and not (dest / "go.mod").exists()
+
+    # the pipelined batch path runs the same clone plan on asyncio
+    adest = tmp_path / "async"
+    assert asyncio.run(clone_repo_async(url, adest, mirror_root=mirrors, sparse=sparse)) == meta
+    assert sorted(p.name for p in adest.iterdir()) == sorted(p.name for p in dest.iterdir())